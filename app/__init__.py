@@ -2,20 +2,27 @@
 RollQuest Flask Application Factory
 """
 
-from flask import Flask, send_from_directory
-from flask_session import Session
+from flask import Flask, Response, send_from_directory
 import os
+import time
 
 def create_app():
+    started = time.perf_counter()
     app = Flask(__name__)
     
     # Configuration
     app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'rollquest-secret-key-2024')
-    app.config['SESSION_TYPE'] = 'filesystem'
     app.config['SESSION_PERMANENT'] = False
     
-    # Initialize extensions
-    Session(app)
+    # Initialize extensions (the cookie session only carries the game session id)
+    from app.services.session_store import session_store
+    session_store.init_app(app)
+    
+    from app.services.result_cache import result_cache
+    result_cache.init_app(app)
+    
+    from app.services.metrics import metrics
+    metrics.init_app(app)
     
     # SEO routes - serve robots.txt and sitemap.xml from root
     @app.route('/robots.txt')
@@ -26,6 +33,14 @@ def create_app():
     def sitemap():
         return send_from_directory(app.static_folder, 'sitemap.xml', mimetype='application/xml')
     
+    # Metrics scrape target, aggregated over every worker process
+    @app.route('/metrics')
+    def metrics_endpoint():
+        text = metrics.render()
+        if text is None:
+            return 'Metrics are disabled\n', 404
+        return Response(text, mimetype='text/plain; version=0.0.4')
+    
     # Register blueprints
     from app.routes.home import home_bp
     from app.routes.game import game_bp
@@ -39,4 +54,23 @@ def create_app():
     app.register_blueprint(analysis_bp, url_prefix='/analysis')
     app.register_blueprint(about_bp, url_prefix='/about')
     
+    # Resume background jobs left unfinished by a previous worker (when the
+    # app is preloaded in the gunicorn master, each worker resumes them after forking)
+    from app.config import Config
+    from app.services.job_queue import job_queue
+    from app.routes.simulation import JOBS, job_handler
+    job_queue.init_app(
+        app, {job_type: job_handler(job_type) for job_type in JOBS}, recover=not Config.PREFORK_WARM
+    )
+    
+    # Build shared tables and precompute common seeded presets before workers start serving
+    if Config.PREFORK_WARM or Config.RESULT_CACHE_WARM:
+        from app.services.warmup import warm_up
+        for step, seconds in warm_up(app, shared_tables=Config.PREFORK_WARM).items():
+            metrics.observe('rollquest_startup_duration_seconds', seconds, phase=f'warm_up_{step}')
+    
+    metrics.observe('rollquest_startup_duration_seconds', time.perf_counter() - started, phase='create_app')
+    # Persist start-up metrics before workers fork
+    metrics.flush()
+    
     return app
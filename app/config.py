@@ -6,17 +6,90 @@ import os
 
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY', 'rollquest-secret-key-2024')
-    SESSION_TYPE = 'filesystem'
     SESSION_PERMANENT = False
     
+    # Event-sourced game session store (path defaults to instance/)
+    SESSION_STORE_PATH = os.environ.get('SESSION_STORE_PATH')
+    SESSION_COMPACT_EVERY = 50
+    SESSION_TTL = int(os.environ.get('SESSION_TTL', 7 * 86400))
+    
     DEFAULT_BALANCE = 1000
     MIN_BET = 1
     MAX_BET = 10000
     MAX_FUNDS_ADD = 100000
     PAYOUT_MULTIPLIER = 6
+    HISTORY_SIZE = 100
+    MAX_AUTOPLAY_ROUNDS = 1000
+    
+    DICE_CACHE_SIZE = 128
     
     MAX_SIMULATION_TRIALS = 1000000
     DEFAULT_SIMULATION_TRIALS = 10000
+    
+    MAX_CONVERGENCE_TRIALS = 100000000
+    CONVERGENCE_CHUNK_SIZE = 1000000
+    
+    MAX_BATCH_SIMULATIONS = 10000
+    MAX_BATCH_TRIALS = 20000
+    BATCH_MEMORY_BUDGET_MB = int(os.environ.get('BATCH_MEMORY_BUDGET_MB', 64))
+    
+    # Precision-targeted batches: first chunk, and growth of the total per chunk
+    PRECISION_INITIAL_SIMULATIONS = 100
+    PRECISION_GROWTH = 2
+    
+    # Paired fair vs tweaked comparisons (each replication plays both dice)
+    MAX_COMPARE_REPLICATIONS = 10000
+    
+    # Summary batches: bounded-size sketches and histograms instead of raw lists
+    MAX_SUMMARY_BATCH_SIMULATIONS = 10000000
+    SUMMARY_CHUNK_SIMULATIONS = 10000
+    QUANTILE_SKETCH_K = 1000
+    HISTOGRAM_BINS = 50
+    HISTOGRAM_SPAN = 3  # Default upper profit edge, in starting balances
+    
+    # Exact ruin solver: largest balance grid and per-state mass treated as zero
+    EXACT_MAX_STATES = 50000000
+    EXACT_TAIL_EPSILON = 1e-18
+    
+    # Process-pool workers for batch simulations (0 or 1 = run in-process)
+    SIMULATION_WORKERS = int(os.environ.get('SIMULATION_WORKERS', 0))
+    PARALLEL_BATCH_MIN_CELLS = 5000000
+    
+    # Progress granularity of the server-sent-event endpoints
+    STREAM_CHUNK_TRIALS = 50000
+    STREAM_CHUNK_CELLS = 2000000
+    
+    # Constant-memory run mode: rounds drawn per block, trajectory buckets
+    ENVELOPE_BLOCK_TRIALS = 16384
+    ENVELOPE_POINTS = 1000
+    
+    # Shared SQLite cache for seeded simulation results (path defaults to instance/)
+    RESULT_CACHE_ENABLED = os.environ.get('RESULT_CACHE_ENABLED', '1') == '1'
+    RESULT_CACHE_PATH = os.environ.get('RESULT_CACHE_PATH')
+    RESULT_CACHE_MAX_BYTES = int(os.environ.get('RESULT_CACHE_MAX_MB', 256)) * 1024 * 1024
+    RESULT_CACHE_TTL = int(os.environ.get('RESULT_CACHE_TTL', 86400))
+    RESULT_CACHE_WARM = os.environ.get('RESULT_CACHE_WARM', '0') == '1'
+    RESULT_CACHE_PRESETS = [
+        ('run', {'seed': 0}),
+        ('convergence', {'seed': 0}),
+        ('batch', {'seed': 0})
+    ]
+    
+    # Background simulation jobs (store path defaults to instance/)
+    JOB_STORE_PATH = os.environ.get('JOB_STORE_PATH')
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+    JOB_MAX_PENDING = 100
+    JOB_STALE_SECONDS = 60
+    JOB_TTL = 86400
+    
+    # Pre-fork warm-up: build shared tables in the gunicorn master before it
+    # forks the workers (gunicorn.conf.py turns on --preload to match)
+    PREFORK_WARM = os.environ.get('PREFORK_WARM', '0') == '1'
+    
+    # Prometheus-style metrics shared by all worker processes (path defaults to instance/)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+    METRICS_STORE_PATH = os.environ.get('METRICS_STORE_PATH')
+    METRICS_FLUSH_SECONDS = float(os.environ.get('METRICS_FLUSH_SECONDS', 5))
 
 
 class DevelopmentConfig(Config):
@@ -2,8 +2,13 @@
 Dice model with fair and tweaked probability modes
 """
 
+import os
+import threading
+import weakref
 import numpy as np
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
+from app.config import Config
 
 
 class Dice:
@@ -12,55 +17,169 @@ class Dice:
     
     Fair Mode: Each face has equal probability (1/6 ≈ 16.67%)
     Tweaked Mode: Custom probability distribution (must sum to 1)
+    
+    Instances are treated as immutable so they can be shared through
+    get_dice(); only the internal roll stream changes, under a lock.
+    Pass a Generator to the roll methods for reproducible draws.
     """
     
     FACES = [1, 2, 3, 4, 5, 6]
     
-    def __init__(self, probabilities: Optional[List[float]] = None):
+    # Number of faces pre-generated per refill of the roll() buffer
+    BUFFER_SIZE = 1024
+    
+    def __init__(
+        self,
+        probabilities: Optional[List[float]] = None,
+        seed: Optional[Union[int, np.random.Generator]] = None
+    ):
         """
         Initialize dice with given probabilities.
         
         Args:
             probabilities: List of 6 probabilities for faces 1-6.
                           If None, uses fair distribution (1/6 each).
+            seed: Seed or Generator for the dice's own stream (None = fresh entropy)
         """
         if probabilities is None:
             # Fair dice - equal probability for each face
-            self.probabilities = [1/6] * 6
             self.mode = 'fair'
         else:
             # Tweaked dice - custom probabilities
-            if len(probabilities) != 6:
-                raise ValueError("Probabilities must have exactly 6 values")
+            self.mode = 'tweaked'
+        self.probabilities = self.normalize(probabilities)
+        
+        # Moments are fixed for the lifetime of the dice
+        faces = np.array(self.FACES, dtype=float)
+        probs = np.array(self.probabilities)
+        self._expected_value = float(faces @ probs)
+        self._variance = float(probs @ (faces - self._expected_value) ** 2)
+        
+        self._build_alias_table()
+        
+        # Pre-generated faces served by roll(), refilled in bulk
+        self._buffer = np.empty(0, dtype=np.uint8)
+        self._buffer_pos = 0
+        self._buffer_lock = threading.Lock()
+        self._rng = np.random.default_rng(seed)
+        if seed is None:
+            _ENTROPY_DICE.add(self)
+    
+    def _reseed(self):
+        """Start a fresh entropy stream, discarding any buffered faces."""
+        self._buffer = np.empty(0, dtype=np.uint8)
+        self._buffer_pos = 0
+        self._buffer_lock = threading.Lock()
+        self._rng = np.random.default_rng()
+    
+    @staticmethod
+    def normalize(probabilities: Optional[List[float]] = None) -> Tuple[float, ...]:
+        """
+        Normalize probabilities to sum to 1.
+        
+        Args:
+            probabilities: List of 6 probabilities for faces 1-6 (None = fair)
             
-            # Normalize probabilities to sum to 1
-            total = sum(probabilities)
-            if total <= 0:
-                raise ValueError("Probabilities must sum to a positive value")
+        Returns:
+            Tuple of 6 normalized probabilities
+        """
+        if probabilities is None:
+            return (1/6,) * 6
+        
+        if len(probabilities) != 6:
+            raise ValueError("Probabilities must have exactly 6 values")
+        
+        total = sum(probabilities)
+        if total <= 0:
+            raise ValueError("Probabilities must sum to a positive value")
+        
+        return tuple(p / total for p in probabilities)
+    
+    def _build_alias_table(self):
+        """
+        Build a Walker/Vose alias table for O(1) sampling.
+        
+        Each of the six columns holds a probability threshold and an alias
+        face, so a roll needs one uniform draw instead of a CDF search.
+        """
+        n = len(self.FACES)
+        scaled = [p * n for p in self.probabilities]
+        threshold = np.ones(n)
+        alias = np.arange(n, dtype=np.uint8)
+        
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            threshold[s] = scaled[s]
+            alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1
+            (small if scaled[l] < 1 else large).append(l)
+        
+        self._alias_threshold = threshold
+        self._alias = alias
+    
+    def _sample(self, size, rng: np.random.Generator) -> np.ndarray:
+        """
+        Draw faces from the alias table.
+        
+        Args:
+            size: Number of rolls or an array shape
+            rng: Generator to draw from
             
-            self.probabilities = [p / total for p in probabilities]
-            self.mode = 'tweaked'
+        Returns:
+            uint8 array of faces (1-6)
+        """
+        u = rng.random(size) * len(self.FACES)
+        column = u.astype(np.uint8)
+        keep = (u - column) < self._alias_threshold[column]
+        return np.where(keep, column, self._alias[column]) + np.uint8(1)
     
-    def roll(self) -> int:
+    def roll(self, rng: Optional[np.random.Generator] = None) -> int:
         """
         Roll the dice and return the result (1-6).
         
+        Args:
+            rng: Generator to draw from (None = the dice's buffered stream)
+            
         Returns:
             int: The face that came up (1-6)
         """
-        return int(np.random.choice(self.FACES, p=self.probabilities))
+        if rng is not None:
+            return int(self._sample(1, rng)[0])
+        
+        with self._buffer_lock:
+            if self._buffer_pos >= len(self._buffer):
+                self._buffer = self._sample(self.BUFFER_SIZE, self._rng)
+                self._buffer_pos = 0
+            result = self._buffer[self._buffer_pos]
+            self._buffer_pos += 1
+        return int(result)
     
-    def roll_multiple(self, n: int) -> List[int]:
+    def roll_multiple(
+        self,
+        n: int,
+        as_array: bool = False,
+        rng: Optional[np.random.Generator] = None
+    ):
         """
         Roll the dice n times.
         
         Args:
             n: Number of rolls
+            as_array: Return a uint8 NumPy array instead of a list
+            rng: Generator to draw from (None = the dice's own stream)
             
         Returns:
-            List of results
+            List (or NumPy array) of results
         """
-        return list(np.random.choice(self.FACES, size=n, p=self.probabilities))
+        if rng is None:
+            with self._buffer_lock:
+                results = self._sample(n, self._rng)
+        else:
+            results = self._sample(n, rng)
+        return results if as_array else results.tolist()
     
     def expected_value(self) -> float:
         """
@@ -69,7 +188,7 @@ class Dice:
         Returns:
             float: Expected value
         """
-        return sum(face * prob for face, prob in zip(self.FACES, self.probabilities))
+        return self._expected_value
     
     def variance(self) -> float:
         """
@@ -78,8 +197,7 @@ class Dice:
         Returns:
             float: Variance
         """
-        ev = self.expected_value()
-        return sum(prob * (face - ev) ** 2 for face, prob in zip(self.FACES, self.probabilities))
+        return self._variance
     
     def std_dev(self) -> float:
         """
@@ -88,7 +206,7 @@ class Dice:
         Returns:
             float: Standard deviation
         """
-        return np.sqrt(self.variance())
+        return float(np.sqrt(self._variance))
     
     def get_probability(self, face: int) -> float:
         """
@@ -158,6 +276,55 @@ class Dice:
         return new_probs
 
 
+# Dice drawing from fresh entropy, reseeded in forked children so that
+# workers forked from a warmed-up parent never replay the same rolls
+_ENTROPY_DICE = weakref.WeakSet()
+
+
+def _reseed_after_fork():
+    """Give every entropy-seeded dice a fresh stream in a forked child."""
+    for dice in list(_ENTROPY_DICE):
+        dice._reseed()
+
+
+os.register_at_fork(after_in_child=_reseed_after_fork)
+
+
+@lru_cache(maxsize=Config.DICE_CACHE_SIZE)
+def _interned_dice(mode: str, probabilities: Tuple[float, ...]) -> Dice:
+    """Build the shared Dice for a normalized probability tuple."""
+    return Dice(None if mode == 'fair' else list(probabilities))
+
+
+def get_dice(probabilities: Optional[List[float]] = None) -> Dice:
+    """
+    Get a shared Dice for the given probabilities.
+    
+    Instances are interned in a bounded, thread-safe LRU registry keyed by
+    the normalized probability tuple, so repeated requests with the same
+    sliders reuse the precomputed moments and sampler tables.
+    
+    Args:
+        probabilities: List of 6 probabilities for faces 1-6 (None = fair)
+        
+    Returns:
+        Shared Dice instance
+    """
+    mode = 'fair' if probabilities is None else 'tweaked'
+    return _interned_dice(mode, Dice.normalize(probabilities))
+
+
+def dice_cache_info() -> dict:
+    """Hit/miss counters and occupancy of the Dice registry."""
+    info = _interned_dice.cache_info()
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'size': info.currsize,
+        'max_size': info.maxsize
+    }
+
+
 def create_fair_dice() -> Dice:
     """Create a fair dice with equal probabilities."""
     return Dice()
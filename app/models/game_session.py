@@ -2,10 +2,263 @@
 Game session model for player state management
 """
 
+import struct
+from array import array
 from typing import List, Dict, Optional
 from app.config import Config
 
 
+class RoundHistory:
+    """
+    Fixed-capacity ring buffer of recent rounds stored as parallel typed arrays.
+    
+    Appending overwrites the oldest round in place once the buffer is full,
+    and the columns serialize straight to bytes.
+    """
+    
+    __slots__ = ('capacity', 'head', 'size', 'round', 'bet_face', 'bet_amount', 'result', 'won', 'balance')
+    
+    # Column name -> array typecode
+    COLUMNS = (
+        ('round', 'I'),
+        ('bet_face', 'B'),
+        ('bet_amount', 'd'),
+        ('result', 'B'),
+        ('won', 'B'),
+        ('balance', 'd')
+    )
+    
+    def __init__(self, capacity: int = None):
+        """
+        Initialize an empty history.
+        
+        Args:
+            capacity: Number of rounds kept (defaults to Config.HISTORY_SIZE)
+        """
+        self.capacity = capacity or Config.HISTORY_SIZE
+        self.head = 0
+        self.size = 0
+        for name, typecode in self.COLUMNS:
+            setattr(self, name, array(typecode, bytes(array(typecode).itemsize * self.capacity)))
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def append(self, round_number: int, bet_face: int, bet_amount: float, result: int, won: bool, balance: float):
+        """Record a round, overwriting the oldest one when full."""
+        i = self.head
+        self.round[i] = round_number
+        self.bet_face[i] = bet_face
+        self.bet_amount[i] = bet_amount
+        self.result[i] = result
+        self.won[i] = won
+        self.balance[i] = balance
+        self.head = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+    
+    def _order(self, last: Optional[int] = None) -> range:
+        """Buffer indices of the stored rounds (or the last ones), oldest first."""
+        count = self.size if last is None else min(last, self.size)
+        start = self.head - count
+        return range(start, start + count)
+    
+    def column(self, name: str, last: Optional[int] = None) -> list:
+        """
+        One column of the stored rounds in chronological order.
+        
+        Args:
+            name: Column name from COLUMNS
+            last: Only the most recent rounds (None = all)
+            
+        Returns:
+            List of values, oldest first
+        """
+        values = getattr(self, name)
+        return [values[i] for i in self._order(last)]
+    
+    def entries(self, last: Optional[int] = None) -> List[Dict]:
+        """
+        Stored rounds as history dictionaries, oldest first.
+        
+        Args:
+            last: Only the most recent rounds (None = all)
+            
+        Returns:
+            List of round dictionaries
+        """
+        return [
+            {
+                'round': self.round[i],
+                'bet_face': self.bet_face[i],
+                'bet_amount': self.bet_amount[i],
+                'result': self.result[i],
+                'won': bool(self.won[i]),
+                'balance': self.balance[i]
+            }
+            for i in self._order(last)
+        ]
+    
+    def _chronological(self, values: array) -> array:
+        """A column's stored values, oldest first."""
+        if self.size < self.capacity:
+            return values[:self.size]
+        return values[self.head:] + values[:self.head]
+    
+    def to_bytes(self) -> bytes:
+        """Serialize the stored rounds column by column, oldest first."""
+        return b''.join(
+            self._chronological(getattr(self, name)).tobytes() for name, _ in self.COLUMNS
+        )
+    
+    @classmethod
+    def from_bytes(cls, data: bytes, size: int, capacity: int = None) -> 'RoundHistory':
+        """
+        Rebuild a history from to_bytes output.
+        
+        Args:
+            data: Serialized columns
+            size: Number of rounds encoded
+            capacity: Ring capacity (defaults to Config.HISTORY_SIZE)
+            
+        Returns:
+            RoundHistory instance
+        """
+        history = cls.__new__(cls)
+        history.capacity = capacity or Config.HISTORY_SIZE
+        kept = min(size, history.capacity)
+        offset = 0
+        for name, typecode in cls.COLUMNS:
+            column = array(typecode)
+            itemsize = column.itemsize
+            # Keep the newest rounds if the capacity shrank, then pad to capacity
+            column.frombytes(data[offset + itemsize * (size - kept):offset + itemsize * size])
+            column.frombytes(bytes(itemsize * (history.capacity - kept)))
+            setattr(history, name, column)
+            offset += itemsize * size
+        history.size = kept
+        history.head = kept % history.capacity
+        return history
+
+
+class LifetimeStats:
+    """
+    Running aggregates over every round of a session, updated in O(1) per roll.
+    
+    Unlike the bounded round history these are exact for sessions of any
+    length: bets and wins per bet face, total wagered and paid out, an
+    online (Welford) mean and variance of bet sizes, and run-length
+    summaries of win/loss streaks.
+    """
+    
+    __slots__ = (
+        'bet_face_counts', 'bet_face_wins', 'total_wagered', 'total_won',
+        'bet_count', 'bet_mean', 'bet_m2', 'win_runs', 'lose_runs', 'streaks'
+    )
+    
+    # Closed streaks kept for the streak history chart
+    RECENT_STREAKS = 20
+    
+    # Binary layout: bets and wins per face, money totals, Welford state,
+    # run counts and number of recent streaks; then the streaks themselves
+    _STRUCT = struct.Struct('<6q6q2dq2d2qH')
+    
+    def __init__(self):
+        """Initialize empty aggregates."""
+        self.bet_face_counts = [0] * 6
+        self.bet_face_wins = [0] * 6
+        self.total_wagered = 0
+        self.total_won = 0
+        self.bet_count = 0
+        self.bet_mean = 0.0
+        self.bet_m2 = 0.0
+        self.win_runs = 0
+        self.lose_runs = 0
+        self.streaks: List[int] = []
+    
+    def record(self, bet_face: int, bet_amount: float, won: bool, previous_streak: int):
+        """
+        Fold one round into the aggregates.
+        
+        Args:
+            bet_face: Face the player bet on
+            bet_amount: Amount wagered
+            won: Whether the bet won
+            previous_streak: Signed streak before this round (wins > 0, losses < 0)
+        """
+        if 1 <= bet_face <= 6:
+            self.bet_face_counts[bet_face - 1] += 1
+            if won:
+                self.bet_face_wins[bet_face - 1] += 1
+        
+        self.total_wagered += bet_amount
+        if won:
+            self.total_won += bet_amount * Config.PAYOUT_MULTIPLIER
+        
+        # Welford's online mean and variance of bet sizes
+        self.bet_count += 1
+        delta = bet_amount - self.bet_mean
+        self.bet_mean += delta / self.bet_count
+        self.bet_m2 += delta * (bet_amount - self.bet_mean)
+        
+        # A new run starts whenever the outcome differs from the current streak
+        if won and previous_streak <= 0:
+            self.win_runs += 1
+        elif not won and previous_streak >= 0:
+            self.lose_runs += 1
+        else:
+            return
+        if previous_streak != 0:
+            self.streaks.append(previous_streak)
+            if len(self.streaks) > self.RECENT_STREAKS:
+                del self.streaks[0]
+    
+    def to_dict(self) -> Dict:
+        """Aggregates as a JSON-serializable dictionary."""
+        return {name: getattr(self, name) for name in self.__slots__}
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'LifetimeStats':
+        """Rebuild aggregates from to_dict output."""
+        stats = cls()
+        for name in cls.__slots__:
+            if name in data:
+                setattr(stats, name, data[name])
+        return stats
+    
+    def to_bytes(self) -> bytes:
+        """Encode the aggregates."""
+        return self._STRUCT.pack(
+            *self.bet_face_counts, *self.bet_face_wins, self.total_wagered, self.total_won,
+            self.bet_count, self.bet_mean, self.bet_m2, self.win_runs, self.lose_runs,
+            len(self.streaks)
+        ) + array('q', self.streaks).tobytes()
+    
+    @classmethod
+    def from_bytes(cls, data: bytes, offset: int = 0) -> tuple:
+        """
+        Decode aggregates produced by to_bytes.
+        
+        Args:
+            data: Buffer holding the encoded aggregates
+            offset: Position of the aggregates in the buffer
+            
+        Returns:
+            Tuple of (LifetimeStats, offset just past the aggregates)
+        """
+        fields = cls._STRUCT.unpack_from(data, offset)
+        stats = cls.__new__(cls)
+        stats.bet_face_counts = list(fields[0:6])
+        stats.bet_face_wins = list(fields[6:12])
+        (stats.total_wagered, stats.total_won, stats.bet_count, stats.bet_mean,
+         stats.bet_m2, stats.win_runs, stats.lose_runs) = fields[12:19]
+        
+        offset += cls._STRUCT.size
+        streaks = array('q')
+        streaks.frombytes(data[offset:offset + streaks.itemsize * fields[19]])
+        stats.streaks = streaks.tolist()
+        return stats, offset + streaks.itemsize * fields[19]
+
+
 class GameSession:
     """
     Manages the state of a player's game session.
@@ -13,6 +266,17 @@ class GameSession:
     Tracks balance, profit/loss, game history, and statistics.
     """
     
+    __slots__ = (
+        'player_name', 'initial_balance', 'balance', 'profit', 'total_rounds', 'wins', 'losses',
+        'rounds', '_face_counts', 'current_streak', 'max_win_streak', 'max_lose_streak', 'lifetime'
+    )
+    
+    # Binary layout: version, balances, round counters, face counts, streaks,
+    # history length and player name length; then the lifetime aggregates,
+    # the name and the history columns
+    _HEADER = struct.Struct('<B3d3q6q3qHH')
+    _VERSION = 2
+    
     def __init__(
         self,
         player_name: str = "Player",
@@ -32,11 +296,30 @@ class GameSession:
         self.total_rounds = 0
         self.wins = 0
         self.losses = 0
-        self.history: List[Dict] = []
-        self.face_counts = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0}
+        self.rounds = RoundHistory()
+        self._face_counts = [0] * 6
         self.current_streak = 0
         self.max_win_streak = 0
         self.max_lose_streak = 0
+        self.lifetime = LifetimeStats()
+    
+    @property
+    def history(self) -> List[Dict]:
+        """Recent rounds as dictionaries, oldest first (at most Config.HISTORY_SIZE)."""
+        return self.rounds.entries()
+    
+    def recent_history(self, count: int) -> List[Dict]:
+        """The last count rounds as dictionaries, oldest first."""
+        return self.rounds.entries(last=count)
+    
+    @property
+    def face_counts(self) -> Dict[int, int]:
+        """Count of each rolled face."""
+        return {face: self._face_counts[face - 1] for face in range(1, 7)}
+    
+    @face_counts.setter
+    def face_counts(self, counts: Dict):
+        self._face_counts = [int(counts.get(face, counts.get(str(face), 0))) for face in range(1, 7)]
     
     @property
     def win_rate(self) -> float:
@@ -52,15 +335,22 @@ class GameSession:
         Args:
             entry: Dictionary with round information
         """
-        self.history.append(entry)
+        self._track_round(
+            entry.get('round', self.total_rounds), entry.get('bet_face', 0), entry.get('bet_amount', 0),
+            entry.get('result', 0), entry.get('won', False), entry.get('balance', self.balance)
+        )
+    
+    def _track_round(self, round_number: int, bet_face: int, bet_amount: float, result: int, won: bool, balance: float):
+        """Append a round to the ring buffer and update the lifetime aggregates."""
+        self.rounds.append(round_number, bet_face, bet_amount, result, won, balance)
+        self.lifetime.record(bet_face, bet_amount, won, self.current_streak)
         
         # Update face counts
-        result = entry.get('result', 0)
-        if result in self.face_counts:
-            self.face_counts[result] += 1
+        if 1 <= result <= 6:
+            self._face_counts[result - 1] += 1
         
         # Update streak tracking
-        if entry.get('won', False):
+        if won:
             if self.current_streak > 0:
                 self.current_streak += 1
             else:
@@ -72,10 +362,67 @@ class GameSession:
             else:
                 self.current_streak = -1
             self.max_lose_streak = max(self.max_lose_streak, abs(self.current_streak))
+    
+    def record_roll(self, bet_face: int, bet_amount: float, result: int) -> bool:
+        """
+        Settle a bet on a rolled face and record the round.
         
-        # Keep only last 100 entries to prevent memory issues
-        if len(self.history) > 100:
-            self.history = self.history[-100:]
+        Args:
+            bet_face: Face the player bet on
+            bet_amount: Amount wagered
+            result: Face that was rolled
+            
+        Returns:
+            True if the bet won
+        """
+        won = result == bet_face
+        if won:
+            winnings = bet_amount * Config.PAYOUT_MULTIPLIER
+            self.balance += winnings - bet_amount
+            self.profit += winnings - bet_amount
+            self.wins += 1
+        else:
+            self.balance -= bet_amount
+            self.profit -= bet_amount
+            self.losses += 1
+        
+        self.total_rounds += 1
+        
+        self._track_round(self.total_rounds, bet_face, bet_amount, result, won, self.balance)
+        return won
+    
+    def record_rolls(self, bet_face: int, bet_amount: float, results: List[int]) -> int:
+        """
+        Settle the same bet on a sequence of rolled faces.
+        
+        Args:
+            bet_face: Face the player bet on every round
+            bet_amount: Amount wagered every round
+            results: Faces rolled, in order
+            
+        Returns:
+            Number of rounds won
+        """
+        return sum(self.record_roll(bet_face, bet_amount, result) for result in results)
+    
+    def apply_event(self, kind: str, data):
+        """
+        Replay a logged session event.
+        
+        Args:
+            kind: 'roll', 'rolls', 'funds' or 'player'
+            data: [bet_face, bet_amount, result] for a roll, [bet_face,
+                bet_amount, [results]] for auto-played rolls, the amount
+                added for funds, or the new player name
+        """
+        if kind == 'roll':
+            self.record_roll(*data)
+        elif kind == 'rolls':
+            self.record_rolls(*data)
+        elif kind == 'funds':
+            self.balance += data
+        elif kind == 'player':
+            self.player_name = data
     
     def reset(self):
         """Reset the game session to initial state."""
@@ -84,11 +431,12 @@ class GameSession:
         self.total_rounds = 0
         self.wins = 0
         self.losses = 0
-        self.history = []
-        self.face_counts = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0}
+        self.rounds = RoundHistory()
+        self._face_counts = [0] * 6
         self.current_streak = 0
         self.max_win_streak = 0
         self.max_lose_streak = 0
+        self.lifetime = LifetimeStats()
     
     def to_dict(self) -> Dict:
         """
@@ -109,7 +457,8 @@ class GameSession:
             'face_counts': self.face_counts,
             'current_streak': self.current_streak,
             'max_win_streak': self.max_win_streak,
-            'max_lose_streak': self.max_lose_streak
+            'max_lose_streak': self.max_lose_streak,
+            'lifetime': self.lifetime.to_dict()
         }
     
     @classmethod
@@ -132,13 +481,136 @@ class GameSession:
         session.total_rounds = data.get('total_rounds', 0)
         session.wins = data.get('wins', 0)
         session.losses = data.get('losses', 0)
-        session.history = data.get('history', [])
-        session.face_counts = data.get('face_counts', {1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0})
+        for entry in data.get('history', [])[-session.rounds.capacity:]:
+            session.rounds.append(
+                entry['round'], entry['bet_face'], entry['bet_amount'],
+                entry['result'], entry['won'], entry['balance']
+            )
+        # JSON snapshots turn the integer face keys into strings
+        session.face_counts = data.get('face_counts', {})
         session.current_streak = data.get('current_streak', 0)
         session.max_win_streak = data.get('max_win_streak', 0)
         session.max_lose_streak = data.get('max_lose_streak', 0)
+        session.lifetime = LifetimeStats.from_dict(data.get('lifetime', {}))
+        return session
+    
+    def to_bytes(self) -> bytes:
+        """
+        Encode the session in a compact binary form.
+        
+        Returns:
+            Fixed-size header, lifetime aggregates, UTF-8 player name, then
+            the history columns
+        """
+        name = self.player_name.encode('utf-8')
+        header = self._HEADER.pack(
+            self._VERSION, self.initial_balance, self.balance, self.profit,
+            self.total_rounds, self.wins, self.losses, *self._face_counts,
+            self.current_streak, self.max_win_streak, self.max_lose_streak,
+            len(self.rounds), len(name)
+        )
+        return header + self.lifetime.to_bytes() + name + self.rounds.to_bytes()
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'GameSession':
+        """
+        Decode a session produced by to_bytes.
+        
+        Args:
+            data: Encoded session
+            
+        Returns:
+            GameSession instance
+        """
+        fields = cls._HEADER.unpack_from(data)
+        if fields[0] != cls._VERSION:
+            raise ValueError(f'Unsupported session encoding version {fields[0]}')
+        
+        session = cls.__new__(cls)
+        (session.initial_balance, session.balance, session.profit,
+         session.total_rounds, session.wins, session.losses) = fields[1:7]
+        session._face_counts = list(fields[7:13])
+        session.current_streak, session.max_win_streak, session.max_lose_streak = fields[13:16]
+        history_size, name_size = fields[16:18]
+        
+        session.lifetime, offset = LifetimeStats.from_bytes(data, cls._HEADER.size)
+        session.player_name = data[offset:offset + name_size].decode('utf-8')
+        session.rounds = RoundHistory.from_bytes(data[offset + name_size:], history_size)
         return session
     
+    def face_distribution(self) -> Dict:
+        """
+        Lifetime distribution of rolled faces.
+        
+        Returns:
+            Dictionary with face counts and percentages
+        """
+        counts = self.face_counts
+        total = sum(self._face_counts)
+        
+        return {
+            'counts': counts,
+            'percentages': {
+                face: round((count / total) * 100, 2) if total > 0 else 0
+                for face, count in counts.items()
+            },
+            'total_rolls': total,
+            'expected_percentage': 16.67
+        }
+    
+    def streak_analysis(self) -> Dict:
+        """
+        Lifetime win/loss streak summary.
+        
+        Returns:
+            Dictionary with streak statistics and run-length summaries
+        """
+        lifetime = self.lifetime
+        streaks = lifetime.streaks + ([self.current_streak] if self.current_streak else [])
+        wins = sum(lifetime.bet_face_wins)
+        losses = lifetime.bet_count - wins
+        
+        return {
+            'current_streak': self.current_streak,
+            'max_win_streak': self.max_win_streak,
+            'max_lose_streak': self.max_lose_streak,
+            'streak_history': streaks[-LifetimeStats.RECENT_STREAKS:],
+            'win_runs': lifetime.win_runs,
+            'lose_runs': lifetime.lose_runs,
+            'mean_win_streak': round(wins / lifetime.win_runs, 2) if lifetime.win_runs else 0,
+            'mean_lose_streak': round(losses / lifetime.lose_runs, 2) if lifetime.lose_runs else 0
+        }
+    
+    def bet_analysis(self) -> Dict:
+        """
+        Lifetime betting patterns and outcomes.
+        
+        Returns:
+            Dictionary with bet statistics
+        """
+        lifetime = self.lifetime
+        face_performance = {}
+        for face in range(1, 7):
+            count = lifetime.bet_face_counts[face - 1]
+            if count > 0:
+                wins = lifetime.bet_face_wins[face - 1]
+                face_performance[face] = {
+                    'times_bet': count,
+                    'wins': wins,
+                    'win_rate': round((wins / count) * 100, 2)
+                }
+        
+        variance = lifetime.bet_m2 / lifetime.bet_count if lifetime.bet_count else 0
+        
+        return {
+            'total_wagered': lifetime.total_wagered,
+            'total_won': lifetime.total_won,
+            'total_lost': lifetime.total_wagered - lifetime.total_won,
+            'avg_bet': round(lifetime.bet_mean, 2),
+            'bet_std': round(variance ** 0.5, 2),
+            'bet_face_performance': face_performance
+        }
+    
     def get_statistics(self) -> Dict:
         """
         Get comprehensive statistics for the session.
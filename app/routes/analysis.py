@@ -4,7 +4,7 @@ Results and Analysis routes
 
 from flask import Blueprint, render_template, request, jsonify, session
 from app.services.statistics import StatisticalAnalyzer
-from app.models.game_session import GameSession
+from app.services.session_store import session_store
 
 analysis_bp = Blueprint('analysis', __name__)
 
@@ -18,11 +18,12 @@ def analysis():
 @analysis_bp.route('/session-stats')
 def session_stats():
     """Get statistics from current game session"""
-    if 'game_data' not in session:
+    game_session = session_store.load(session.get('game_id'))
+    if game_session is None:
         return jsonify({'error': 'No game session found'}), 404
-    
-    game_session = GameSession.from_dict(session['game_data'])
-    analyzer = StatisticalAnalyzer(game_session.history)
+    # Lifetime aggregates are maintained per roll; only the chart uses recent history
+    rounds = game_session.rounds
+    analyzer = StatisticalAnalyzer.from_columns({name: rounds.column(name) for name, _ in rounds.COLUMNS})
     
     return jsonify({
         'basic_stats': {
@@ -33,10 +34,10 @@ def session_stats():
             'profit': game_session.profit,
             'balance': game_session.balance
         },
-        'face_distribution': analyzer.face_distribution(),
+        'face_distribution': game_session.face_distribution(),
         'profit_over_time': analyzer.profit_over_time(),
-        'streak_analysis': analyzer.streak_analysis(),
-        'bet_analysis': analyzer.bet_analysis()
+        'streak_analysis': game_session.streak_analysis(),
+        'bet_analysis': game_session.bet_analysis()
     })
 
 
@@ -72,11 +73,10 @@ def compare_modes():
 @analysis_bp.route('/export')
 def export_data():
     """Export session data as JSON"""
-    if 'game_data' not in session:
+    game_session = session_store.load(session.get('game_id'))
+    if game_session is None:
         return jsonify({'error': 'No game session found'}), 404
     
-    game_session = GameSession.from_dict(session['game_data'])
-    
     return jsonify({
         'player_name': game_session.player_name,
         'balance': game_session.balance,
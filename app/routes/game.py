@@ -2,25 +2,28 @@
 Dice game routes
 """
 
+import numpy as np
 from flask import Blueprint, render_template, request, jsonify, session
-from app.models.dice import Dice
+from app.models.dice import get_dice
 from app.models.game_session import GameSession
+from app.services.session_store import session_store
 from app.config import Config
 
 game_bp = Blueprint('game', __name__)
 
 
 def get_game_session():
-    """Get or create game session from flask session"""
-    if 'game_data' not in session:
-        session['game_data'] = GameSession().to_dict()
-    return GameSession.from_dict(session['game_data'])
+    """Get or create the game session referenced by the flask session cookie"""
+    game_session = session_store.load(session.get('game_id'))
+    if game_session is None:
+        game_session = GameSession()
+        session['game_id'] = session_store.create(game_session)
+    return game_session
 
 
-def save_game_session(game_session):
-    """Save game session to flask session"""
-    session['game_data'] = game_session.to_dict()
-    session.modified = True
+def log_game_event(kind, data):
+    """Append an event to the current game session's log"""
+    session_store.append(session['game_id'], kind, data)
 
 
 @game_bp.route('/')
@@ -49,35 +52,87 @@ def roll():
     if bet_face < 1 or bet_face > 6:
         return jsonify({'error': 'Invalid bet face'}), 400
     
-    dice = Dice(probabilities)
+    dice = get_dice(probabilities)
     result = dice.roll()
-    won = result == bet_face
-    if won:
-        winnings = bet_amount * Config.PAYOUT_MULTIPLIER
-        game_session.balance += winnings - bet_amount
-        game_session.profit += winnings - bet_amount
-        game_session.wins += 1
-    else:
-        game_session.balance -= bet_amount
-        game_session.profit -= bet_amount
-        game_session.losses += 1
-    
-    game_session.total_rounds += 1
-    
-    game_session.add_history({
-        'round': game_session.total_rounds,
-        'bet_face': bet_face,
-        'bet_amount': bet_amount,
+    won = game_session.record_roll(bet_face, bet_amount, result)
+    log_game_event('roll', [bet_face, bet_amount, result])
+    
+    return jsonify({
         'result': result,
         'won': won,
-        'balance': game_session.balance
+        'balance': game_session.balance,
+        'profit': game_session.profit,
+        'total_rounds': game_session.total_rounds,
+        'wins': game_session.wins,
+        'losses': game_session.losses,
+        'win_rate': game_session.win_rate
     })
+
+
+@game_bp.route('/autoplay', methods=['POST'])
+def autoplay():
+    """Play up to N rounds of the same bet in one request"""
+    data = request.get_json()
+    bet_face = data.get('bet_face', 1)
+    bet_amount = data.get('bet_amount', 10)
+    rounds = data.get('rounds', 10)
+    probabilities = data.get('probabilities', None)
+    stop_loss = data.get('stop_loss', None)
+    take_profit = data.get('take_profit', None)
+    
+    game_session = get_game_session()
     
-    save_game_session(game_session)
+    if bet_amount < Config.MIN_BET or bet_amount > Config.MAX_BET:
+        return jsonify({'error': f'Bet must be between ${Config.MIN_BET} and ${Config.MAX_BET}'}), 400
+    
+    if bet_amount > game_session.balance:
+        return jsonify({'error': 'Insufficient balance'}), 400
+    
+    if bet_face < 1 or bet_face > 6:
+        return jsonify({'error': 'Invalid bet face'}), 400
+    
+    if not isinstance(rounds, int) or rounds < 1 or rounds > Config.MAX_AUTOPLAY_ROUNDS:
+        return jsonify({'error': f'Rounds must be between 1 and {Config.MAX_AUTOPLAY_ROUNDS}'}), 400
+    
+    if (stop_loss is not None and stop_loss <= 0) or (take_profit is not None and take_profit <= 0):
+        return jsonify({'error': 'Stop-loss and take-profit must be positive amounts'}), 400
+    
+    # Roll every round at once, then settle them as one balance path
+    dice = get_dice(probabilities)
+    results = dice.roll_multiple(rounds, as_array=True)
+    won = results == bet_face
+    deltas = np.where(won, bet_amount * Config.PAYOUT_MULTIPLIER - bet_amount, -bet_amount)
+    balances = np.cumsum(np.concatenate(([game_session.balance], deltas)))[1:]
+    net = balances - game_session.balance
+    
+    # Stop after the first round that trips a condition. Conditions are listed in
+    # priority order: when several trip in that same round, the first one listed
+    # is reported (running out of money outranks the player's own limits)
+    conditions = [('bankrupt', balances < bet_amount)]
+    if stop_loss is not None:
+        conditions.append(('stop_loss', net <= -stop_loss))
+    if take_profit is not None:
+        conditions.append(('take_profit', net >= take_profit))
+    
+    played, stop_reason = rounds, None
+    for reason, tripped in conditions:
+        hits = np.flatnonzero(tripped[:played])
+        if len(hits) and (stop_reason is None or hits[0] + 1 < played):
+            played, stop_reason = int(hits[0]) + 1, reason
+    
+    results = results[:played].tolist()
+    wins = game_session.record_rolls(bet_face, bet_amount, results)
+    log_game_event('rolls', [bet_face, bet_amount, results])
     
     return jsonify({
-        'result': result,
-        'won': won,
+        'rounds_played': played,
+        'stop_reason': stop_reason,
+        'results': results,
+        'won': won[:played].tolist(),
+        'balances': balances[:played].tolist(),
+        'round_wins': wins,
+        'round_losses': played - wins,
+        'net': net[played - 1].item(),
         'balance': game_session.balance,
         'profit': game_session.profit,
         'total_rounds': game_session.total_rounds,
@@ -98,7 +153,7 @@ def add_funds():
     
     game_session = get_game_session()
     game_session.balance += amount
-    save_game_session(game_session)
+    log_game_event('funds', amount)
     
     return jsonify({
         'balance': game_session.balance,
@@ -114,7 +169,7 @@ def set_player():
     
     game_session = get_game_session()
     game_session.player_name = name[:20]
-    save_game_session(game_session)
+    log_game_event('player', game_session.player_name)
     
     return jsonify({
         'player_name': game_session.player_name
@@ -124,8 +179,8 @@ def set_player():
 @game_bp.route('/reset', methods=['POST'])
 def reset():
     """Reset game session"""
-    session['game_data'] = GameSession().to_dict()
-    session.modified = True
+    get_game_session()
+    session_store.replace(session['game_id'], GameSession())
     
     return jsonify({
         'message': 'Game reset successfully',
@@ -144,5 +199,5 @@ def stats():
         'wins': game_session.wins,
         'losses': game_session.losses,
         'win_rate': game_session.win_rate,
-        'history': game_session.history[-10:]
+        'history': game_session.recent_history(10)
     })
@@ -2,99 +2,534 @@
 Monte Carlo simulation routes
 """
 
-from flask import Blueprint, render_template, request, jsonify
+import json
+from flask import Blueprint, Response, current_app, render_template, request, jsonify
 from app.services.monte_carlo import MonteCarloSimulation
+from app.services.exact_solver import ExactRuinSolver
+from app.services.strategies import create_strategy
+from app.services.result_cache import result_cache
+from app.services.job_queue import job_queue, QueueFullError
 from app.config import Config
 
 simulation_bp = Blueprint('simulation', __name__)
 
 
-@simulation_bp.route('/')
-def simulation():
-    """Render the Monte Carlo simulation page"""
-    return render_template('simulation.html')
+def parse_seed(data):
+    """Return the optional seed from a request body, or raise ValueError."""
+    seed = data.get('seed')
+    if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool) or seed < 0):
+        raise ValueError('Seed must be a non-negative integer')
+    return seed
 
 
-@simulation_bp.route('/run', methods=['POST'])
-def run_simulation():
-    """Run Monte Carlo simulation"""
-    data = request.get_json()
+def parse_probabilities(data):
+    """Return the dice probabilities for the requested game mode."""
+    if data.get('game_mode', 'fair') != 'tweaked':
+        return None
+    return data.get('probabilities', None)
+
+
+def parse_strategy(data):
+    """
+    Validate the betting strategy of a request body: its name, options and limits.
     
-    num_trials = min(data.get('num_trials', 10000), Config.MAX_SIMULATION_TRIALS)
-    starting_balance = data.get('starting_balance', 1000)
-    bet_amount = data.get('bet_amount', 10)
-    bet_strategy = data.get('bet_strategy', 'fixed')
-    game_mode = data.get('game_mode', 'fair')
-    probabilities = data.get('probabilities', None)
-    target_face = data.get('target_face', None)
+    Returns the canonical strategy parameters, or raises ValueError for an
+    unknown strategy or invalid options instead of falling back to fixed bets.
+    """
+    strategy = {
+        'bet_strategy': data.get('bet_strategy', 'fixed'),
+        'strategy_options': data.get('strategy_options') or {},
+        'stop_loss': data.get('stop_loss', None),
+        'take_profit': data.get('take_profit', None)
+    }
+    if not isinstance(strategy['strategy_options'], dict):
+        raise ValueError('Strategy options must be an object')
     
-    if num_trials < 100:
-        return jsonify({'error': 'Minimum 100 trials required'}), 400
+    create_strategy(
+        strategy['bet_strategy'], 1, Config.PAYOUT_MULTIPLIER, 1/6, 1,
+        strategy['stop_loss'], strategy['take_profit'], **strategy['strategy_options']
+    )
+    return strategy
+
+
+def strategy_arguments(params):
+    """MonteCarloSimulation keyword arguments for the strategy in canonical parameters."""
+    # Jobs queued before strategy options existed carry only bet_strategy
+    return {
+        'bet_strategy': params['bet_strategy'],
+        'strategy_options': params.get('strategy_options'),
+        'stop_loss': params.get('stop_loss'),
+        'take_profit': params.get('take_profit')
+    }
+
+
+def run_params(data):
+    """Validate a /run request body into canonical parameters."""
+    params = {
+        'num_trials': min(data.get('num_trials', 10000), Config.MAX_SIMULATION_TRIALS),
+        'starting_balance': data.get('starting_balance', 1000),
+        'bet_amount': data.get('bet_amount', 10),
+        **parse_strategy(data),
+        'probabilities': parse_probabilities(data),
+        'target_face': data.get('target_face', None),
+        'trajectory': data.get('trajectory', 'sampled'),
+        'seed': parse_seed(data)
+    }
     
-    if starting_balance < 10:
-        return jsonify({'error': 'Starting balance must be at least $10'}), 400
+    if params['trajectory'] not in ('sampled', 'envelope'):
+        raise ValueError("Trajectory must be 'sampled' or 'envelope'")
     
-    if bet_amount < 1:
-        return jsonify({'error': 'Bet amount must be at least $1'}), 400
+    if params['num_trials'] < 100:
+        raise ValueError('Minimum 100 trials required')
     
-    mc = MonteCarloSimulation(
-        num_trials=num_trials,
-        starting_balance=starting_balance,
-        bet_amount=bet_amount,
-        bet_strategy=bet_strategy,
-        probabilities=probabilities if game_mode == 'tweaked' else None,
-        target_face=target_face
-    )
+    if params['starting_balance'] < 10:
+        raise ValueError('Starting balance must be at least $10')
     
-    results = mc.run()
+    if params['bet_amount'] < 1:
+        raise ValueError('Bet amount must be at least $1')
     
-    return jsonify(results)
+    return params
 
 
-@simulation_bp.route('/convergence', methods=['POST'])
-def convergence_analysis():
-    """Run convergence analysis - shows how empirical probability approaches theoretical"""
-    data = request.get_json()
+def run_events(params, chunk_size=None):
+    """Iterate a single simulation's progress and result events."""
+    mc = MonteCarloSimulation(
+        num_trials=params['num_trials'],
+        starting_balance=params['starting_balance'],
+        bet_amount=params['bet_amount'],
+        **strategy_arguments(params),
+        probabilities=params['probabilities'],
+        target_face=params['target_face']
+    )
+    if params['trajectory'] == 'envelope':
+        return mc.iter_run_envelope(seed=params['seed'], chunk_size=chunk_size)
+    return mc.iter_run(seed=params['seed'], chunk_size=chunk_size)
+
+
+def run_compute(params):
+    """Run a single simulation from canonical parameters."""
+    for event, payload in run_events(params):
+        pass
+    return payload
+
+
+def run_stream(params):
+    """Stream a single simulation in chunks of Config.STREAM_CHUNK_TRIALS rounds."""
+    return run_events(params, chunk_size=Config.STREAM_CHUNK_TRIALS)
+
+
+def convergence_params(data):
+    """Validate a /convergence request body into canonical parameters."""
+    params = {
+        'max_trials': min(data.get('max_trials', 10000), Config.MAX_CONVERGENCE_TRIALS),
+        'probabilities': parse_probabilities(data),
+        'target_face': data.get('target_face', 1),
+        'spacing': data.get('spacing', 'linear'),
+        'seed': parse_seed(data)
+    }
     
-    max_trials = min(data.get('max_trials', 10000), 100000)
-    game_mode = data.get('game_mode', 'fair')
-    probabilities = data.get('probabilities', None)
-    target_face = data.get('target_face', 1)
+    if params['spacing'] not in ('linear', 'log'):
+        raise ValueError("Spacing must be 'linear' or 'log'")
     
+    return params
+
+
+def convergence_compute(params):
+    """Run a convergence analysis from canonical parameters."""
     mc = MonteCarloSimulation(
-        num_trials=max_trials,
+        num_trials=params['max_trials'],
         starting_balance=10000,
         bet_amount=10,
-        probabilities=probabilities if game_mode == 'tweaked' else None,
-        target_face=target_face
+        probabilities=params['probabilities'],
+        target_face=params['target_face']
+    )
+    return mc.convergence_analysis(checkpoints=50, seed=params['seed'], spacing=params['spacing'])
+
+
+def convergence_events(params):
+    """Yield a convergence analysis as a single result event."""
+    yield 'result', convergence_compute(params)
+
+
+def parse_precision(precision):
+    """
+    Validate a precision target: {"metric": ..., "half_width": ...}.
+    
+    With a target, num_simulations becomes the budget the batch may stop short of.
+    """
+    if precision is None:
+        return None
+    if not isinstance(precision, dict):
+        raise ValueError('Precision must be an object with metric and half_width')
+    
+    metric = precision.get('metric')
+    half_width = precision.get('half_width')
+    if metric not in MonteCarloSimulation.PRECISION_METRICS:
+        raise ValueError(f"Precision metric must be one of: {', '.join(MonteCarloSimulation.PRECISION_METRICS)}")
+    if not isinstance(half_width, (int, float)) or isinstance(half_width, bool) or not half_width > 0:
+        raise ValueError('Precision half_width must be a positive number')
+    
+    return {'metric': metric, 'half_width': half_width}
+
+
+def batch_params(data, long_running=False):
+    """
+    Validate a /batch request body into canonical parameters.
+    
+    Summary and precision-targeted batches keep constant memory, so streamed
+    and background batches (long_running) may run up to
+    Config.MAX_SUMMARY_BATCH_SIMULATIONS of them. A synchronous request holds
+    its worker for the whole batch, so it keeps Config.MAX_BATCH_SIMULATIONS.
+    """
+    distribution = data.get('distribution', 'full')
+    precision = data.get('precision', None)
+    max_simulations = (
+        Config.MAX_SUMMARY_BATCH_SIMULATIONS
+        if long_running and (distribution == 'summary' or precision is not None)
+        else Config.MAX_BATCH_SIMULATIONS
+    )
+    params = {
+        'num_simulations': min(data.get('num_simulations', 100), max_simulations),
+        'trials_per_sim': min(data.get('trials_per_sim', 1000), Config.MAX_BATCH_TRIALS),
+        'starting_balance': data.get('starting_balance', 1000),
+        'bet_amount': data.get('bet_amount', 10),
+        **parse_strategy(data),
+        'probabilities': parse_probabilities(data),
+        'exact': data.get('exact', None),
+        'distribution': distribution,
+        'histogram_range': data.get('histogram_range', None),
+        'precision': parse_precision(precision),
+        'seed': parse_seed(data)
+    }
+    
+    if params['exact'] not in (None, 'overlay', 'only'):
+        raise ValueError("Exact must be 'overlay' or 'only'")
+    
+    if distribution not in ('full', 'summary'):
+        raise ValueError("Distribution must be 'full' or 'summary'")
+    
+    if params['precision'] is not None and params['exact'] == 'overlay':
+        raise ValueError("Precision-targeted batches have no histogram to overlay; use exact 'only'")
+    
+    histogram_range = params['histogram_range']
+    if histogram_range is not None and (
+        not isinstance(histogram_range, list) or len(histogram_range) != 2
+        or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in histogram_range)
+        or not histogram_range[0] < histogram_range[1]
+    ):
+        raise ValueError('Histogram range must be [low, high] with low < high')
+    
+    return params
+
+
+def batch_events(params, chunk_size=None):
+    """Iterate a batch simulation's progress and result events (with exact solution)."""
+    mc = MonteCarloSimulation(
+        num_trials=params['trials_per_sim'],
+        starting_balance=params['starting_balance'],
+        bet_amount=params['bet_amount'],
+        **strategy_arguments(params),
+        probabilities=params['probabilities']
+    )
+    
+    exact = params['exact']
+    if exact is not None:
+        solver = ExactRuinSolver.from_simulation(mc)
+    
+    if exact == 'only':
+        yield 'result', {
+            'method': 'exact',
+            'trials_per_simulation': params['trials_per_sim'],
+            **solver.solve()
+        }
+        return
+    
+    if params['precision'] is not None:
+        events = mc.iter_until_precision(
+            params['precision']['metric'], params['precision']['half_width'],
+            max_simulations=params['num_simulations'], seed=params['seed']
+        )
+    elif params['distribution'] == 'summary':
+        events = mc.iter_batch_summary(
+            params['num_simulations'], seed=params['seed'], chunk_size=chunk_size,
+            histogram_range=params['histogram_range']
+        )
+    else:
+        events = mc.iter_batch(params['num_simulations'], seed=params['seed'], chunk_size=chunk_size)
+    
+    for event, payload in events:
+        if event == 'result' and exact == 'overlay':
+            bins = payload['distribution']['histogram']['bins']
+            payload['theoretical'] = solver.solve(bin_edges=bins)
+        yield event, payload
+
+
+def batch_compute(params):
+    """Run a batch simulation (and exact solution) from canonical parameters."""
+    for event, payload in batch_events(params):
+        pass
+    return payload
+
+
+def batch_stream(params):
+    """Stream a batch in chunks of about Config.STREAM_CHUNK_CELLS rounds."""
+    return batch_events(params, chunk_size=max(1, Config.STREAM_CHUNK_CELLS // max(1, params['trials_per_sim'])))
+
+
+def compare_params(data):
+    """Validate a /compare request body into canonical parameters."""
+    params = {
+        'replications': min(data.get('replications', 1000), Config.MAX_COMPARE_REPLICATIONS),
+        'num_trials': min(data.get('num_trials', 1000), Config.MAX_BATCH_TRIALS),
+        'starting_balance': data.get('starting_balance', 1000),
+        'bet_amount': data.get('bet_amount', 10),
+        **parse_strategy(data),
+        'baseline_probabilities': data.get('baseline_probabilities', None),
+        'probabilities': data.get('probabilities', None),
+        'target_face': data.get('target_face', 1),
+        'seed': parse_seed(data)
+    }
+    
+    if params['probabilities'] is None:
+        raise ValueError('Probabilities of the tweaked dice are required')
+    
+    # With a random bet face every dice wins 1/6 of the time, so a face is needed
+    if params['target_face'] not in range(1, 7):
+        raise ValueError('Target face must be between 1 and 6')
+    
+    if params['replications'] < 2:
+        raise ValueError('Minimum 2 replications required')
+    
+    if params['num_trials'] < 1:
+        raise ValueError('Minimum 1 trial required')
+    
+    if params['starting_balance'] < 10:
+        raise ValueError('Starting balance must be at least $10')
+    
+    if params['bet_amount'] < 1:
+        raise ValueError('Bet amount must be at least $1')
+    
+    return params
+
+
+def compare_events(params, chunk_size=None):
+    """Iterate a paired fair (or baseline) vs tweaked comparison's progress and result events."""
+    baseline, variant = (
+        MonteCarloSimulation(
+            num_trials=params['num_trials'],
+            starting_balance=params['starting_balance'],
+            bet_amount=params['bet_amount'],
+            **strategy_arguments(params),
+            probabilities=probabilities,
+            target_face=params['target_face']
+        )
+        for probabilities in (params['baseline_probabilities'], params['probabilities'])
     )
+    return baseline.iter_paired_comparison(
+        variant, params['replications'], seed=params['seed'], chunk_size=chunk_size
+    )
+
+
+def compare_compute(params):
+    """Run a paired comparison from canonical parameters."""
+    for event, payload in compare_events(params):
+        pass
+    return payload
+
+
+def compare_stream(params):
+    """Stream a paired comparison in chunks of about Config.STREAM_CHUNK_CELLS rounds."""
+    return compare_events(params, chunk_size=max(1, Config.STREAM_CHUNK_CELLS // (2 * params['num_trials'])))
+
+
+# Endpoint name -> (request parser, compute function), shared with cache warm-up
+SIMULATIONS = {
+    'run': (run_params, run_compute),
+    'convergence': (convergence_params, convergence_compute),
+    'batch': (batch_params, batch_compute),
+    'compare': (compare_params, compare_compute)
+}
+
+
+# Endpoint name -> request parser for streamed and background runs, where it
+# differs from the synchronous one in SIMULATIONS
+LONG_RUNNING_PARAMS = {
+    'batch': lambda data: batch_params(data, long_running=True)
+}
+
+
+def long_running_params(endpoint, data):
+    """Validate a request body for a streamed or background run."""
+    parse = LONG_RUNNING_PARAMS.get(endpoint, SIMULATIONS[endpoint][0])
+    return parse(data)
+
+
+def simulation_response(endpoint, data):
+    """Validate, compute (or fetch from the result cache) and respond."""
+    parse, compute = SIMULATIONS[endpoint]
+    try:
+        params = parse(data)
+        return result_cache.respond(endpoint, params, compute)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+
+# Endpoint name -> event generator for the server-sent-event variants
+STREAMS = {
+    'run': run_stream,
+    'batch': batch_stream,
+    'compare': compare_stream
+}
+
+
+def stream_response(endpoint, data):
+    """
+    Validate and stream a simulation as server-sent events.
+    
+    Emits 'progress' events at chunk boundaries and a final 'result' event
+    with the same payload as the plain endpoint, or an 'error' event if the
+    simulation rejects its parameters. When the client disconnects, the
+    server closes the generator and the remaining chunks are never computed.
+    """
+    try:
+        params = long_running_params(endpoint, data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    convergence_data = mc.convergence_analysis(checkpoints=50)
+    def generate():
+        try:
+            for event, payload in result_cache.stream(endpoint, params, STREAMS[endpoint]):
+                yield f'event: {event}\ndata: {payload.decode()}\n\n'
+        except ValueError as e:
+            # Headers are already sent, so late validation errors become an event
+            yield f'event: error\ndata: {json.dumps({"error": str(e)})}\n\n'
     
-    return jsonify(convergence_data)
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+# Job type -> event generator run by the background job queue
+JOBS = {
+    'run': run_stream,
+    'batch': batch_stream,
+    'convergence': convergence_events,
+    'compare': compare_stream
+}
+
+
+def job_handler(job_type):
+    """Run a job type's events through the result cache, yielding JSON payloads."""
+    return lambda params: result_cache.stream(job_type, params, JOBS[job_type])
+
+
+def warm_result_cache():
+    """Populate the result cache with Config.RESULT_CACHE_PRESETS."""
+    for endpoint, data in Config.RESULT_CACHE_PRESETS:
+        parse, compute = SIMULATIONS[endpoint]
+        result_cache.warm(endpoint, parse(data), compute)
+
+
+@simulation_bp.route('/')
+def simulation():
+    """Render the Monte Carlo simulation page"""
+    return render_template('simulation.html')
+
+
+@simulation_bp.route('/run', methods=['POST'])
+def run_simulation():
+    """Run Monte Carlo simulation"""
+    return simulation_response('run', request.get_json())
+
+
+@simulation_bp.route('/run/stream', methods=['POST'])
+def run_simulation_stream():
+    """Run Monte Carlo simulation, streaming progress as server-sent events"""
+    return stream_response('run', request.get_json())
+
+
+@simulation_bp.route('/convergence', methods=['POST'])
+def convergence_analysis():
+    """Run convergence analysis - shows how empirical probability approaches theoretical"""
+    return simulation_response('convergence', request.get_json())
 
 
 @simulation_bp.route('/batch', methods=['POST'])
 def batch_simulation():
     """Run multiple simulations for ruin probability and distribution analysis"""
+    return simulation_response('batch', request.get_json())
+
+
+@simulation_bp.route('/batch/stream', methods=['POST'])
+def batch_simulation_stream():
+    """Run batch simulations, streaming the running ruin estimate as server-sent events"""
+    return stream_response('batch', request.get_json())
+
+
+@simulation_bp.route('/compare', methods=['POST'])
+def compare_simulation():
+    """Compare fair and tweaked dice with paired replications on common random numbers"""
+    return simulation_response('compare', request.get_json())
+
+
+@simulation_bp.route('/compare/stream', methods=['POST'])
+def compare_simulation_stream():
+    """Run a paired comparison, streaming the running confidence intervals as server-sent events"""
+    return stream_response('compare', request.get_json())
+
+
+@simulation_bp.route('/jobs', methods=['POST'])
+def submit_job():
+    """Submit a simulation to run in the background; poll its status by job id"""
     data = request.get_json()
+    job_type = data.get('type')
     
-    num_simulations = min(data.get('num_simulations', 100), 1000)
-    trials_per_sim = min(data.get('trials_per_sim', 1000), 10000)
-    starting_balance = data.get('starting_balance', 1000)
-    bet_amount = data.get('bet_amount', 10)
-    bet_strategy = data.get('bet_strategy', 'fixed')
-    game_mode = data.get('game_mode', 'fair')
-    probabilities = data.get('probabilities', None)
-    
-    mc = MonteCarloSimulation(
-        num_trials=trials_per_sim,
-        starting_balance=starting_balance,
-        bet_amount=bet_amount,
-        bet_strategy=bet_strategy,
-        probabilities=probabilities if game_mode == 'tweaked' else None
-    )
+    if job_type not in JOBS:
+        return jsonify({'error': f"Job type must be one of: {', '.join(JOBS)}"}), 400
     
-    batch_results = mc.batch_simulation(num_simulations)
+    try:
+        job_id = job_queue.submit(job_type, long_running_params(job_type, data.get('params', {})))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
     
-    return jsonify(batch_results)
+    return jsonify(job_queue.status(job_id)), 202
+
+
+@simulation_bp.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Get a job's status, progress and latest progress snapshot"""
+    status = job_queue.status(job_id)
+    if status is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(status)
+
+
+@simulation_bp.route('/jobs/<job_id>/result')
+def job_result(job_id):
+    """Get the result of a completed job"""
+    payload = job_queue.result(job_id)
+    if payload is None:
+        status = job_queue.status(job_id)
+        if status is None:
+            return jsonify({'error': 'Job not found'}), 404
+        return jsonify({'error': f"Job is {status['status']}", **status}), 409
+    return current_app.response_class(payload, mimetype='application/json')
+
+
+@simulation_bp.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancel a queued or running job"""
+    cancelled = job_queue.cancel(job_id)
+    status = job_queue.status(job_id)
+    if status is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify({'cancelled': cancelled, **status})
+
+
+@simulation_bp.route('/cache-stats')
+def cache_stats():
+    """Get result cache hit ratio, size and eviction counts"""
+    return jsonify(result_cache.stats())
@@ -0,0 +1,279 @@
+"""
+Exact ruin and final-balance solver for the fixed betting strategy
+"""
+
+import math
+import numpy as np
+from typing import Dict, Optional
+from app.services.strategies import FixedBet
+from app.config import Config
+
+
+class ExactRuinSolver:
+    """
+    Exact solution of the fixed-strategy game as a finite Markov chain.
+    
+    Balances are measured in integer units of gcd(starting balance, bet),
+    with an absorbing barrier at zero. The probability vector over balances
+    is propagated round by round with array shifts, giving the exact ruin
+    probability, time-to-ruin distribution and final balance distribution
+    that MonteCarloSimulation estimates by sampling. Balances whose mass
+    falls below Config.EXACT_TAIL_EPSILON are dropped and the total dropped
+    mass is reported as 'truncated_probability'.
+    """
+    
+    def __init__(
+        self,
+        num_trials: int,
+        starting_balance: float,
+        bet_amount: float,
+        win_probability: float,
+        payout: int = None
+    ):
+        """
+        Initialize the solver.
+        
+        Args:
+            num_trials: Number of rounds
+            starting_balance: Initial player balance (whole cents)
+            bet_amount: Fixed bet amount (whole cents)
+            win_probability: Probability that a single bet wins
+            payout: Payout multiplier (defaults to Config.PAYOUT_MULTIPLIER)
+        """
+        if starting_balance <= 0 or bet_amount <= 0:
+            raise ValueError("Starting balance and bet amount must be positive")
+        
+        self.num_trials = num_trials
+        self.starting_balance = starting_balance
+        self.bet_amount = bet_amount
+        self.win_probability = win_probability
+        self.payout = payout or Config.PAYOUT_MULTIPLIER
+        
+        start_cents = self._to_cents(starting_balance)
+        bet_cents = self._to_cents(bet_amount)
+        unit = math.gcd(start_cents, bet_cents)
+        self.unit = unit / 100
+        self.start_units = start_cents // unit
+        self.bet_units = bet_cents // unit
+        
+        # Highest reachable balance, including an all-in win from below the bet
+        gain = self.bet_units * (self.payout - 1)
+        self.num_states = max(self.start_units, self.payout * self.bet_units) + gain * num_trials + 1
+        if self.num_states > Config.EXACT_MAX_STATES:
+            raise ValueError("Parameters are too large for the exact solver")
+    
+    @classmethod
+    def from_simulation(cls, simulation) -> 'ExactRuinSolver':
+        """
+        Build a solver matching a fixed-strategy MonteCarloSimulation.
+        
+        Args:
+            simulation: MonteCarloSimulation instance
+            
+        Returns:
+            ExactRuinSolver instance
+        """
+        if type(simulation.strategy) is not FixedBet:
+            raise ValueError("Exact results are only available for the fixed strategy without stop-loss or take-profit")
+        
+        if simulation.target_face:
+            win_probability = simulation.dice.get_probability(simulation.target_face)
+        else:
+            win_probability = 1/6
+        
+        return cls(
+            num_trials=simulation.num_trials,
+            starting_balance=simulation.starting_balance,
+            bet_amount=simulation.base_bet,
+            win_probability=win_probability,
+            payout=simulation.payout
+        )
+    
+    @staticmethod
+    def _to_cents(amount: float) -> int:
+        """Convert an amount to integer cents, rejecting fractional cents."""
+        cents = round(amount * 100)
+        if abs(amount * 100 - cents) > 1e-6:
+            raise ValueError("Exact results require amounts in whole cents")
+        return int(cents)
+    
+    def _propagate(self) -> tuple:
+        """
+        Propagate the balance distribution through every round.
+        
+        Alongside the probability mass of each balance, the solver carries
+        the expected number of wins held in that balance, which yields the
+        exact mean win rate. Only the window of balances holding more than
+        Config.EXACT_TAIL_EPSILON is propagated; the dropped mass is reported.
+        
+        Returns:
+            Tuple of (final distribution, cumulative ruin probability per
+            round, expected win rate, truncated probability)
+        """
+        p = self.win_probability
+        q = 1 - p
+        bet = self.bet_units
+        gain = bet * (self.payout - 1)
+        epsilon = Config.EXACT_TAIL_EPSILON
+        
+        dist = np.zeros(self.num_states)
+        wins = np.zeros(self.num_states)
+        dist[self.start_units] = 1.0
+        next_dist = np.zeros(self.num_states)
+        next_wins = np.zeros(self.num_states)
+        
+        ruin_by_round = np.zeros(self.num_trials)
+        expected_win_rate = 0.0
+        truncated = 0.0
+        
+        # Active window [lo, hi) of live (non-ruined) balances
+        lo, hi = self.start_units, self.start_units + 1
+        
+        for t in range(1, self.num_trials + 1):
+            if lo >= hi:
+                ruin_by_round[t - 1:] = dist[0]
+                break
+            
+            start, end = max(0, lo - bet), hi + gain
+            next_dist[start:end] = 0
+            next_wins[start:end] = 0
+            next_dist[0] = dist[0]
+            next_wins[0] = wins[0]
+            
+            full = max(lo, bet)
+            if hi > full:
+                # Full bets from every balance that covers the base bet
+                d = dist[full:hi]
+                w = wins[full:hi]
+                next_dist[full + gain:hi + gain] += p * d
+                next_wins[full + gain:hi + gain] += p * (w + d)
+                next_dist[full - bet:hi - bet] += q * d
+                next_wins[full - bet:hi - bet] += q * w
+            
+            if lo < bet:
+                # All-in bets from balances below the base bet
+                partial = np.arange(lo, min(hi, bet))
+                d = dist[partial]
+                w = wins[partial]
+                next_dist[0] += q * d.sum()
+                next_wins[0] += q * w.sum()
+                next_dist[partial * self.payout] += p * d
+                next_wins[partial * self.payout] += p * (w + d)
+            
+            expected_win_rate += (next_wins[0] - wins[0]) / t
+            ruin_by_round[t - 1] = next_dist[0]
+            
+            # Shrink the window to balances with non-negligible mass
+            live = next_dist[max(1, start):end]
+            keep = np.flatnonzero(live > epsilon)
+            truncated += live[live <= epsilon].sum()
+            if len(keep):
+                lo, hi = max(1, start) + keep[0], max(1, start) + keep[-1] + 1
+                window = slice(lo, hi)
+                dropped = next_dist[window] <= epsilon
+                next_dist[window][dropped] = 0
+                next_wins[window][dropped] = 0
+            else:
+                lo, hi = 1, 1
+            
+            dist, next_dist = next_dist, dist
+            wins, next_wins = next_wins, wins
+        
+        if self.num_trials > 0 and hi > lo:
+            expected_win_rate += wins[lo:hi].sum() / self.num_trials
+        
+        final = np.zeros(max(hi, 1))
+        final[0] = dist[0]
+        final[lo:hi] = dist[lo:hi]
+        return final, ruin_by_round, expected_win_rate, truncated
+    
+    @staticmethod
+    def _quantile(values: np.ndarray, cdf: np.ndarray, q: float) -> float:
+        """Smallest value whose cumulative probability reaches q."""
+        index = min(int(np.searchsorted(cdf, q - 1e-12)), len(values) - 1)
+        return float(values[index])
+    
+    def histogram(self, bin_edges, profits: np.ndarray, probabilities: np.ndarray) -> list:
+        """
+        Exact probability mass of each profit histogram bin.
+        
+        Bins follow np.histogram: half-open except the last, which is closed.
+        
+        Args:
+            bin_edges: Histogram bin edges
+            profits: Support of the profit distribution
+            probabilities: Probability of each profit
+            
+        Returns:
+            List of bin probabilities
+        """
+        edges = np.asarray(bin_edges, dtype=float)
+        index = np.searchsorted(edges, profits, side='right') - 1
+        index[profits == edges[-1]] = len(edges) - 2
+        inside = (index >= 0) & (index < len(edges) - 1)
+        mass = np.bincount(index[inside], weights=probabilities[inside], minlength=len(edges) - 1)
+        return [round(float(m), 6) for m in mass]
+    
+    def solve(self, bin_edges: Optional[list] = None) -> Dict:
+        """
+        Compute the exact outcome distribution.
+        
+        Args:
+            bin_edges: Histogram bin edges to report (None = 20 bins over the support)
+            
+        Returns:
+            Dictionary with exact statistics, time-to-ruin and final
+            balance distributions
+        """
+        dist, ruin_by_round, expected_win_rate, truncated = self._propagate()
+        
+        support = np.flatnonzero(dist > 0)
+        probabilities = dist[support]
+        final_balances = support * self.unit
+        profits = final_balances - self.starting_balance
+        cdf = np.cumsum(probabilities)
+        
+        mean_balance = float(probabilities @ final_balances)
+        std_balance = float(np.sqrt(max(0.0, probabilities @ (final_balances - mean_balance) ** 2)))
+        ruin_probability = float(dist[0])
+        
+        if bin_edges is None:
+            _, bin_edges = np.histogram(profits, bins=20)
+        
+        # Time to ruin: cumulative ruin probability, downsampled to ~1000 rounds
+        step = max(1, self.num_trials // 1000)
+        rounds = np.arange(step, self.num_trials + 1, step)
+        if self.num_trials and (len(rounds) == 0 or rounds[-1] != self.num_trials):
+            rounds = np.append(rounds, self.num_trials)
+        ruin_pmf = np.diff(np.concatenate(([0.0], ruin_by_round)))
+        mean_time_to_ruin = (
+            float(ruin_pmf @ np.arange(1, self.num_trials + 1)) / ruin_probability
+            if ruin_probability > 0 else None
+        )
+        
+        return {
+            'statistics': {
+                'mean_final_balance': round(mean_balance, 2),
+                'std_final_balance': round(std_balance, 2),
+                'mean_profit': round(mean_balance - self.starting_balance, 2) + 0.0,
+                'std_profit': round(std_balance, 2),
+                'median_profit': round(self._quantile(profits, cdf, 0.5), 2),
+                'mean_win_rate': round(float(expected_win_rate) * 100, 2),
+                'ruin_probability': round(ruin_probability * 100, 4),
+                'value_at_risk_5': round(self._quantile(profits, cdf, 0.05), 2),
+                'truncated_probability': float(truncated)
+            },
+            'time_to_ruin': {
+                'rounds': rounds.tolist(),
+                'cumulative_probability': [round(float(p), 6) for p in ruin_by_round[rounds - 1]],
+                'mean_rounds_given_ruin': round(mean_time_to_ruin, 2) if mean_time_to_ruin else None
+            },
+            'distribution': {
+                'profits': np.round(profits, 2).tolist(),
+                'probabilities': probabilities.tolist(),
+                'histogram': {
+                    'probabilities': self.histogram(bin_edges, profits, probabilities),
+                    'bins': [round(float(b), 2) for b in bin_edges]
+                }
+            }
+        }
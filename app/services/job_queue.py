@@ -0,0 +1,319 @@
+"""
+Background simulation jobs backed by a persistent SQLite store
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, Optional
+from app.config import Config
+
+
+class QueueFullError(Exception):
+    """Raised when the number of unfinished jobs reaches Config.JOB_MAX_PENDING."""
+
+
+class JobQueue:
+    """
+    Asynchronous simulation jobs executed by a bounded local thread pool.
+    
+    Every job is a row in a WAL-mode SQLite database shared by all worker
+    processes: its spec, status, progress, latest progress snapshot and
+    final result. A job runs through the same event generators as the
+    streaming endpoints, so its progress is recorded at chunk boundaries
+    and a cancellation (a status change in the database) is honoured at
+    the next one. A heartbeat thread refreshes each running job every
+    third of Config.JOB_STALE_SECONDS, however long its chunks take; a job
+    whose worker died is re-queued when its heartbeat goes stale and
+    picked up by whichever process notices first. Each run claims the job
+    with a fresh token, and its writes only land while it still holds it,
+    so a run whose job was re-queued from under it stops instead of
+    racing the new one.
+    
+    Statuses: queued -> running -> completed | failed | cancelled
+    """
+    
+    def __init__(self):
+        """Initialize an unbound queue; call init_app before use."""
+        self.path = None
+        self.handlers = {}
+        self._executor = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Jobs running on this process's threads, never re-queued by its recover()
+        self._running = set()
+        os.register_at_fork(after_in_child=self._after_fork)
+    
+    def init_app(self, app, handlers: Dict[str, Callable[[Dict], Iterator[tuple]]], recover: bool = True):
+        """
+        Bind the queue to an application, create its schema and resume jobs.
+        
+        Args:
+            app: Flask application
+            handlers: Job type -> function yielding (event, payload) pairs from params
+            recover: Resume jobs now (False in a pre-fork master, whose workers call recover)
+        """
+        self.path = Config.JOB_STORE_PATH or os.path.join(app.instance_path, 'jobs.sqlite3')
+        self.handlers = handlers
+        app.extensions['job_queue'] = self
+        
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS jobs ('
+                'id TEXT PRIMARY KEY, type TEXT, params TEXT, status TEXT, '
+                'progress REAL, snapshot TEXT, result BLOB, error TEXT, '
+                'created REAL, started REAL, finished REAL, heartbeat REAL, worker TEXT)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status)')
+            # Stores created before claim tokens existed
+            columns = {column[1] for column in conn.execute('PRAGMA table_info(jobs)')}
+            if 'worker' not in columns:
+                try:
+                    conn.execute('ALTER TABLE jobs ADD COLUMN worker TEXT')
+                except sqlite3.OperationalError:
+                    # Another process added it first
+                    pass
+        
+        if recover:
+            self.recover()
+    
+    def _after_fork(self):
+        """Drop the parent's connections and job threads in a forked child."""
+        self._executor = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._running = set()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread connection to the job store."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'path', None) != self.path:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.path = self.path
+        return conn
+    
+    def _pool(self) -> ThreadPoolExecutor:
+        """Bounded pool of job threads, created on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(1, Config.JOB_WORKERS), thread_name_prefix='simulation-job'
+                )
+            return self._executor
+    
+    def submit(self, job_type: str, params: Dict) -> str:
+        """
+        Persist a job and schedule it on the local pool.
+        
+        Args:
+            job_type: Key of a registered handler
+            params: Canonicalized request parameters
+            
+        Returns:
+            The new job id
+        """
+        if job_type not in self.handlers:
+            raise ValueError(f"Job type must be one of: {', '.join(sorted(self.handlers))}")
+        
+        self.prune()
+        job_id = uuid.uuid4().hex
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            pending = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')"
+            ).fetchone()[0]
+            if pending >= Config.JOB_MAX_PENDING:
+                raise QueueFullError('Too many simulation jobs are pending, try again later')
+            conn.execute(
+                "INSERT INTO jobs (id, type, params, status, progress, created) "
+                "VALUES (?, ?, ?, 'queued', 0, ?)",
+                (job_id, job_type, json.dumps(params, sort_keys=True), time.time())
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        
+        self._pool().submit(self._execute, job_id)
+        return job_id
+    
+    def _claim(self, job_id: str, token: str) -> Optional[tuple]:
+        """Atomically move a queued job to running under token; None if another worker has it."""
+        conn = self._connect()
+        now = time.time()
+        claimed = conn.execute(
+            "UPDATE jobs SET status = 'running', started = ?, heartbeat = ?, worker = ? "
+            "WHERE id = ? AND status = 'queued'",
+            (now, now, token, job_id)
+        ).rowcount
+        if not claimed:
+            return None
+        return conn.execute('SELECT type, params FROM jobs WHERE id = ?', (job_id,)).fetchone()
+    
+    def _heartbeat(self, job_id: str, token: str, stopped: threading.Event):
+        """Refresh a running job's heartbeat until stopped is set or the claim is lost."""
+        conn = self._connect()
+        while not stopped.wait(Config.JOB_STALE_SECONDS / 3):
+            beating = conn.execute(
+                "UPDATE jobs SET heartbeat = ? WHERE id = ? AND status = 'running' AND worker = ?",
+                (time.time(), job_id, token)
+            ).rowcount
+            if not beating:
+                return
+    
+    def _execute(self, job_id: str):
+        """Run a job to completion, recording progress and honouring cancellation."""
+        token = uuid.uuid4().hex
+        row = self._claim(job_id, token)
+        if row is None:
+            return
+        
+        with self._lock:
+            self._running.add(job_id)
+        stopped = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(job_id, token, stopped),
+            name=f'simulation-job-heartbeat-{job_id[:8]}', daemon=True
+        )
+        heartbeat.start()
+        
+        conn = self._connect()
+        job_type, params = row[0], json.loads(row[1])
+        events = self.handlers[job_type](params)
+        try:
+            for event, payload in events:
+                if event == 'result':
+                    conn.execute(
+                        "UPDATE jobs SET status = 'completed', progress = 100, result = ?, "
+                        "finished = ?, heartbeat = ? WHERE id = ? AND status = 'running' AND worker = ?",
+                        (zlib.compress(payload, 6), time.time(), time.time(), job_id, token)
+                    )
+                    return
+                
+                # A progress event: record it unless the job was cancelled or re-queued meanwhile
+                updated = conn.execute(
+                    "UPDATE jobs SET progress = ?, snapshot = ?, heartbeat = ? "
+                    "WHERE id = ? AND status = 'running' AND worker = ?",
+                    (json.loads(payload).get('progress', 0), payload.decode(), time.time(), job_id, token)
+                ).rowcount
+                if not updated:
+                    return
+        except Exception as e:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, finished = ? "
+                "WHERE id = ? AND status = 'running' AND worker = ?",
+                (str(e) if isinstance(e, ValueError) else 'Simulation failed', time.time(), job_id, token)
+            )
+        finally:
+            events.close()
+            stopped.set()
+            heartbeat.join()
+            with self._lock:
+                self._running.discard(job_id)
+    
+    def recover(self):
+        """Re-queue jobs whose worker stopped heartbeating and schedule queued jobs here."""
+        conn = self._connect()
+        stale = time.time() - Config.JOB_STALE_SECONDS
+        # A job on one of this process's threads is alive whatever its heartbeat says
+        with self._lock:
+            running = list(self._running)
+        conn.execute(
+            "UPDATE jobs SET status = 'queued', started = NULL, worker = NULL "
+            f"WHERE status = 'running' AND heartbeat < ? AND id NOT IN ({', '.join('?' * len(running))})",
+            (stale, *running)
+        )
+        queued = conn.execute(
+            "SELECT id FROM jobs WHERE status = 'queued' ORDER BY created"
+        ).fetchall()
+        for (job_id,) in queued:
+            self._pool().submit(self._execute, job_id)
+    
+    def status(self, job_id: str) -> Optional[Dict]:
+        """
+        Status, progress and latest snapshot of a job.
+        
+        Args:
+            job_id: Job id returned by submit
+            
+        Returns:
+            Status dictionary, or None for an unknown job
+        """
+        conn = self._connect()
+        row = conn.execute(
+            'SELECT type, status, progress, snapshot, error, created, started, finished, heartbeat '
+            'FROM jobs WHERE id = ?',
+            (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        job_type, status, progress, snapshot, error, created, started, finished, heartbeat = row
+        if status == 'running' and heartbeat < time.time() - Config.JOB_STALE_SECONDS:
+            self.recover()
+            status, started = conn.execute(
+                'SELECT status, started FROM jobs WHERE id = ?', (job_id,)
+            ).fetchone()
+        
+        return {
+            'job_id': job_id,
+            'type': job_type,
+            'status': status,
+            'progress': round(progress or 0, 2),
+            'snapshot': json.loads(snapshot) if snapshot else None,
+            'error': error,
+            'created': created,
+            'started': started,
+            'finished': finished
+        }
+    
+    def result(self, job_id: str) -> Optional[bytes]:
+        """
+        Result JSON of a completed job.
+        
+        Args:
+            job_id: Job id returned by submit
+            
+        Returns:
+            JSON bytes, or None if the job has not completed
+        """
+        row = self._connect().execute(
+            "SELECT result FROM jobs WHERE id = ? AND status = 'completed'", (job_id,)
+        ).fetchone()
+        return zlib.decompress(row[0]) if row else None
+    
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job; a running job stops at its next chunk.
+        
+        Args:
+            job_id: Job id returned by submit
+            
+        Returns:
+            True if the job was still unfinished
+        """
+        return bool(self._connect().execute(
+            "UPDATE jobs SET status = 'cancelled', finished = ? "
+            "WHERE id = ? AND status IN ('queued', 'running')",
+            (time.time(), job_id)
+        ).rowcount)
+    
+    def prune(self):
+        """Delete finished jobs older than Config.JOB_TTL."""
+        self._connect().execute(
+            "DELETE FROM jobs WHERE status IN ('completed', 'failed', 'cancelled') AND finished < ?",
+            (time.time() - Config.JOB_TTL,)
+        )
+
+
+job_queue = JobQueue()
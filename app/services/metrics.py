@@ -0,0 +1,264 @@
+"""
+Prometheus-style metrics aggregated across worker processes
+"""
+
+import atexit
+import bisect
+import math
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Sequence
+from app.config import Config
+
+
+# Latency buckets in seconds, from a cached page to a long simulation
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Simulation throughput buckets in trials per second
+THROUGHPUT_BUCKETS = (1e4, 1e5, 3e5, 1e6, 3e6, 1e7, 3e7, 1e8, 3e8, 1e9)
+
+# Metric name -> (type, help text)
+METRICS = {
+    'rollquest_http_request_duration_seconds': (
+        'histogram', 'Request latency by endpoint, method and status'
+    ),
+    'rollquest_session_store_duration_seconds': (
+        'histogram', 'Game session load and save latency by operation'
+    ),
+    'rollquest_startup_duration_seconds': (
+        'histogram', 'Application start-up time by phase (create_app and warm-up steps)'
+    ),
+    'rollquest_simulations_total': (
+        'counter', 'Completed simulations by kind and betting strategy'
+    ),
+    'rollquest_simulation_trials_total': (
+        'counter', 'Trials (rounds) simulated by kind and betting strategy'
+    ),
+    'rollquest_simulation_bankruptcies_total': (
+        'counter', 'Simulated players ruined by kind and betting strategy'
+    ),
+    'rollquest_simulation_duration_seconds': (
+        'histogram', 'Wall time of a simulation by kind'
+    ),
+    'rollquest_simulation_trials_per_second': (
+        'histogram', 'Throughput of a simulation by kind'
+    )
+}
+
+
+def _labels(labels: Dict) -> str:
+    """Render labels in exposition format, sorted so equal label sets share a row."""
+    return ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in sorted(labels.items())
+    )
+
+
+def _format_le(bound: float) -> str:
+    """Bucket upper bound as Prometheus writes it."""
+    return '+Inf' if math.isinf(bound) else repr(float(bound))
+
+
+class Metrics:
+    """
+    Counters and histograms shared by every worker process.
+    
+    Observations are buffered per process as deltas and added to a WAL-mode
+    SQLite table at most every Config.METRICS_FLUSH_SECONDS (and at exit),
+    so a scrape served by any gunicorn worker reports the sum over all of
+    them. Histogram buckets are cumulative, which keeps them additive too.
+    A process forked from a parent with unflushed deltas starts from an
+    empty buffer so nothing is counted twice.
+    """
+    
+    def __init__(self):
+        """Initialize an unbound registry; call init_app before use."""
+        self.path = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._last_flush = time.monotonic()
+        os.register_at_fork(after_in_child=self._after_fork)
+    
+    def init_app(self, app):
+        """
+        Bind the registry to an application, create its schema and time requests.
+        
+        Args:
+            app: Flask application
+        """
+        if not Config.METRICS_ENABLED:
+            return
+        self.path = Config.METRICS_STORE_PATH or os.path.join(app.instance_path, 'metrics.sqlite3')
+        app.extensions['metrics'] = self
+        
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS samples ('
+                'name TEXT, labels TEXT, le TEXT, value REAL, '
+                'PRIMARY KEY (name, labels, le)) WITHOUT ROWID'
+            )
+        
+        from flask import g, request
+        
+        @app.before_request
+        def start_timer():
+            g.metrics_start = time.perf_counter()
+        
+        @app.after_request
+        def record_request(response):
+            start = g.pop('metrics_start', None)
+            if start is not None:
+                self.observe(
+                    'rollquest_http_request_duration_seconds', time.perf_counter() - start,
+                    endpoint=request.url_rule.rule if request.url_rule else 'unmatched',
+                    method=request.method,
+                    status=response.status_code
+                )
+            if time.monotonic() - self._last_flush >= Config.METRICS_FLUSH_SECONDS:
+                self.flush()
+            return response
+        
+        atexit.register(self.flush)
+    
+    def _after_fork(self):
+        """Start a forked child with its own connection and an empty buffer."""
+        # The parent's unflushed deltas are not ours to report
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread connection to the metrics database."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'path', None) != self.path:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.path = self.path
+        return conn
+    
+    def inc(self, name: str, value: float = 1, **labels):
+        """
+        Increment a counter.
+        
+        Args:
+            name: Metric name from METRICS
+            value: Amount to add
+            **labels: Label values
+        """
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+    
+    def observe(self, name: str, value: float, buckets: Sequence[float] = LATENCY_BUCKETS, **labels):
+        """
+        Record an observation in a histogram.
+        
+        Args:
+            name: Metric name from METRICS
+            value: Observed value
+            buckets: Ascending bucket upper bounds (the same for every observation of a metric)
+            **labels: Label values
+        """
+        key = (name, _labels(labels), tuple(buckets))
+        index = bisect.bisect_left(key[2], value)
+        with self._lock:
+            series = self._histograms.get(key)
+            if series is None:
+                # Per-bucket counts (the last one is +Inf), sum and count
+                series = self._histograms[key] = [[0] * (len(key[2]) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+    
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """
+        Time a block into a latency histogram.
+        
+        Args:
+            name: Metric name from METRICS
+            **labels: Label values
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+    
+    def flush(self):
+        """Add this process's buffered deltas to the shared table."""
+        with self._lock:
+            counters, self._counters = self._counters, {}
+            histograms, self._histograms = self._histograms, {}
+            self._last_flush = time.monotonic()
+        if self.path is None or not (counters or histograms):
+            return
+        
+        rows = [(name, labels, '', value) for (name, labels), value in counters.items()]
+        for (name, labels, buckets), (counts, total, count) in histograms.items():
+            # Exposed buckets are cumulative, which keeps them additive across processes
+            cumulative = 0
+            for bound, bucket_count in zip((*buckets, math.inf), counts):
+                cumulative += bucket_count
+                rows.append((name + '_bucket', labels, _format_le(bound), cumulative))
+            rows.append((name + '_sum', labels, '', total))
+            rows.append((name + '_count', labels, '', count))
+        
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(
+                'INSERT INTO samples VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (name, labels, le) DO UPDATE SET value = value + excluded.value',
+                rows
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+    
+    def render(self) -> Optional[str]:
+        """
+        Render every metric in the Prometheus text exposition format.
+        
+        Returns:
+            Exposition text, or None when metrics are disabled
+        """
+        if self.path is None:
+            return None
+        self.flush()
+        
+        samples = {}
+        for name, labels, le, value in self._connect().execute('SELECT name, labels, le, value FROM samples'):
+            family = name
+            for suffix in ('_bucket', '_sum', '_count'):
+                if name.endswith(suffix) and name[:-len(suffix)] in METRICS:
+                    family = name[:-len(suffix)]
+            samples.setdefault(family, []).append((name, labels, le, value))
+        
+        lines = []
+        for family in sorted(samples):
+            kind, description = METRICS.get(family, ('untyped', ''))
+            lines.append(f'# HELP {family} {description}')
+            lines.append(f'# TYPE {family} {kind}')
+            # Series by label set, buckets in ascending order, then _sum and _count
+            for name, labels, le, value in sorted(
+                samples[family],
+                key=lambda s: (s[1], s[0] != family + '_bucket', float(s[2]) if s[2] else 0, s[0])
+            ):
+                label_text = ','.join(filter(None, (labels, f'le="{le}"' if le else '')))
+                number = int(value) if float(value).is_integer() else value
+                lines.append(f'{name}{{{label_text}}} {number}' if label_text else f'{name} {number}')
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
@@ -2,12 +2,147 @@
 Monte Carlo Simulation Engine for RollQuest
 """
 
+import atexit
+import copy
+import multiprocessing
+import os
+import secrets
+import threading
+import time
 import numpy as np
-from typing import List, Dict, Optional
-from app.models.dice import Dice
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Iterator, List, Dict, Optional, Union
+from app.models.dice import get_dice
+from app.services.sketch import QuantileSketch, FixedHistogram
+from app.services.metrics import metrics, THROUGHPUT_BUCKETS
+from app.services.strategies import FixedBet, create_strategy
 from app.config import Config
 
 
+SeedLike = Union[None, int, np.random.SeedSequence, np.random.Generator]
+
+
+def resolve_seed(seed: SeedLike) -> tuple:
+    """
+    Resolve a seed argument into an echoable seed and a stream source.
+    
+    A missing seed is replaced by fresh 53-bit entropy (exact in JSON/JS),
+    so every run can be reproduced from its response.
+    
+    Args:
+        seed: Integer seed, SeedSequence, Generator, or None
+        
+    Returns:
+        Tuple of (echoed seed or None for a Generator, SeedSequence or Generator)
+    """
+    if isinstance(seed, np.random.Generator):
+        return None, seed
+    if isinstance(seed, np.random.SeedSequence):
+        return seed.entropy, seed
+    if seed is None:
+        seed = secrets.randbits(53)
+    return seed, np.random.SeedSequence(seed)
+
+
+def spawn_streams(source: Union[np.random.SeedSequence, np.random.Generator], n: int) -> List[np.random.Generator]:
+    """
+    Spawn n independent child Generators from a stream source.
+    
+    Args:
+        source: SeedSequence or Generator from resolve_seed
+        n: Number of child streams
+        
+    Returns:
+        List of Generators
+    """
+    if isinstance(source, np.random.Generator):
+        return source.spawn(n)
+    return [np.random.default_rng(child) for child in source.spawn(n)]
+
+
+_executor = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def get_executor(workers: int) -> ProcessPoolExecutor:
+    """
+    Get the persistent process pool for parallel batch simulations.
+    
+    The pool is created lazily in each server process (after any fork) and
+    rebuilt only when the requested worker count changes.
+    
+    Args:
+        workers: Number of worker processes
+        
+    Returns:
+        Shared ProcessPoolExecutor
+    """
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            _executor_workers = workers
+        return _executor
+
+
+def shutdown_executor():
+    """Shut down the persistent process pool, if any."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def _forget_executor():
+    """Drop the parent's pool in a forked child; the child builds its own."""
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+atexit.register(shutdown_executor)
+os.register_at_fork(after_in_child=_forget_executor)
+
+
+def _run_batch_shard(params: Dict, streams: List[np.random.Generator], shm_name: str,
+                     num_simulations: int, offset: int, dtype: str):
+    """
+    Worker entry point: run one shard of a batch into shared memory.
+    
+    The block holds final balances (in the balance dtype) followed by
+    float64 win rates for the whole batch; the shard writes its rows at
+    offset.
+    """
+    mc = MonteCarloSimulation(**params)
+    final_balances, win_rates = mc._batch_engine(streams)
+    
+    block = shared_memory.SharedMemory(name=shm_name)
+    try:
+        balances_out, rates_out = _shared_batch_arrays(block, num_simulations, np.dtype(dtype))
+        balances_out[offset:offset + len(streams)] = final_balances
+        rates_out[offset:offset + len(streams)] = win_rates
+        del balances_out, rates_out
+    finally:
+        block.close()
+
+
+def _shared_batch_arrays(block: shared_memory.SharedMemory, num_simulations: int, dtype) -> tuple:
+    """View a shared-memory block as (final_balances, win_rates) arrays."""
+    balances = np.ndarray((num_simulations,), dtype=dtype, buffer=block.buf)
+    rates = np.ndarray((num_simulations,), dtype=np.float64, buffer=block.buf,
+                       offset=num_simulations * dtype.itemsize)
+    return balances, rates
+
+
 class MonteCarloSimulation:
     """
     Monte Carlo simulation engine for dice game analysis.
@@ -16,6 +151,15 @@ class MonteCarloSimulation:
     statistical analysis of outcomes.
     """
     
+    # Approximate bytes held per (simulation, trial) cell by the batch engine
+    _BATCH_BYTES_PER_CELL = 32
+    
+    # Rounds a single simulation's vectorized stretch looks ahead (see _play_path)
+    _PATH_WINDOW = 4096
+    
+    # Batch statistics that iter_until_precision can target
+    PRECISION_METRICS = ('mean_profit', 'win_rate', 'ruin_probability')
+    
     def __init__(
         self,
         num_trials: int = 10000,
@@ -23,7 +167,11 @@ class MonteCarloSimulation:
         bet_amount: float = 10,
         bet_strategy: str = 'fixed',
         probabilities: Optional[List[float]] = None,
-        target_face: Optional[int] = None
+        target_face: Optional[int] = None,
+        seed: SeedLike = None,
+        strategy_options: Optional[Dict] = None,
+        stop_loss: Optional[float] = None,
+        take_profit: Optional[float] = None
     ):
         """
         Initialize Monte Carlo simulation.
@@ -32,131 +180,663 @@ class MonteCarloSimulation:
             num_trials: Number of rounds to simulate
             starting_balance: Initial player balance
             bet_amount: Base bet amount
-            bet_strategy: 'fixed', 'martingale', 'kelly', or 'anti_martingale'
+            bet_strategy: Name of a strategy in app.services.strategies.STRATEGIES
             probabilities: Custom dice probabilities (None = fair)
             target_face: Face to always bet on (None = random)
+            seed: Default seed or Generator for every entry point (None = fresh)
+            strategy_options: Strategy-specific options (e.g. {'fraction': 0.25})
+            stop_loss: Stop once this much has been lost (None = no limit)
+            take_profit: Stop once this much has been won (None = no limit)
         """
         self.num_trials = num_trials
         self.starting_balance = starting_balance
         self.base_bet = bet_amount
         self.bet_strategy = bet_strategy
-        self.dice = Dice(probabilities)
+        self.dice = get_dice(probabilities)
         self.target_face = target_face
         self.payout = Config.PAYOUT_MULTIPLIER
+        self.seed = seed
+        self.strategy_options = strategy_options or {}
+        self.stop_loss = stop_loss
+        self.take_profit = take_profit
+        self.strategy = create_strategy(
+            bet_strategy, bet_amount, self.payout, self._win_probability(), starting_balance,
+            stop_loss, take_profit, **self.strategy_options
+        )
+    
+    def run(self, seed: SeedLike = None) -> Dict:
+        """
+        Run the Monte Carlo simulation.
+        
+        The balance path is built in vectorized stretches where the
+        strategy allows it (see _play_path).
+        
+        Args:
+            seed: Seed or Generator for this run (None = the simulation's seed)
+            
+        Returns:
+            Dictionary with simulation results and statistics
+        """
+        for event, payload in self.iter_run(seed):
+            pass
+        return payload
+    
+    def iter_run(self, seed: SeedLike = None, chunk_size: Optional[int] = None) -> Iterator[tuple]:
+        """
+        Run the simulation in chunks of rounds, reporting progress in between.
+        
+        All rolls are drawn up front exactly as in run(), so the final result
+        is identical for the same seed however the rounds are chunked.
+        Closing the generator abandons the remaining rounds.
+        
+        Args:
+            seed: Seed or Generator for this run (None = the simulation's seed)
+            chunk_size: Rounds per chunk (None = a single chunk)
+            
+        Yields:
+            ('progress', snapshot) after every chunk but the last, then
+            ('result', results) with the same dictionary run() returns
+        """
+        started = time.perf_counter()
+        seed, source = resolve_seed(self.seed if seed is None else seed)
+        rolls, won_rounds = self._draw_wins(self.num_trials, np.random.default_rng(source))
+        chunk_size = max(1, chunk_size or self.num_trials)
+        dtype = self._batch_dtype()
+        balance = dtype(self.starting_balance).item()
+        state = self.strategy.initial_state(1, dtype)
+        
+        path = [[balance]]
+        wins = 0
+        max_balance = min_balance = balance
+        step = max(1, (self.num_trials + 1) // 1000)
+        pos = 0
+        
+        while True:
+            end = min(pos + chunk_size, self.num_trials)
+            chunk, state = self._play_path(won_rounds[pos:end], balance, state)
+            played = len(chunk)
+            path.append(chunk)
+            
+            if played < end - pos or end >= self.num_trials:
+                break
+            
+            if played:
+                balance, high, low = chunk[-1].item(), chunk.max().item(), chunk.min().item()
+                wins += int(np.count_nonzero(won_rounds[pos:end]))
+                max_balance = max(max_balance, high)
+                min_balance = min(min_balance, low)
+            
+            yield 'progress', self._run_progress(
+                end, wins, balance, max_balance, min_balance, path, pos, step
+            )
+            pos = end
+        
+        balances = np.concatenate([np.asarray(segment, dtype=dtype) for segment in path])
+        
+        self._record_metrics('run', 1, len(balances) - 1, int(balances[-1] <= 0), started)
+        yield 'result', self._path_result(rolls, won_rounds, balances, seed)
+    
+    def _play_path(self, won: np.ndarray, balance: float, state: Dict[str, np.ndarray]) -> tuple:
+        """
+        Play one simulation through a block of rounds.
+        
+        Stretches the strategy resolves in one vectorized pass (see
+        BettingStrategy.path) are taken whole; the rounds in between (a
+        stake capped at the balance, a stop, or a strategy without a
+        vectorized form) go through bet() and update() one at a time. The
+        look-ahead starts at _PATH_WINDOW rounds and doubles while whole
+        windows play through, so a path interrupted often is not
+        recomputed to the end each time.
+        
+        Args:
+            won: Whether the bet of each round wins
+            balance: Balance before the first round
+            state: Strategy state of this simulation (arrays of length 1)
+            
+        Returns:
+            Tuple of (balances after each played round, state); fewer
+            balances than rounds means the simulation has stopped
+        """
+        strategy = self.strategy
+        current = np.array([balance], dtype=self._batch_dtype())
+        segments = [current[:0]]
+        pos, n = 0, len(won)
+        window = self._PATH_WINDOW
+        
+        while pos < n:
+            fast = strategy.path(state, won[pos:pos + window], current)
+            if fast is not None and len(fast[0]):
+                balances, state = fast
+                segments.append(balances)
+                current = balances[-1:]
+                pos += len(balances)
+                window = window * 2 if len(balances) == window else self._PATH_WINDOW
+                continue
+            
+            bet = strategy.bet(state, current)
+            if not (current[0] > 0 and bet[0] > 0):
+                break
+            current = current + (bet * (self.payout - 1) if won[pos] else -bet)
+            strategy.update(state, won[pos:pos + 1], current)
+            segments.append(current)
+            pos += 1
+        
+        return np.concatenate(segments), state
+    
+    def _run_progress(
+        self,
+        rounds: int,
+        wins: int,
+        balance: float,
+        max_balance: float,
+        min_balance: float,
+        path: List,
+        start: int,
+        step: int
+    ) -> Dict:
+        """
+        Snapshot of a run in progress, with the trajectory points of the last chunk.
+        
+        Args:
+            rounds: Rounds played so far
+            wins: Winning rounds so far
+            balance: Current balance
+            max_balance: Highest balance so far
+            min_balance: Lowest balance so far
+            path: Balance segments; the last one holds the latest chunk
+            start: Round before the first balance of the latest chunk
+            step: Spacing in rounds between trajectory points
+            
+        Returns:
+            Dictionary with running summary and partial trajectory
+        """
+        first = -(start + 1) % step
+        points = [float(b) for b in path[-1][first::step]]
+        trajectory_start = start + 1 + first
+        if start == 0:
+            # The first snapshot also carries the starting balance
+            points.insert(0, float(path[0][0]))
+            trajectory_start = 0
+        
+        return {
+            'rounds_played': rounds,
+            'progress': round(rounds / self.num_trials * 100, 2),
+            'summary': self._progress_summary(rounds, wins, balance, max_balance, min_balance),
+            'trajectory': {
+                'start': trajectory_start,
+                'step': step,
+                'balances': [round(b, 2) for b in points]
+            }
+        }
     
-    def _get_bet_amount(self, current_balance: float, last_won: bool, current_bet: float) -> float:
+    def _progress_summary(
+        self,
+        rounds: int,
+        wins: int,
+        balance: float,
+        max_balance: float,
+        min_balance: float
+    ) -> Dict:
+        """Running summary shared by the progress snapshots of both run modes."""
+        profit = balance - self.starting_balance
+        return {
+            'wins': wins,
+            'losses': rounds - wins,
+            'win_rate': round(wins / rounds * 100, 2) if rounds else 0,
+            'balance': round(balance, 2),
+            'profit': round(profit, 2),
+            'max_balance': round(max_balance, 2),
+            'min_balance': round(min_balance, 2)
+        }
+    
+    def _balance_dtype(self):
+        """Integer balances stay integral so responses match the scalar loop."""
+        is_integral = all(
+            isinstance(v, (int, np.integer)) and not isinstance(v, bool)
+            for v in (self.starting_balance, self.base_bet)
+        )
+        return np.int64 if is_integral else np.float64
+    
+    def _draw_wins(self, n: int, rng: np.random.Generator) -> tuple:
         """
-        Calculate bet amount based on strategy.
+        Draw rolls and bet faces for a block of rounds.
         
         Args:
-            current_balance: Current player balance
-            last_won: Whether the last bet won
-            current_bet: Current bet amount
+            n: Number of rounds
+            rng: Generator to draw from
             
         Returns:
-            New bet amount
-        """
-        if self.bet_strategy == 'fixed':
-            return min(self.base_bet, current_balance)
-        
-        elif self.bet_strategy == 'martingale':
-            # Double bet after loss, reset after win
-            if last_won:
-                new_bet = self.base_bet
-            else:
-                new_bet = current_bet * 2
-            return min(new_bet, current_balance)
-        
-        elif self.bet_strategy == 'anti_martingale':
-            # Double bet after win, reset after loss
-            if last_won:
-                new_bet = current_bet * 2
-            else:
-                new_bet = self.base_bet
-            return min(new_bet, current_balance)
-        
-        elif self.bet_strategy == 'kelly':
-            # Kelly Criterion: f = (bp - q) / b
-            # b = payout - 1, p = win prob, q = loss prob
-            win_prob = 1/6 if self.dice.mode == 'fair' else self.dice.probabilities[0]
-            b = self.payout - 1
-            p = win_prob
-            q = 1 - p
-            kelly_fraction = max(0, (b * p - q) / b)
-            return min(current_balance * kelly_fraction, current_balance)
-        
-        return min(self.base_bet, current_balance)
-    
-    def _choose_bet_face(self) -> int:
-        """Choose which face to bet on."""
+            Tuple of (rolls, won) arrays of length n
+        """
+        rolls = self.dice.roll_multiple(n, as_array=True, rng=rng)
         if self.target_face is not None:
-            return self.target_face
-        return np.random.randint(1, 7)
+            won = rolls == self.target_face
+        else:
+            won = rolls == rng.integers(1, 7, size=n, dtype=np.uint8)
+        return rolls, won
     
-    def run(self) -> Dict:
+    def _path_result(self, rolls: np.ndarray, won: np.ndarray, balances, seed) -> Dict:
         """
-        Run the Monte Carlo simulation.
+        Build the run response from a finished balance path.
         
+        Args:
+            rolls: Drawn faces for every round
+            won: Whether the bet of each round wins
+            balances: Balance trajectory including the start
+            seed: Seed echoed in the response parameters
+            
         Returns:
             Dictionary with simulation results and statistics
         """
-        balance = self.starting_balance
-        current_bet = self.base_bet
-        last_won = False
+        total_rounds = len(balances) - 1
+        wins = int(np.count_nonzero(won[:total_rounds]))
+        counts = np.bincount(rolls[:total_rounds], minlength=7)
+        face_counts = {i: int(counts[i]) for i in range(1, 7)}
         
-        # Track results
-        balances = [balance]
-        wins = 0
-        losses = 0
-        results = []
-        face_counts = {i: 0 for i in range(1, 7)}
-        max_balance = balance
-        min_balance = balance
-        bankruptcies = 0
+        balance, max_balance, min_balance = (
+            balances[-1].item(), balances.max().item(), balances.min().item()
+        )
+        
+        return self._build_run_result(
+            balance, wins, total_rounds - wins, face_counts,
+            max_balance, min_balance, balances, seed
+        )
+    
+    def _batch_chunk_rows(self) -> int:
+        """Number of simulations per chunk that fits the batch memory budget."""
+        budget = int(Config.BATCH_MEMORY_BUDGET_MB * 1024 * 1024)
+        return max(1, budget // (max(1, self.num_trials) * self._BATCH_BYTES_PER_CELL))
+    
+    def _batch_fixed(self, streams: List[np.random.Generator]) -> tuple:
+        """
+        Run fixed-strategy simulations as a 2-D simulations x trials matrix.
+        
+        Only win/loss outcomes matter for the batch statistics, so each cell
+        is drawn as a Bernoulli trial with the bet's win probability instead
+        of rolling faces. Rows are processed in chunks sized to
+        Config.BATCH_MEMORY_BUDGET_MB; each row draws from its own stream.
+        
+        Args:
+            streams: One Generator per simulation
+            
+        Returns:
+            Tuple of (final_balances, win_rates) arrays
+        """
+        num_simulations = len(streams)
+        dtype = self._balance_dtype()
+        win_prob = self._win_probability()
+        final_balances = np.empty(num_simulations, dtype=dtype)
+        win_rates = np.zeros(num_simulations)
+        chunk_rows = self._batch_chunk_rows()
+        uniforms = np.empty((min(chunk_rows, num_simulations), self.num_trials))
+        
+        for start in range(0, num_simulations, chunk_rows):
+            rows = min(chunk_rows, num_simulations - start)
+            for row in range(rows):
+                streams[start + row].random(out=uniforms[row])
+            won = uniforms[:rows] < win_prob
+            end = start + rows
+            final_balances[start:end], win_rates[start:end] = self._fixed_matrix(won, dtype)
+        
+        return final_balances, win_rates
+    
+    def _fixed_matrix(self, won: np.ndarray, dtype) -> tuple:
+        """
+        Resolve a block of fixed-strategy simulations from their outcomes.
+        
+        Each row's balance path is a row-wise cumulative sum; a row that hits
+        exactly zero is ruined at that round. Rows left holding less than the
+        base bet (an all-in round) fall back to _play_path.
+        
+        Args:
+            won: Boolean outcomes, shape (simulations, trials)
+            dtype: Balance dtype from _balance_dtype
+            
+        Returns:
+            Tuple of (final_balances, win_rates) arrays for the block
+        """
+        rows, n = won.shape
+        base_bet = self.base_bet
+        final_balances = np.empty(rows, dtype=dtype)
+        win_rates = np.zeros(rows)
+        
+        if n == 0 or self.starting_balance < base_bet or base_bet <= 0:
+            fallback = np.arange(rows)
+        else:
+            steps = np.where(won, base_bet * (self.payout - 1), -base_bet).astype(dtype)
+            steps[:, 0] += dtype(self.starting_balance)
+            paths = np.cumsum(steps, axis=1, out=steps)
+            
+            # Only balances that precede another round can trigger an all-in bet
+            below = paths[:, :-1] < base_bet
+            short = below.any(axis=1)
+            rounds = np.where(short, below.argmax(axis=1) + 1, n)
+            del below
+            
+            final_balances[:] = paths[np.arange(rows), rounds - 1]
+            del steps, paths
+            wins = np.count_nonzero(won & (np.arange(n) < rounds[:, None]), axis=1)
+            win_rates[:] = wins / rounds * 100
+            fallback = np.flatnonzero(short & (final_balances > 0))
+        
+        for row in fallback:
+            balances, _ = self._play_path(won[row], self.starting_balance, self.strategy.initial_state(1, dtype))
+            total_rounds = len(balances)
+            final_balances[row] = balances[-1] if total_rounds else self.starting_balance
+            win_rates[row] = (
+                np.count_nonzero(won[row, :total_rounds]) / total_rounds * 100
+                if total_rounds > 0 else 0
+            )
+        
+        return final_balances, win_rates
+    
+    def _batch_lockstep(self, streams: List[np.random.Generator]) -> tuple:
+        """
+        Run path-dependent strategies with all simulations in lockstep.
+        
+        Every simulation advances one round per iteration, with its balance
+        and strategy state held in NumPy arrays. Simulations that go
+        bankrupt or can no longer bet are dropped from the working set, so
+        each round costs one vectorized step over the survivors.
+        
+        Each simulation draws its outcomes from its own stream, in blocks of
+        rounds sized to Config.BATCH_MEMORY_BUDGET_MB, so results do not
+        depend on how the batch is split.
+        
+        Args:
+            streams: One Generator per simulation
+            
+        Returns:
+            Tuple of (final_balances, win_rates) arrays
+        """
+        num_simulations = len(streams)
+        dtype = self._batch_dtype()
+        win_prob = self._win_probability()
+        strategy = self.strategy
+        
+        final_balances = np.full(num_simulations, self.starting_balance, dtype=dtype)
+        wins = np.zeros(num_simulations, dtype=np.int64)
+        rounds = np.zeros(num_simulations, dtype=np.int64)
+        
+        # Working set of simulations still playing
+        alive = np.arange(num_simulations)
+        balance = final_balances.copy()
+        state = strategy.initial_state(num_simulations, dtype)
+        alive_wins = np.zeros(num_simulations, dtype=np.int64)
+        budget = int(Config.BATCH_MEMORY_BUDGET_MB * 1024 * 1024)
+        block_end = 0
         
         for trial in range(self.num_trials):
-            if balance <= 0:
-                bankruptcies = 1
-                break
+            if trial == block_end:
+                # Draw the next block of uniforms for every survivor
+                block = max(1, min(self.num_trials - trial, budget // (8 * len(alive))))
+                uniforms = np.empty((len(alive), block))
+                for row, sim in enumerate(alive):
+                    streams[sim].random(out=uniforms[row])
+                block_rows = np.arange(len(alive))
+                block_start, block_end = trial, trial + block
+            
+            bet = strategy.bet(state, balance)
+            playing = (balance > 0) & (bet > 0)
+            if not playing.all():
+                stopped = alive[~playing]
+                final_balances[stopped] = balance[~playing]
+                wins[stopped] = alive_wins[~playing]
+                rounds[stopped] = trial
+                
+                alive = alive[playing]
+                block_rows = block_rows[playing]
+                balance = balance[playing]
+                bet = bet[playing]
+                state = {field: values[playing] for field, values in state.items()}
+                alive_wins = alive_wins[playing]
+                if len(alive) == 0:
+                    break
+            
+            won = uniforms[block_rows, trial - block_start] < win_prob
+            balance = balance + np.where(won, bet * (self.payout - 1), -bet)
+            strategy.update(state, won, balance)
+            alive_wins += won
+        else:
+            final_balances[alive] = balance
+            wins[alive] = alive_wins
+            rounds[alive] = self.num_trials
+        
+        win_rates = np.divide(
+            wins, rounds, out=np.zeros(num_simulations), where=rounds > 0
+        ) * 100
+        return final_balances, win_rates
+    
+    def run_envelope(self, seed: SeedLike = None) -> Dict:
+        """
+        Run the simulation in constant memory.
+        
+        Args:
+            seed: Seed or Generator for this run (None = the simulation's seed)
             
-            # Determine bet
-            bet = self._get_bet_amount(balance, last_won, current_bet)
-            if bet <= 0:
+        Returns:
+            Dictionary with simulation results, statistics and balance envelope
+        """
+        for event, payload in self.iter_run_envelope(seed):
+            pass
+        return payload
+    
+    def iter_run_envelope(self, seed: SeedLike = None, chunk_size: Optional[int] = None) -> Iterator[tuple]:
+        """
+        Run the simulation keeping only online statistics.
+        
+        Rounds are drawn and played in blocks of Config.ENVELOPE_BLOCK_TRIALS.
+        Each block is folded into Welford balance moments, the running extremes,
+        the face counts and a trajectory envelope of at most
+        Config.ENVELOPE_POINTS buckets, each holding the minimum, maximum and
+        last balance of its rounds. The block is then discarded, so memory
+        does not grow with num_trials. Rolls are drawn per block, so a seed
+        reproduces this mode exactly but not the sampled run() path.
+        
+        Args:
+            seed: Seed or Generator for this run (None = the simulation's seed)
+            chunk_size: Rounds between progress snapshots (None = no snapshots)
+            
+        Yields:
+            ('progress', snapshot) as chunks complete, then ('result', results)
+        """
+        started = time.perf_counter()
+        seed, source = resolve_seed(self.seed if seed is None else seed)
+        rng = np.random.default_rng(source)
+        dtype = self._batch_dtype()
+        block_size = max(1, Config.ENVELOPE_BLOCK_TRIALS)
+        
+        balance = dtype(self.starting_balance).item()
+        state = self.strategy.initial_state(1, dtype)
+        
+        # Bucket b covers balances [b * step, (b + 1) * step), index 0 being the start
+        step = -(-(self.num_trials + 1) // max(1, Config.ENVELOPE_POINTS))
+        buckets = -(-(self.num_trials + 1) // step)
+        envelope = np.full((3, buckets), float(balance))
+        moments = (1, float(balance), 0.0)
+        face_counts = np.zeros(7, dtype=np.int64)
+        wins = rounds = 0
+        max_balance = min_balance = balance
+        reported = 0
+        
+        while rounds < self.num_trials:
+            n = min(block_size, self.num_trials - rounds)
+            rolls, won = self._draw_wins(n, rng)
+            path, state = self._play_path(won, balance, state)
+            played = len(path)
+            
+            if played:
+                self._merge_envelope(envelope, path, rounds + 1, step)
+                moments = self._merge_moments(moments, path)
+                face_counts += np.bincount(rolls[:played], minlength=7)
+                wins += int(np.count_nonzero(won[:played]))
+                balance = path[-1].item()
+                max_balance = max(max_balance, path.max().item())
+                min_balance = min(min_balance, path.min().item())
+                rounds += played
+            
+            if played < n:
                 break
             
-            bet_face = self._choose_bet_face()
-            
-            # Roll dice
-            result = self.dice.roll()
-            face_counts[result] += 1
-            results.append(result)
-            
-            # Determine outcome
-            won = result == bet_face
-            if won:
-                balance += bet * (self.payout - 1)
-                wins += 1
-                last_won = True
-            else:
-                balance -= bet
-                losses += 1
-                last_won = False
-            
-            current_bet = bet
-            balances.append(balance)
-            max_balance = max(max_balance, balance)
-            min_balance = min(min_balance, balance)
+            if chunk_size and rounds - reported >= chunk_size and rounds < self.num_trials:
+                first = reported // step
+                yield 'progress', {
+                    'rounds_played': rounds,
+                    'progress': round(rounds / self.num_trials * 100, 2),
+                    'summary': self._progress_summary(rounds, wins, balance, max_balance, min_balance),
+                    'envelope': self._envelope_points(envelope, first, rounds // step + 1, step)
+                }
+                reported = rounds
+        
+        count, mean, m2 = moments
+        results = self._build_run_result(
+            balance, wins, rounds - wins, {i: int(face_counts[i]) for i in range(1, 7)},
+            max_balance, min_balance, [round(b, 2) for b in envelope[2, :rounds // step + 1].tolist()], seed
+        )
+        results['summary']['mean_balance'] = round(mean, 2)
+        results['summary']['balance_std'] = round((m2 / count) ** 0.5, 2)
+        results['balance_envelope'] = self._envelope_points(envelope, 0, rounds // step + 1, step)
+        results['parameters']['trajectory'] = 'envelope'
+        self._record_metrics('run', 1, rounds, int(balance <= 0), started)
+        yield 'result', results
+    
+    @staticmethod
+    def _merge_envelope(envelope: np.ndarray, path: np.ndarray, start: int, step: int):
+        """
+        Fold a block of consecutive balances into the min/max/last envelope.
+        
+        Args:
+            envelope: (3, buckets) array of bucket minimum, maximum and last balance
+            path: Balances of the block
+            start: Trajectory index of the block's first balance
+            step: Balances per bucket
+        """
+        # Block offsets where a new bucket begins, always including the first
+        offsets = np.arange((-start) % step, len(path), step)
+        if not len(offsets) or offsets[0]:
+            offsets = np.concatenate(([0], offsets))
+        index = (start + offsets) // step
+        lows = np.minimum.reduceat(path, offsets)
+        highs = np.maximum.reduceat(path, offsets)
+        
+        # Only the first bucket can continue one started by the previous block
+        if start % step:
+            lows[0] = min(lows[0], envelope[0, index[0]])
+            highs[0] = max(highs[0], envelope[1, index[0]])
+        envelope[0, index] = lows
+        envelope[1, index] = highs
+        envelope[2, index] = path[np.append(offsets[1:], len(path)) - 1]
+    
+    @staticmethod
+    def _merge_moments(moments: tuple, values: np.ndarray) -> tuple:
+        """
+        Combine running (count, mean, M2) moments with a block of values.
+        
+        Args:
+            moments: Welford (count, mean, sum of squared deviations) so far
+            values: Block of new observations
+            
+        Returns:
+            Updated (count, mean, M2) tuple
+        """
+        count, mean, m2 = moments
+        block_count = len(values)
+        block_mean = float(values.mean())
+        block_m2 = float(np.square(values - block_mean).sum())
         
+        total = count + block_count
+        delta = block_mean - mean
+        return (
+            total,
+            mean + delta * block_count / total,
+            m2 + block_m2 + delta * delta * count * block_count / total
+        )
+    
+    @staticmethod
+    def _envelope_points(envelope: np.ndarray, first: int, last: int, step: int) -> Dict:
+        """Envelope buckets [first, last) as rounded JSON lists."""
+        return {
+            'start': first * step,
+            'step': step,
+            'min': [round(b, 2) for b in envelope[0, first:last].tolist()],
+            'max': [round(b, 2) for b in envelope[1, first:last].tolist()],
+            'last': [round(b, 2) for b in envelope[2, first:last].tolist()]
+        }
+    
+    def _record_metrics(self, kind: str, simulations: int, trials: int, bankruptcies: int, started: float):
+        """
+        Count a finished simulation in the shared metrics.
+        
+        Args:
+            kind: 'run', 'batch' or 'convergence'
+            simulations: Simulations completed
+            trials: Rounds simulated (scheduled rounds for a batch)
+            bankruptcies: Simulated players ruined
+            started: perf_counter() when the simulation started
+        """
+        elapsed = time.perf_counter() - started
+        labels = {'kind': kind, 'strategy': self.bet_strategy}
+        metrics.inc('rollquest_simulations_total', simulations, **labels)
+        metrics.inc('rollquest_simulation_trials_total', trials, **labels)
+        metrics.inc('rollquest_simulation_bankruptcies_total', bankruptcies, **labels)
+        metrics.observe('rollquest_simulation_duration_seconds', elapsed, kind=kind)
+        if elapsed > 0:
+            metrics.observe(
+                'rollquest_simulation_trials_per_second', trials / elapsed, buckets=THROUGHPUT_BUCKETS, kind=kind
+            )
+    
+    def _strategy_parameters(self) -> Dict:
+        """Betting strategy echoed in response parameters (options and limits only when set)."""
+        parameters = {'bet_strategy': self.bet_strategy}
+        if self.strategy_options:
+            parameters['strategy_options'] = self.strategy_options
+        if self.stop_loss is not None:
+            parameters['stop_loss'] = self.stop_loss
+        if self.take_profit is not None:
+            parameters['take_profit'] = self.take_profit
+        return parameters
+    
+    def _win_probability(self) -> float:
+        """Probability that a single bet wins."""
+        if self.target_face:
+            return self.dice.get_probability(self.target_face)
+        # A uniformly random bet face wins with probability 1/6 for any dice
+        return 1/6
+    
+    def _build_run_result(
+        self,
+        balance: float,
+        wins: int,
+        losses: int,
+        face_counts: Dict,
+        max_balance: float,
+        min_balance: float,
+        balances,
+        seed=None
+    ) -> Dict:
+        """
+        Assemble the response for a single simulation run.
+        
+        Args:
+            balance: Final balance
+            wins: Number of winning rounds
+            losses: Number of losing rounds
+            face_counts: Count of each rolled face
+            max_balance: Highest balance reached
+            min_balance: Lowest balance reached
+            balances: Full balance trajectory (list or NumPy array)
+            seed: Seed echoed in the response parameters
+            
+        Returns:
+            Dictionary with simulation results and statistics
+        """
         # Calculate statistics
         total_rounds = wins + losses
         win_rate = (wins / total_rounds * 100) if total_rounds > 0 else 0
         profit = balance - self.starting_balance
         
         # Theoretical calculations
-        if self.target_face:
-            theoretical_win_prob = self.dice.get_probability(self.target_face)
-        else:
-            theoretical_win_prob = 1/6
+        theoretical_win_prob = self._win_probability()
         
         expected_value_per_bet = (theoretical_win_prob * self.payout - 1) * self.base_bet
         house_edge = (1 - theoretical_win_prob * self.payout) * 100
@@ -167,6 +847,8 @@ class MonteCarloSimulation:
             sampled_balances = balances[::step]
         else:
             sampled_balances = balances
+        if isinstance(sampled_balances, np.ndarray):
+            sampled_balances = sampled_balances.tolist()
         
         return {
             'summary': {
@@ -194,86 +876,336 @@ class MonteCarloSimulation:
                 'num_trials': self.num_trials,
                 'starting_balance': self.starting_balance,
                 'bet_amount': self.base_bet,
-                'bet_strategy': self.bet_strategy,
+                **self._strategy_parameters(),
                 'game_mode': self.dice.mode,
-                'probabilities': self.dice.probabilities
+                'probabilities': self.dice.probabilities,
+                'seed': seed
             }
         }
     
-    def convergence_analysis(self, checkpoints: int = 50) -> Dict:
+    @staticmethod
+    def _convergence_checkpoints(num_trials: int, checkpoints: int, spacing: str) -> np.ndarray:
+        """
+        Trial counts at which convergence is recorded.
+        
+        Args:
+            num_trials: Total number of rolls
+            checkpoints: Number of data points to collect
+            spacing: 'linear' (every num_trials // checkpoints rolls) or 'log'
+            
+        Returns:
+            Sorted array of unique trial counts ending at num_trials
+        """
+        if num_trials <= 0:
+            return np.zeros(0, dtype=np.int64)
+        if spacing == 'log':
+            points = np.geomspace(1, num_trials, max(1, checkpoints)).round().astype(np.int64)
+        else:
+            step = max(1, num_trials // checkpoints)
+            points = np.arange(step, num_trials + 1, step, dtype=np.int64)
+        return np.unique(np.append(points, num_trials))
+    
+    @staticmethod
+    def wilson_interval(hits: np.ndarray, n: np.ndarray, z: float = 1.96) -> tuple:
+        """
+        Vectorized Wilson score interval for binomial proportions.
+        
+        Args:
+            hits: Success counts
+            n: Trial counts (broadcastable against hits, all > 0)
+            z: Normal quantile (1.96 = 95% confidence)
+            
+        Returns:
+            Tuple of (low, high) arrays as proportions
+        """
+        p = hits / n
+        z2 = z * z
+        denom = 1 + z2 / n
+        center = (p + z2 / (2 * n)) / denom
+        half = z * np.sqrt(p * (1 - p) / n + z2 / (4 * n * n)) / denom
+        return np.clip(center - half, 0, 1), np.clip(center + half, 0, 1)
+    
+    def convergence_analysis(
+        self,
+        checkpoints: int = 50,
+        seed: SeedLike = None,
+        spacing: str = 'linear'
+    ) -> Dict:
         """
         Analyze how empirical probability converges to theoretical.
         
+        Rolls are streamed in chunks of Config.CONVERGENCE_CHUNK_SIZE and the
+        running hit counts of all six faces are read off per-chunk cumulative
+        sums, so memory stays constant however many rolls are requested. The
+        top-level keys describe the target face; 'faces' covers all six.
+        
         Args:
             checkpoints: Number of data points to collect
+            seed: Seed or Generator for this run (None = the simulation's seed)
+            spacing: 'linear' or 'log' spaced checkpoints
             
         Returns:
             Dictionary with convergence data
         """
+        started = time.perf_counter()
         target = self.target_face or 1
-        theoretical_prob = self.dice.get_probability(target)
-        
-        # Roll dice many times
-        results = self.dice.roll_multiple(self.num_trials)
-        
-        # Calculate running empirical probability
-        step = max(1, self.num_trials // checkpoints)
-        trials_points = []
-        empirical_probs = []
-        
-        hits = 0
-        for i, result in enumerate(results):
-            if result == target:
-                hits += 1
-            
-            if (i + 1) % step == 0 or i == len(results) - 1:
-                trials_points.append(i + 1)
-                empirical_probs.append(hits / (i + 1) * 100)
-        
-        # Calculate confidence intervals
-        confidence_intervals = []
-        for i, n in enumerate(trials_points):
-            p = empirical_probs[i] / 100
-            if n > 0:
-                se = np.sqrt(p * (1 - p) / n)
-                ci_low = max(0, (p - 1.96 * se) * 100)
-                ci_high = min(100, (p + 1.96 * se) * 100)
-                confidence_intervals.append([ci_low, ci_high])
-            else:
-                confidence_intervals.append([0, 100])
+        n = self.num_trials
+        points = self._convergence_checkpoints(n, checkpoints, spacing)
+        
+        seed, source = resolve_seed(self.seed if seed is None else seed)
+        rng = np.random.default_rng(source)
+        
+        # Running hit counts per checkpoint (rows) and face (columns)
+        hits = np.zeros((len(points), 6), dtype=np.int64)
+        counts = np.zeros(6, dtype=np.int64)
+        chunk_size = Config.CONVERGENCE_CHUNK_SIZE
+        
+        for start in range(0, n, chunk_size):
+            size = min(chunk_size, n - start)
+            rolls = self.dice.roll_multiple(size, as_array=True, rng=rng)
+            
+            lo, hi = np.searchsorted(points, [start, start + size], side='right')
+            offsets = points[lo:hi] - start - 1
+            if hi > lo:
+                for face in range(6):
+                    running = np.cumsum(rolls == face + 1, dtype=np.int64)
+                    hits[lo:hi, face] = counts[face] + running[offsets]
+            counts += np.bincount(rolls, minlength=7)[1:]
+        
+        self._record_metrics('convergence', 1, n, 0, started)
+        
+        trials = points[:, None]
+        empirical = hits / np.maximum(trials, 1) * 100
+        ci_low, ci_high = self.wilson_interval(hits, np.maximum(trials, 1))
+        intervals = np.round(np.stack([ci_low, ci_high], axis=-1) * 100, 4)
+        theoretical = np.array(self.dice.probabilities) * 100
+        
+        faces = {}
+        for face in range(6):
+            final = float(empirical[-1, face]) if len(points) else 0
+            faces[face + 1] = {
+                'theoretical_probability': round(float(theoretical[face]), 4),
+                'empirical_probabilities': np.round(empirical[:, face], 4).tolist(),
+                'confidence_intervals': intervals[:, face].tolist(),
+                'final_empirical': round(final, 4),
+                'convergence_error': round(abs(final - theoretical[face]), 4) if len(points) else 0
+            }
         
         return {
             'target_face': target,
-            'theoretical_probability': round(theoretical_prob * 100, 4),
-            'trials': trials_points,
-            'empirical_probabilities': [round(p, 4) for p in empirical_probs],
-            'confidence_intervals': confidence_intervals,
-            'final_empirical': round(empirical_probs[-1], 4) if empirical_probs else 0,
-            'convergence_error': round(abs(empirical_probs[-1] - theoretical_prob * 100), 4) if empirical_probs else 0
+            **faces[target],
+            'trials': points.tolist(),
+            'faces': faces,
+            'parameters': {
+                'num_trials': self.num_trials,
+                'checkpoint_spacing': spacing,
+                'game_mode': self.dice.mode,
+                'probabilities': self.dice.probabilities,
+                'seed': seed
+            }
+        }
+    
+    def _batch_engine(self, streams: List[np.random.Generator]) -> tuple:
+        """Run a set of simulations on the engine for this strategy."""
+        if type(self.strategy) is FixedBet:
+            return self._batch_fixed(streams)
+        return self._batch_lockstep(streams)
+    
+    def _batch_dtype(self):
+        """Dtype of balances under this strategy (fractional stakes need floats)."""
+        return self._balance_dtype() if self.strategy.integral else np.float64
+    
+    def _batch_parallel(self, streams: List[np.random.Generator], workers: int) -> tuple:
+        """
+        Shard a batch across the persistent process pool.
+        
+        Workers write final balances and win rates straight into a shared
+        memory block instead of pickling results back. Each simulation
+        keeps its own stream, so results match the serial engine for the
+        same seed regardless of the worker count.
+        
+        Args:
+            streams: One Generator per simulation
+            workers: Number of worker processes
+            
+        Returns:
+            Tuple of (final_balances, win_rates) arrays
+        """
+        num_simulations = len(streams)
+        dtype = np.dtype(self._batch_dtype())
+        params = {
+            'num_trials': self.num_trials,
+            'starting_balance': self.starting_balance,
+            'bet_amount': self.base_bet,
+            'bet_strategy': self.bet_strategy,
+            'probabilities': None if self.dice.mode == 'fair' else list(self.dice.probabilities),
+            'target_face': self.target_face,
+            'strategy_options': self.strategy_options,
+            'stop_loss': self.stop_loss,
+            'take_profit': self.take_profit
         }
+        
+        block = shared_memory.SharedMemory(
+            create=True, size=num_simulations * (dtype.itemsize + 8)
+        )
+        try:
+            executor = get_executor(workers)
+            bounds = np.linspace(0, num_simulations, workers + 1).astype(int)
+            futures = [
+                executor.submit(_run_batch_shard, params, streams[lo:hi], block.name,
+                                num_simulations, lo, dtype.str)
+                for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo
+            ]
+            wait(futures)
+            for future in futures:
+                future.result()
+            
+            balances, rates = _shared_batch_arrays(block, num_simulations, dtype)
+            final_balances, win_rates = balances.copy(), rates.copy()
+            del balances, rates
+        finally:
+            block.close()
+            block.unlink()
+        
+        return final_balances, win_rates
+    
+    def _batch_run(self, streams: List[np.random.Generator], workers: int) -> tuple:
+        """
+        Run a set of simulations, sharding across processes when worthwhile.
+        
+        Args:
+            streams: One Generator per simulation
+            workers: Worker processes available
+            
+        Returns:
+            Tuple of (final_balances, win_rates) arrays
+        """
+        workers = min(workers, len(streams))
+        if workers > 1 and len(streams) * self.num_trials >= Config.PARALLEL_BATCH_MIN_CELLS:
+            try:
+                return self._batch_parallel(streams, workers)
+            except BrokenProcessPool:
+                shutdown_executor()
+        return self._batch_engine(streams)
     
-    def batch_simulation(self, num_simulations: int = 100) -> Dict:
+    def batch_simulation(
+        self,
+        num_simulations: int = 100,
+        seed: SeedLike = None,
+        workers: Optional[int] = None
+    ) -> Dict:
         """
         Run multiple simulations for distribution analysis.
         
+        Each simulation draws from an independent child stream spawned
+        from the batch seed. Large batches are sharded across a process
+        pool when more than one worker is configured.
+        
+        Args:
+            num_simulations: Number of separate simulations to run
+            seed: Seed or Generator for this batch (None = the simulation's seed)
+            workers: Worker processes (None = Config.SIMULATION_WORKERS)
+            
+        Returns:
+            Dictionary with batch results
+        """
+        for event, payload in self.iter_batch(num_simulations, seed, workers=workers):
+            pass
+        return payload
+    
+    def iter_batch(
+        self,
+        num_simulations: int = 100,
+        seed: SeedLike = None,
+        chunk_size: Optional[int] = None,
+        workers: Optional[int] = None
+    ) -> Iterator[tuple]:
+        """
+        Run a batch in chunks of simulations, reporting progress in between.
+        
+        Simulations keep their own streams, so the final result is identical
+        for the same seed however the batch is chunked. Closing the generator
+        abandons the remaining chunks.
+        
         Args:
             num_simulations: Number of separate simulations to run
+            seed: Seed or Generator for this batch (None = the simulation's seed)
+            chunk_size: Simulations per chunk (None = a single chunk)
+            workers: Worker processes (None = Config.SIMULATION_WORKERS)
+            
+        Yields:
+            ('progress', snapshot) after every chunk but the last, then
+            ('result', results) with the same dictionary batch_simulation() returns
+        """
+        started = time.perf_counter()
+        seed, source = resolve_seed(self.seed if seed is None else seed)
+        streams = spawn_streams(source, num_simulations)
+        workers = Config.SIMULATION_WORKERS if workers is None else workers
+        chunk_size = max(1, chunk_size or num_simulations)
+        
+        final_balances = np.empty(num_simulations, dtype=self._batch_dtype())
+        win_rates = np.empty(num_simulations)
+        
+        for start in range(0, num_simulations, chunk_size):
+            end = min(start + chunk_size, num_simulations)
+            final_balances[start:end], win_rates[start:end] = self._batch_run(streams[start:end], workers)
+            if end < num_simulations:
+                yield 'progress', self._batch_progress(final_balances[:end], win_rates[:end], num_simulations)
+        
+        self._record_metrics(
+            'batch', num_simulations, num_simulations * self.num_trials,
+            int(np.count_nonzero(final_balances <= 0)), started
+        )
+        yield 'result', self._build_batch_result(final_balances, win_rates, seed)
+    
+    def _batch_progress(self, final_balances: np.ndarray, win_rates: np.ndarray, num_simulations: int) -> Dict:
+        """
+        Snapshot of a batch in progress with the running ruin estimate.
+        
+        Args:
+            final_balances: Final balances of the simulations completed so far
+            win_rates: Win rates of the simulations completed so far
+            num_simulations: Total simulations in the batch
+            
+        Returns:
+            Dictionary with running statistics and a 95% Wilson interval for ruin
+        """
+        completed = len(final_balances)
+        bankruptcies = int(np.count_nonzero(final_balances <= 0))
+        ruin_low, ruin_high = self.wilson_interval(bankruptcies, completed)
+        profits = final_balances - self.starting_balance
+        
+        return {
+            'completed': completed,
+            'progress': round(completed / num_simulations * 100, 2),
+            'statistics': {
+                'mean_profit': round(float(np.mean(profits)), 2),
+                'std_profit': round(float(np.std(profits)), 2),
+                'mean_win_rate': round(float(np.mean(win_rates)), 2),
+                'ruin_probability': round(bankruptcies / completed * 100, 2),
+                'ruin_confidence_interval': [round(float(ruin_low) * 100, 2), round(float(ruin_high) * 100, 2)]
+            }
+        }
+    
+    def _build_batch_result(self, final_balances: np.ndarray, win_rates: np.ndarray, seed) -> Dict:
+        """
+        Assemble the response for a finished batch.
+        
+        Args:
+            final_balances: Final balance of every simulation
+            win_rates: Win rate of every simulation
+            seed: Seed echoed in the response parameters
             
         Returns:
             Dictionary with batch results
         """
-        final_balances = []
-        profits = []
-        bankruptcies = 0
-        win_rates = []
+        num_simulations = len(final_balances)
+        went_bankrupt = final_balances <= 0
         
-        for _ in range(num_simulations):
-            result = self.run()
-            final_balances.append(result['summary']['final_balance'])
-            profits.append(result['summary']['profit'])
-            win_rates.append(result['summary']['win_rate'])
-            if result['summary']['went_bankrupt']:
-                bankruptcies += 1
+        profits = np.round(final_balances - self.starting_balance, 2)
+        final_balances = np.round(final_balances, 2)
+        win_rates = np.round(win_rates, 2)
+        bankruptcies = int(np.count_nonzero(went_bankrupt))
         
         # Calculate statistics
         mean_profit = np.mean(profits)
@@ -289,6 +1221,14 @@ class MonteCarloSimulation:
         return {
             'num_simulations': num_simulations,
             'trials_per_simulation': self.num_trials,
+            'parameters': {
+                'starting_balance': self.starting_balance,
+                'bet_amount': self.base_bet,
+                **self._strategy_parameters(),
+                'game_mode': self.dice.mode,
+                'probabilities': self.dice.probabilities,
+                'seed': seed
+            },
             'statistics': {
                 'mean_final_balance': round(float(np.mean(final_balances)), 2),
                 'std_final_balance': round(float(np.std(final_balances)), 2),
@@ -300,11 +1240,483 @@ class MonteCarloSimulation:
                 'value_at_risk_5': round(float(var_5), 2)
             },
             'distribution': {
-                'profits': [round(p, 2) for p in profits],
-                'final_balances': [round(b, 2) for b in final_balances],
+                'profits': np.round(profits, 2).tolist(),
+                'final_balances': np.round(final_balances, 2).tolist(),
                 'histogram': {
                     'counts': hist.tolist(),
                     'bins': [round(b, 2) for b in bin_edges.tolist()]
                 }
             }
         }
+    
+    def iter_batch_summary(
+        self,
+        num_simulations: int = 100,
+        seed: SeedLike = None,
+        chunk_size: Optional[int] = None,
+        workers: Optional[int] = None,
+        histogram_range: Optional[tuple] = None
+    ) -> Iterator[tuple]:
+        """
+        Run a batch keeping only bounded-size distribution summaries.
+        
+        Simulations run in chunks of Config.SUMMARY_CHUNK_SIMULATIONS, each
+        with its own child stream spawned on demand. Every chunk is folded
+        into Welford profit moments, a mergeable quantile sketch of profits
+        and win rates, and a profit histogram with fixed edges, then
+        discarded, so memory and response size do not grow with
+        num_simulations.
+        
+        Args:
+            num_simulations: Number of separate simulations to run
+            seed: Seed or Generator for this batch (None = the simulation's seed)
+            chunk_size: Simulations between progress snapshots (None = no snapshots)
+            workers: Worker processes (None = Config.SIMULATION_WORKERS)
+            histogram_range: (low, high) profit edges (None = from -starting
+                balance to Config.HISTOGRAM_SPAN starting balances)
+                
+        Yields:
+            ('progress', snapshot) as chunks complete, then ('result', results)
+        """
+        started = time.perf_counter()
+        seed, source = resolve_seed(self.seed if seed is None else seed)
+        workers = Config.SIMULATION_WORKERS if workers is None else workers
+        block_size = max(1, Config.SUMMARY_CHUNK_SIMULATIONS)
+        
+        low, high = histogram_range or (
+            -self.starting_balance, Config.HISTOGRAM_SPAN * self.starting_balance
+        )
+        histogram = FixedHistogram(low, high, Config.HISTOGRAM_BINS)
+        profit_sketch = QuantileSketch(Config.QUANTILE_SKETCH_K)
+        win_rate_sketch = QuantileSketch(Config.QUANTILE_SKETCH_K)
+        profit_moments = (0, 0.0, 0.0)
+        win_rate_total = 0.0
+        bankruptcies = completed = reported = 0
+        
+        while completed < num_simulations:
+            n = min(block_size, num_simulations - completed)
+            final_balances, win_rates = self._batch_run(spawn_streams(source, n), workers)
+            profits = final_balances - self.starting_balance
+            
+            profit_moments = self._merge_moments(profit_moments, profits.astype(np.float64))
+            profit_sketch.update(profits)
+            win_rate_sketch.update(win_rates)
+            histogram.update(profits)
+            win_rate_total += float(win_rates.sum())
+            bankruptcies += int(np.count_nonzero(final_balances <= 0))
+            completed += n
+            
+            if chunk_size and completed - reported >= chunk_size and completed < num_simulations:
+                ruin_low, ruin_high = self.wilson_interval(bankruptcies, completed)
+                count, mean, m2 = profit_moments
+                yield 'progress', {
+                    'completed': completed,
+                    'progress': round(completed / num_simulations * 100, 2),
+                    'statistics': {
+                        'mean_profit': round(mean, 2),
+                        'std_profit': round((m2 / count) ** 0.5, 2),
+                        'mean_win_rate': round(win_rate_total / completed, 2),
+                        'ruin_probability': round(bankruptcies / completed * 100, 2),
+                        'ruin_confidence_interval': [round(float(ruin_low) * 100, 2), round(float(ruin_high) * 100, 2)]
+                    }
+                }
+                reported = completed
+        
+        self._record_metrics(
+            'batch', num_simulations, num_simulations * self.num_trials, bankruptcies, started
+        )
+        count, mean, m2 = profit_moments
+        std = (m2 / count) ** 0.5
+        deciles = profit_sketch.quantiles([i / 10 for i in range(1, 10)])
+        var_5, = profit_sketch.quantiles([0.05])
+        
+        yield 'result', {
+            'num_simulations': num_simulations,
+            'trials_per_simulation': self.num_trials,
+            'parameters': {
+                'starting_balance': self.starting_balance,
+                'bet_amount': self.base_bet,
+                **self._strategy_parameters(),
+                'game_mode': self.dice.mode,
+                'probabilities': self.dice.probabilities,
+                'seed': seed
+            },
+            'statistics': {
+                'mean_final_balance': round(mean + self.starting_balance, 2),
+                'std_final_balance': round(std, 2),
+                'mean_profit': round(mean, 2),
+                'std_profit': round(std, 2),
+                'median_profit': round(deciles[4], 2),
+                'mean_win_rate': round(win_rate_total / num_simulations, 2),
+                'ruin_probability': round((bankruptcies / num_simulations) * 100, 2),
+                'value_at_risk_5': round(var_5, 2)
+            },
+            'distribution': {
+                'summary': True,
+                'profit_range': [round(profit_sketch.min, 2), round(profit_sketch.max, 2)],
+                'profit_deciles': [round(q, 2) for q in deciles],
+                'win_rate_deciles': [round(q, 2) for q in win_rate_sketch.quantiles([i / 10 for i in range(1, 10)])],
+                'histogram': histogram.to_dict()
+            }
+        }
+    
+    def until_precision(
+        self,
+        metric: str,
+        half_width: float,
+        max_simulations: int = 100000,
+        seed: SeedLike = None,
+        workers: Optional[int] = None
+    ) -> Dict:
+        """
+        Run simulations until a batch statistic is known to a target precision.
+        
+        Args:
+            metric: One of PRECISION_METRICS
+            half_width: Target 95% confidence interval half-width, in the
+                        metric's units (dollars or percentage points)
+            max_simulations: Budget of simulations to stop at regardless
+            seed: Seed or Generator for this batch (None = the simulation's seed)
+            workers: Worker processes (None = Config.SIMULATION_WORKERS)
+            
+        Returns:
+            Dictionary with the estimate, achieved precision and simulations used
+        """
+        for event, payload in self.iter_until_precision(metric, half_width, max_simulations, seed, workers):
+            pass
+        return payload
+    
+    def iter_until_precision(
+        self,
+        metric: str,
+        half_width: float,
+        max_simulations: int = 100000,
+        seed: SeedLike = None,
+        workers: Optional[int] = None
+    ) -> Iterator[tuple]:
+        """
+        Run a batch in geometrically growing chunks until a precision target is met.
+        
+        The first chunk holds Config.PRECISION_INITIAL_SIMULATIONS simulations
+        and each further chunk grows the total by Config.PRECISION_GROWTH, or
+        less when the shrinking interval projects the target sooner.
+        After every chunk the 95% interval of the metric is recomputed from
+        running moments (a Wilson interval for the ruin probability), and the
+        batch stops as soon as its half-width is within the target or the
+        budget is spent. Chunks are played in blocks of at most
+        Config.SUMMARY_CHUNK_SIMULATIONS simulations, each with its own child
+        streams spawned on demand, so memory stays bounded however large a
+        chunk grows and progress is reported after every block. Streams are
+        spawned in order, so a seed gives the same result however far the
+        batch runs.
+        
+        Args:
+            metric: One of PRECISION_METRICS
+            half_width: Target 95% confidence interval half-width, in the
+                        metric's units (dollars or percentage points)
+            max_simulations: Budget of simulations to stop at regardless
+            seed: Seed or Generator for this batch (None = the simulation's seed)
+            workers: Worker processes (None = Config.SIMULATION_WORKERS)
+            
+        Yields:
+            ('progress', snapshot) after every block but the last, then
+            ('result', results) with the same dictionary until_precision() returns
+        """
+        if metric not in self.PRECISION_METRICS:
+            raise ValueError(f"Metric must be one of: {', '.join(self.PRECISION_METRICS)}")
+        if not half_width > 0:
+            raise ValueError('Target half-width must be positive')
+        if max_simulations < 1:
+            raise ValueError('At least one simulation is required')
+        
+        started = time.perf_counter()
+        seed, source = resolve_seed(self.seed if seed is None else seed)
+        workers = Config.SIMULATION_WORKERS if workers is None else workers
+        
+        profit_moments = win_rate_moments = (0, 0.0, 0.0)
+        bankruptcies = completed = 0
+        block_size = max(1, Config.SUMMARY_CHUNK_SIMULATIONS)
+        # Simulations at the end of the current chunk, and the latest projected requirement
+        chunk_end = needed = min(max_simulations, max(2, Config.PRECISION_INITIAL_SIMULATIONS))
+        history = []
+        
+        while True:
+            n = min(block_size, chunk_end - completed)
+            final_balances, win_rates = self._batch_run(spawn_streams(source, n), workers)
+            profit_moments = self._merge_moments(
+                profit_moments, (final_balances - self.starting_balance).astype(np.float64)
+            )
+            win_rate_moments = self._merge_moments(win_rate_moments, win_rates)
+            bankruptcies += int(np.count_nonzero(final_balances <= 0))
+            completed += n
+            
+            statistics = self._precision_statistics(profit_moments, win_rate_moments, bankruptcies)
+            estimate, (low, high) = statistics[metric]
+            achieved = (high - low) / 2
+            
+            if completed == chunk_end:
+                history.append({
+                    'simulations': completed,
+                    'estimate': round(estimate, 4),
+                    'half_width': round(achieved, 4)
+                })
+                
+                converged = achieved <= half_width
+                if converged or completed >= max_simulations:
+                    break
+                
+                # Interval width shrinks as 1/sqrt(n), so about this many would meet the target
+                needed = min(max_simulations, int(np.ceil(completed * (achieved / half_width) ** 2)))
+                # Grow geometrically, but not far past the projected requirement
+                chunk_end = completed + max(1, min(int(completed * (Config.PRECISION_GROWTH - 1)), needed - completed))
+            
+            yield 'progress', {
+                'completed': completed,
+                'progress': round(completed / max_simulations * 100, 2),
+                'estimate': round(estimate, 4),
+                'half_width': round(achieved, 4),
+                'simulations_needed': needed
+            }
+        
+        self._record_metrics(
+            'precision', completed, completed * self.num_trials, bankruptcies, started
+        )
+        
+        count, mean_profit, m2 = profit_moments
+        std_profit = (m2 / count) ** 0.5
+        ruin_probability, ruin_interval = statistics['ruin_probability']
+        
+        yield 'result', {
+            'num_simulations': completed,
+            'trials_per_simulation': self.num_trials,
+            'trials_used': completed * self.num_trials,
+            'parameters': {
+                'starting_balance': self.starting_balance,
+                'bet_amount': self.base_bet,
+                **self._strategy_parameters(),
+                'game_mode': self.dice.mode,
+                'probabilities': self.dice.probabilities,
+                'seed': seed
+            },
+            'precision': {
+                'metric': metric,
+                'target_half_width': half_width,
+                'achieved_half_width': round(achieved, 4),
+                'converged': converged,
+                'estimate': round(estimate, 4),
+                'confidence_interval': [round(low, 4), round(high, 4)],
+                'max_simulations': max_simulations,
+                'history': history
+            },
+            'statistics': {
+                'mean_final_balance': round(mean_profit + self.starting_balance, 2),
+                'std_final_balance': round(std_profit, 2),
+                'mean_profit': round(mean_profit, 2),
+                'std_profit': round(std_profit, 2),
+                'mean_win_rate': round(win_rate_moments[1], 2),
+                'ruin_probability': round(ruin_probability, 2),
+                'ruin_confidence_interval': [round(ruin_interval[0], 2), round(ruin_interval[1], 2)]
+            }
+        }
+    
+    def _precision_statistics(
+        self,
+        profit_moments: tuple,
+        win_rate_moments: tuple,
+        bankruptcies: int,
+        z: float = 1.96
+    ) -> Dict:
+        """
+        Estimates and confidence intervals of every PRECISION_METRICS entry.
+        
+        Args:
+            profit_moments: Running (count, mean, M2) of profits
+            win_rate_moments: Running (count, mean, M2) of win rates
+            bankruptcies: Simulations ruined so far
+            z: Normal quantile (1.96 = 95% confidence)
+            
+        Returns:
+            Dictionary of metric -> (estimate, (low, high))
+        """
+        def normal(moments):
+            count, mean, m2 = moments
+            half = z * (m2 / max(count - 1, 1) / count) ** 0.5
+            return mean, (mean - half, mean + half)
+        
+        completed = profit_moments[0]
+        low, high = self.wilson_interval(bankruptcies, completed, z)
+        return {
+            'mean_profit': normal(profit_moments),
+            'win_rate': normal(win_rate_moments),
+            'ruin_probability': (bankruptcies / completed * 100, (float(low) * 100, float(high) * 100))
+        }
+    
+    def paired_comparison(
+        self,
+        variant: 'MonteCarloSimulation',
+        replications: int = 1000,
+        seed: SeedLike = None,
+        workers: Optional[int] = None
+    ) -> Dict:
+        """
+        Compare this simulation's dice with another's using common random numbers.
+        
+        Args:
+            variant: Simulation differing from this one only in its dice
+            replications: Number of paired simulations
+            seed: Seed or Generator for the comparison (None = this simulation's seed)
+            workers: Worker processes (None = Config.SIMULATION_WORKERS)
+            
+        Returns:
+            Dictionary with paired differences and confidence intervals
+        """
+        for event, payload in self.iter_paired_comparison(variant, replications, seed, workers=workers):
+            pass
+        return payload
+    
+    def iter_paired_comparison(
+        self,
+        variant: 'MonteCarloSimulation',
+        replications: int = 1000,
+        seed: SeedLike = None,
+        chunk_size: Optional[int] = None,
+        workers: Optional[int] = None
+    ) -> Iterator[tuple]:
+        """
+        Run paired replications of two dice configurations, reporting progress in between.
+        
+        Each replication plays both configurations from the same uniform
+        stream. A bet wins when its uniform falls below the configuration's
+        win probability (inverse-CDF sampling of the outcome), so the two
+        sides see the same luck and differ only where their probabilities
+        do. The paired differences then have far less variance than the
+        difference of two independent runs, and their confidence intervals
+        are correspondingly narrower for the same number of trials.
+        
+        Args:
+            variant: Simulation differing from this one only in its dice
+            replications: Number of paired simulations
+            seed: Seed or Generator for the comparison (None = this simulation's seed)
+            chunk_size: Replications per chunk (None = a single chunk)
+            workers: Worker processes (None = Config.SIMULATION_WORKERS)
+            
+        Yields:
+            ('progress', snapshot) after every chunk but the last, then
+            ('result', results) with the same dictionary paired_comparison() returns
+        """
+        for name in ('num_trials', 'starting_balance', 'base_bet', 'bet_strategy', 'strategy_options',
+                     'stop_loss', 'take_profit', 'target_face'):
+            if getattr(self, name) != getattr(variant, name):
+                raise ValueError(f'Paired simulations must share {name}')
+        
+        started = time.perf_counter()
+        seed, source = resolve_seed(self.seed if seed is None else seed)
+        streams = spawn_streams(source, replications)
+        workers = Config.SIMULATION_WORKERS if workers is None else workers
+        chunk_size = max(1, chunk_size or replications)
+        
+        # Rows: final balances and win rates of the baseline, then of the variant
+        outcomes = np.empty((4, replications))
+        
+        for start in range(0, replications, chunk_size):
+            end = min(start + chunk_size, replications)
+            # Each side consumes an identical copy of every replication's stream
+            twins = copy.deepcopy(streams[start:end])
+            outcomes[0:2, start:end] = self._batch_run(streams[start:end], workers)
+            outcomes[2:4, start:end] = variant._batch_run(twins, workers)
+            if end < replications:
+                yield 'progress', {
+                    'completed': end,
+                    'progress': round(end / replications * 100, 2),
+                    'metrics': self._paired_metrics(outcomes[:, :end])
+                }
+        
+        self._record_metrics(
+            'compare', 2 * replications, 2 * replications * self.num_trials,
+            int(np.count_nonzero(outcomes[[0, 2]] <= 0)), started
+        )
+        
+        metrics = self._paired_metrics(outcomes)
+        significant = [label for label, metric in metrics.items() if metric['significant']]
+        yield 'result', {
+            'replications': replications,
+            'trials_per_replication': self.num_trials,
+            'method': 'common_random_numbers',
+            'parameters': {
+                'starting_balance': self.starting_balance,
+                'bet_amount': self.base_bet,
+                **self._strategy_parameters(),
+                'target_face': self.target_face,
+                'baseline_probabilities': self.dice.probabilities,
+                'variant_probabilities': variant.dice.probabilities,
+                'seed': seed
+            },
+            'metrics': metrics,
+            'conclusion': (
+                f"The variant differs significantly (95%) in: {', '.join(significant)}."
+                if significant else
+                'No significant difference at 95% confidence; run more replications.'
+            )
+        }
+    
+    def _paired_metrics(self, outcomes: np.ndarray) -> Dict:
+        """
+        Paired differences (variant - baseline) of every reported metric.
+        
+        Args:
+            outcomes: Rows of baseline final balances, baseline win rates,
+                      variant final balances and variant win rates
+                      
+        Returns:
+            Dictionary of metric name -> paired statistics
+        """
+        baseline_balances, baseline_rates, variant_balances, variant_rates = outcomes
+        return {
+            'profit': self._paired_difference(
+                baseline_balances - self.starting_balance, variant_balances - self.starting_balance
+            ),
+            'win_rate': self._paired_difference(baseline_rates, variant_rates),
+            'ruin_probability': self._paired_difference(
+                (baseline_balances <= 0) * 100.0, (variant_balances <= 0) * 100.0
+            )
+        }
+    
+    @staticmethod
+    def _paired_difference(baseline: np.ndarray, variant: np.ndarray, z: float = 1.96) -> Dict:
+        """
+        Normal-approximation confidence intervals for a paired comparison.
+        
+        Args:
+            baseline: Metric of each replication under the baseline dice
+            variant: Metric of each replication under the variant dice
+            z: Normal quantile (1.96 = 95% confidence)
+            
+        Returns:
+            Dictionary with both means and the mean difference, each with an
+            interval, and the variance reduction over independent sampling
+        """
+        n = len(baseline)
+        ddof = 1 if n > 1 else 0
+        difference = variant - baseline
+        
+        def interval(values):
+            mean = float(np.mean(values))
+            half = z * float(np.std(values, ddof=ddof)) / n ** 0.5
+            return mean, [round(mean - half, 4), round(mean + half, 4)]
+        
+        baseline_mean, baseline_ci = interval(baseline)
+        variant_mean, variant_ci = interval(variant)
+        mean, ci = interval(difference)
+        
+        # Variance of the difference had the two sides been sampled independently
+        independent = float(np.var(baseline, ddof=ddof) + np.var(variant, ddof=ddof))
+        paired = float(np.var(difference, ddof=ddof))
+        
+        return {
+            'baseline': {'mean': round(baseline_mean, 4), 'confidence_interval': baseline_ci},
+            'variant': {'mean': round(variant_mean, 4), 'confidence_interval': variant_ci},
+            'mean_difference': round(mean, 4),
+            'confidence_interval': ci,
+            'significant': not ci[0] <= 0 <= ci[1],
+            'variance_reduction': round(independent / paired, 2) if paired > 0 else None
+        }
@@ -0,0 +1,289 @@
+"""
+Persistent cross-worker cache for deterministic simulation results
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+import numpy as np
+from typing import Callable, Dict, Iterator, Optional
+from flask import current_app
+from app.config import Config
+
+
+def _to_builtin(value):
+    """JSON fallback for NumPy scalars and tuples nested in results."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+class ResultCache:
+    """
+    SQLite-backed cache of simulation responses shared by all workers.
+    
+    Entries are keyed by the endpoint and its canonicalized parameters
+    (including the seed) and hold the zlib-compressed JSON response, so a
+    hit is served without recomputing or re-serializing. Only seeded
+    requests are cached; unseeded requests draw fresh entropy and must not
+    repeat. Entries expire after a TTL and the least recently used entries
+    are evicted once the total size exceeds the configured budget. Hit,
+    miss and eviction counters live in the database so they aggregate
+    across worker processes.
+    """
+    
+    def __init__(self):
+        """Initialize an unbound cache; call init_app before use."""
+        self.path = None
+        self.enabled = False
+        self.max_bytes = Config.RESULT_CACHE_MAX_BYTES
+        self.ttl = Config.RESULT_CACHE_TTL
+        self._local = threading.local()
+        os.register_at_fork(after_in_child=self._after_fork)
+    
+    def init_app(self, app):
+        """
+        Bind the cache to an application and create its schema.
+        
+        Args:
+            app: Flask application
+        """
+        self.enabled = Config.RESULT_CACHE_ENABLED
+        self.path = Config.RESULT_CACHE_PATH or os.path.join(app.instance_path, 'result_cache.sqlite3')
+        app.extensions['result_cache'] = self
+        if not self.enabled:
+            return
+        
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'key TEXT PRIMARY KEY, endpoint TEXT, payload BLOB, size INTEGER, '
+                'created REAL, accessed REAL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)')
+            conn.execute('CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER)')
+            conn.executemany(
+                'INSERT OR IGNORE INTO counters VALUES (?, 0)',
+                [('hits',), ('misses',), ('evictions',), ('expirations',)]
+            )
+    
+    def _after_fork(self):
+        """Drop connections inherited from the parent in a forked child."""
+        self._local = threading.local()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread connection to the cache database."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'path', None) != self.path:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.path = self.path
+        return conn
+    
+    @staticmethod
+    def make_key(endpoint: str, params: Dict) -> str:
+        """
+        Canonical key for an endpoint and its parameters.
+        
+        Args:
+            endpoint: Simulation endpoint name
+            params: Canonicalized request parameters
+            
+        Returns:
+            Hex digest identifying the request
+        """
+        canonical = json.dumps(
+            {'endpoint': endpoint, 'params': params},
+            sort_keys=True, separators=(',', ':'), default=_to_builtin
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+    
+    def _bump(self, conn: sqlite3.Connection, name: str, amount: int = 1):
+        """Increment a shared counter."""
+        conn.execute('UPDATE counters SET value = value + ? WHERE name = ?', (amount, name))
+    
+    def get(self, endpoint: str, params: Dict) -> Optional[bytes]:
+        """
+        Look up a cached JSON payload.
+        
+        Args:
+            endpoint: Simulation endpoint name
+            params: Canonicalized request parameters
+            
+        Returns:
+            JSON bytes, or None on a miss
+        """
+        key = self.make_key(endpoint, params)
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            row = conn.execute(
+                'SELECT payload, created FROM entries WHERE key = ?', (key,)
+            ).fetchone()
+            if row is not None and now - row[1] > self.ttl:
+                conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+                self._bump(conn, 'expirations')
+                row = None
+            if row is None:
+                self._bump(conn, 'misses')
+                return None
+            conn.execute('UPDATE entries SET accessed = ? WHERE key = ?', (now, key))
+            self._bump(conn, 'hits')
+        return zlib.decompress(row[0])
+    
+    def put(self, endpoint: str, params: Dict, payload: bytes):
+        """
+        Store a JSON payload and evict least recently used entries over budget.
+        
+        Args:
+            endpoint: Simulation endpoint name
+            params: Canonicalized request parameters
+            payload: JSON response bytes
+        """
+        key = self.make_key(endpoint, params)
+        blob = zlib.compress(payload, 6)
+        now = time.time()
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)',
+                (key, endpoint, blob, len(blob), now, now)
+            )
+            total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+            evicted = 0
+            if total > self.max_bytes:
+                for old_key, size in conn.execute(
+                    'SELECT key, size FROM entries ORDER BY accessed'
+                ).fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    conn.execute('DELETE FROM entries WHERE key = ?', (old_key,))
+                    total -= size
+                    evicted += 1
+                self._bump(conn, 'evictions', evicted)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+    
+    def respond(self, endpoint: str, params: Dict, compute: Callable[[Dict], Dict]):
+        """
+        Serve a simulation response from the cache, computing it on a miss.
+        
+        Args:
+            endpoint: Simulation endpoint name
+            params: Canonicalized request parameters
+            compute: Function producing the result dict from params
+            
+        Returns:
+            Flask JSON response
+        """
+        cacheable = self.enabled and params.get('seed') is not None
+        payload = self.get(endpoint, params) if cacheable else None
+        if payload is None:
+            payload = json.dumps(compute(params), sort_keys=True, default=_to_builtin).encode()
+            if cacheable:
+                self.put(endpoint, params, payload)
+        return current_app.response_class(payload, mimetype='application/json')
+    
+    def stream(self, endpoint: str, params: Dict, events: Callable[[Dict], Iterator[tuple]]) -> Iterator[tuple]:
+        """
+        Stream a simulation's events, short-circuiting to a cached result.
+        
+        The final 'result' event is stored like a regular response, so
+        streamed and plain requests share cache entries. Closing this
+        generator closes the simulation's event generator, abandoning the
+        remaining work.
+        
+        Args:
+            endpoint: Simulation endpoint name
+            params: Canonicalized request parameters
+            events: Function producing (event, payload dict) pairs from params
+            
+        Yields:
+            (event, JSON bytes) pairs
+        """
+        cacheable = self.enabled and params.get('seed') is not None
+        payload = self.get(endpoint, params) if cacheable else None
+        if payload is not None:
+            yield 'result', payload
+            return
+        
+        iterator = events(params)
+        try:
+            for event, data in iterator:
+                payload = json.dumps(data, sort_keys=True, default=_to_builtin).encode()
+                if event == 'result' and cacheable:
+                    self.put(endpoint, params, payload)
+                yield event, payload
+        finally:
+            iterator.close()
+    
+    def warm(self, endpoint: str, params: Dict, compute: Callable[[Dict], Dict]):
+        """
+        Precompute a preset unless it is already cached.
+        
+        Args:
+            endpoint: Simulation endpoint name
+            params: Canonicalized request parameters (must include a seed)
+            compute: Function producing the result dict from params
+        """
+        if not self.enabled or params.get('seed') is None:
+            return
+        key = self.make_key(endpoint, params)
+        conn = self._connect()
+        row = conn.execute('SELECT created FROM entries WHERE key = ?', (key,)).fetchone()
+        if row is None or time.time() - row[0] > self.ttl:
+            payload = json.dumps(compute(params), sort_keys=True, default=_to_builtin).encode()
+            self.put(endpoint, params, payload)
+    
+    def stats(self) -> Dict:
+        """
+        Cache counters aggregated across all workers.
+        
+        Returns:
+            Dictionary with hits, misses, hit ratio, evictions and occupancy
+        """
+        if not self.enabled:
+            return {'enabled': False}
+        
+        conn = self._connect()
+        counters = dict(conn.execute('SELECT name, value FROM counters').fetchall())
+        entries, size = conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries'
+        ).fetchone()
+        lookups = counters['hits'] + counters['misses']
+        
+        return {
+            'enabled': True,
+            'hits': counters['hits'],
+            'misses': counters['misses'],
+            'hit_ratio': round(counters['hits'] / lookups, 4) if lookups else 0,
+            'evictions': counters['evictions'],
+            'expirations': counters['expirations'],
+            'entries': entries,
+            'size_bytes': size,
+            'max_bytes': self.max_bytes,
+            'ttl_seconds': self.ttl
+        }
+    
+    def clear(self):
+        """Remove every cached entry and reset the counters."""
+        if not self.enabled:
+            return
+        with self._connect() as conn:
+            conn.execute('DELETE FROM entries')
+            conn.execute('UPDATE counters SET value = 0')
+
+
+result_cache = ResultCache()
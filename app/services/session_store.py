@@ -0,0 +1,236 @@
+"""
+Event-sourced game session store backed by SQLite
+"""
+
+import json
+import os
+import sqlite3
+import struct
+import threading
+import time
+import uuid
+from typing import Optional
+from app.models.game_session import GameSession
+from app.services.metrics import metrics
+from app.config import Config
+
+
+# Latency histogram of every session store operation
+SESSION_TIMER = 'rollquest_session_store_duration_seconds'
+
+
+class SessionStore:
+    """
+    Persists game sessions as a snapshot plus an append-only event log.
+    
+    Each roll, deposit or rename appends one compact row to the events
+    table of a WAL-mode SQLite database, so a write costs the same number
+    of bytes however long the session is. Loading replays the events
+    logged since the snapshot. Once Config.SESSION_COMPACT_EVERY events
+    have accumulated, they are folded into a new snapshot and deleted.
+    Sessions idle for longer than Config.SESSION_TTL are evicted.
+    """
+    
+    def __init__(self):
+        """Initialize an unbound store; call init_app before use."""
+        self.path = None
+        self._local = threading.local()
+        os.register_at_fork(after_in_child=self._after_fork)
+        self._last_eviction = 0.0
+    
+    def init_app(self, app):
+        """
+        Bind the store to an application and create its schema.
+        
+        Args:
+            app: Flask application
+        """
+        self.path = Config.SESSION_STORE_PATH or os.path.join(app.instance_path, 'sessions.sqlite3')
+        app.extensions['session_store'] = self
+        
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS sessions ('
+                'id TEXT PRIMARY KEY, snapshot BLOB, snapshot_seq INTEGER, '
+                'last_seq INTEGER, updated REAL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS sessions_updated ON sessions (updated)')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS events ('
+                'session_id TEXT, seq INTEGER, kind TEXT, data TEXT, '
+                'PRIMARY KEY (session_id, seq)) WITHOUT ROWID'
+            )
+    
+    def _after_fork(self):
+        """Drop connections inherited from the parent in a forked child."""
+        self._local = threading.local()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread connection to the session database."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'path', None) != self.path:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.path = self.path
+        return conn
+    
+    @staticmethod
+    def _encode(game_session: GameSession) -> bytes:
+        """Serialize a session snapshot."""
+        return game_session.to_bytes()
+    
+    @staticmethod
+    def _decode(snapshot) -> GameSession:
+        """Deserialize a session snapshot (binary, or JSON from older stores)."""
+        if isinstance(snapshot, str):
+            return GameSession.from_dict(json.loads(snapshot))
+        try:
+            return GameSession.from_bytes(snapshot)
+        except (ValueError, struct.error):
+            # Snapshot from an older binary layout: start the session over
+            return GameSession()
+    
+    def create(self, game_session: GameSession) -> str:
+        """
+        Store a new session.
+        
+        Args:
+            game_session: Initial session state
+            
+        Returns:
+            The new session id
+        """
+        self.evict_expired()
+        session_id = uuid.uuid4().hex
+        with metrics.timer(SESSION_TIMER, operation='create'):
+            self._connect().execute(
+                'INSERT INTO sessions VALUES (?, ?, 0, 0, ?)',
+                (session_id, self._encode(game_session), time.time())
+            )
+        return session_id
+    
+    def _replay(self, conn: sqlite3.Connection, session_id: str) -> Optional[tuple]:
+        """Rebuild a session from its snapshot and logged events."""
+        row = conn.execute(
+            'SELECT snapshot, snapshot_seq, last_seq FROM sessions WHERE id = ?', (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        snapshot, snapshot_seq, last_seq = row
+        game_session = self._decode(snapshot)
+        for kind, data in conn.execute(
+            'SELECT kind, data FROM events WHERE session_id = ? AND seq > ? ORDER BY seq',
+            (session_id, snapshot_seq)
+        ):
+            game_session.apply_event(kind, json.loads(data))
+        return game_session, snapshot_seq, last_seq
+    
+    def load(self, session_id: Optional[str]) -> Optional[GameSession]:
+        """
+        Load the current state of a session.
+        
+        Args:
+            session_id: Session id, or None
+            
+        Returns:
+            GameSession, or None if the session does not exist
+        """
+        if session_id is None:
+            return None
+        with metrics.timer(SESSION_TIMER, operation='load'):
+            replayed = self._replay(self._connect(), session_id)
+        return replayed[0] if replayed else None
+    
+    def append(self, session_id: str, kind: str, data):
+        """
+        Log one event, compacting the log when enough have accumulated.
+        
+        Args:
+            session_id: Session id
+            kind: Event kind understood by GameSession.apply_event
+            data: JSON-serializable event data
+        """
+        with metrics.timer(SESSION_TIMER, operation='append'):
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute(
+                    'SELECT snapshot_seq, last_seq FROM sessions WHERE id = ?', (session_id,)
+                ).fetchone()
+                if row is not None:
+                    snapshot_seq, seq = row[0], row[1] + 1
+                    conn.execute(
+                        'INSERT INTO events VALUES (?, ?, ?, ?)',
+                        (session_id, seq, kind, json.dumps(data, separators=(',', ':')))
+                    )
+                    conn.execute(
+                        'UPDATE sessions SET last_seq = ?, updated = ? WHERE id = ?',
+                        (seq, time.time(), session_id)
+                    )
+                    if seq - snapshot_seq >= Config.SESSION_COMPACT_EVERY:
+                        self._compact(conn, session_id)
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+    
+    def _compact(self, conn: sqlite3.Connection, session_id: str):
+        """Fold logged events into a new snapshot (inside a transaction)."""
+        game_session, _, last_seq = self._replay(conn, session_id)
+        conn.execute(
+            'UPDATE sessions SET snapshot = ?, snapshot_seq = ? WHERE id = ?',
+            (self._encode(game_session), last_seq, session_id)
+        )
+        conn.execute(
+            'DELETE FROM events WHERE session_id = ? AND seq <= ?', (session_id, last_seq)
+        )
+    
+    def replace(self, session_id: str, game_session: GameSession):
+        """
+        Overwrite a session with a new state and drop its event log.
+        
+        Args:
+            session_id: Session id
+            game_session: New session state
+        """
+        with metrics.timer(SESSION_TIMER, operation='replace'):
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute(
+                    'UPDATE sessions SET snapshot = ?, snapshot_seq = last_seq, updated = ? WHERE id = ?',
+                    (self._encode(game_session), time.time(), session_id)
+                )
+                conn.execute('DELETE FROM events WHERE session_id = ?', (session_id,))
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+    
+    def evict_expired(self):
+        """Delete sessions idle for longer than Config.SESSION_TTL (at most once a minute)."""
+        now = time.time()
+        if now - self._last_eviction < 60:
+            return
+        self._last_eviction = now
+        
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            cutoff = now - Config.SESSION_TTL
+            conn.execute(
+                'DELETE FROM events WHERE session_id IN (SELECT id FROM sessions WHERE updated < ?)',
+                (cutoff,)
+            )
+            conn.execute('DELETE FROM sessions WHERE updated < ?', (cutoff,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+
+session_store = SessionStore()
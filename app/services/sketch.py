@@ -0,0 +1,212 @@
+"""
+Mergeable distribution summaries for very large simulation batches
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+
+class QuantileSketch:
+    """
+    KLL-style quantile sketch of a stream of values.
+    
+    Values enter level 0 with weight 1. When a level outgrows its
+    capacity it is sorted and every other value (from a random offset)
+    is promoted to the next level with twice the weight. Level
+    capacities shrink geometrically towards the bottom, so the sketch
+    holds O(k) values however many it has seen, and a quantile's rank
+    error is about 1/k of the count. Sketches built on different chunks,
+    processes or nodes merge level by level into the same guarantee.
+    """
+    
+    def __init__(self, k: int = 200, seed: Optional[int] = 0):
+        """
+        Initialize an empty sketch.
+        
+        Args:
+            k: Capacity of the top level (accuracy/size trade-off)
+            seed: Seed for the compaction offsets (None = fresh entropy)
+        """
+        self.k = k
+        self.count = 0
+        self.min = float('inf')
+        self.max = float('-inf')
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def _capacity(self, level: int) -> int:
+        """Capacity of a level, shrinking by 2/3 per level below the top."""
+        depth = len(self.levels) - 1 - level
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+    
+    def update(self, values: Sequence[float]):
+        """
+        Add a block of values.
+        
+        Args:
+            values: Observations to add
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if not len(values):
+            return
+        self.count += len(values)
+        self.min = min(self.min, values.min().item())
+        self.max = max(self.max, values.max().item())
+        self.levels[0] = np.concatenate((self.levels[0], values))
+        self._compress()
+    
+    def merge(self, other: 'QuantileSketch'):
+        """
+        Fold another sketch into this one.
+        
+        Args:
+            other: Sketch built on a disjoint part of the data
+        """
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, values in enumerate(other.levels):
+            self.levels[level] = np.concatenate((self.levels[level], values))
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+    
+    def _compress(self):
+        """Compact every level that exceeds its capacity, bottom-up."""
+        level = 0
+        while level < len(self.levels):
+            values = self.levels[level]
+            if len(values) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                values = np.sort(values)
+                # An odd value out stays behind so no weight is lost
+                kept = values[len(values) - len(values) % 2:]
+                promoted = values[self._rng.integers(2):len(values) - len(values) % 2:2]
+                self.levels[level] = kept
+                self.levels[level + 1] = np.concatenate((self.levels[level + 1], promoted))
+            level += 1
+    
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        """
+        Estimate quantiles of everything seen so far.
+        
+        Args:
+            qs: Quantiles in [0, 1]
+            
+        Returns:
+            Estimated value for each quantile (NaN when empty)
+        """
+        if not self.count:
+            return [float('nan')] * len(qs)
+        
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(len(level_values), 2 ** level, dtype=np.int64)
+            for level, level_values in enumerate(self.levels)
+        ])
+        order = np.argsort(values, kind='stable')
+        values, ranks = values[order], np.cumsum(weights[order])
+        
+        result = []
+        for q in qs:
+            if q <= 0:
+                result.append(self.min)
+            elif q >= 1:
+                result.append(self.max)
+            else:
+                index = int(np.searchsorted(ranks, q * ranks[-1]))
+                result.append(values[min(index, len(values) - 1)].item())
+        return result
+    
+    def to_dict(self) -> Dict:
+        """Serialize the sketch for merging elsewhere."""
+        return {
+            'k': self.k,
+            'count': self.count,
+            'min': self.min,
+            'max': self.max,
+            'levels': [level.tolist() for level in self.levels]
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict, seed: Optional[int] = 0) -> 'QuantileSketch':
+        """
+        Rebuild a sketch from to_dict output.
+        
+        Args:
+            data: Serialized sketch
+            seed: Seed for further compactions
+            
+        Returns:
+            QuantileSketch instance
+        """
+        sketch = cls(k=data['k'], seed=seed)
+        sketch.count = data['count']
+        sketch.min = data['min']
+        sketch.max = data['max']
+        sketch.levels = [np.asarray(level, dtype=np.float64) for level in data['levels']]
+        return sketch
+
+
+class FixedHistogram:
+    """
+    Histogram over edges fixed in advance, with underflow and overflow counts.
+    
+    Because the edges never depend on the data, histograms of disjoint
+    chunks merge by adding their counts.
+    """
+    
+    def __init__(self, low: float, high: float, bins: int):
+        """
+        Initialize an empty histogram.
+        
+        Args:
+            low: Lower edge of the first bin
+            high: Upper edge of the last bin
+            bins: Number of equal-width bins
+        """
+        if not high > low:
+            raise ValueError('Histogram range must have high > low')
+        self.edges = np.linspace(low, high, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+    
+    def update(self, values: Sequence[float]):
+        """
+        Count a block of values.
+        
+        Args:
+            values: Observations to count
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        low, high = self.edges[0], self.edges[-1]
+        self.underflow += int(np.count_nonzero(values < low))
+        self.overflow += int(np.count_nonzero(values > high))
+        self.counts += np.histogram(values, bins=self.edges)[0]
+    
+    def merge(self, other: 'FixedHistogram'):
+        """
+        Add the counts of another histogram with the same edges.
+        
+        Args:
+            other: Histogram of a disjoint part of the data
+        """
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError('Only histograms with identical edges can be merged')
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+    
+    def to_dict(self) -> Dict:
+        """Counts and rounded bin edges for a JSON response."""
+        return {
+            'counts': self.counts.tolist(),
+            'bins': [round(b, 2) for b in self.edges.tolist()],
+            'underflow': self.underflow,
+            'overflow': self.overflow
+        }
@@ -3,15 +3,56 @@ Statistical analysis services for RollQuest
 """
 
 import numpy as np
-from scipy import stats
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import List, Dict, Optional, Sequence
+
+
+def _stats():
+    """
+    scipy.stats, imported on first use.
+    
+    Importing scipy dominates worker start-up, and only the hypothesis
+    tests need it, so it is deferred until a test actually runs (or the
+    pre-fork warm-up loads it once for every worker).
+    """
+    from scipy import stats
+    return stats
+
+
+@lru_cache(maxsize=None)
+def chi2_critical_value(confidence: float, degrees_of_freedom: int) -> float:
+    """
+    Critical value of the chi-square distribution, cached per process.
+    
+    Args:
+        confidence: Confidence level, e.g. 0.95
+        degrees_of_freedom: Degrees of freedom
+        
+    Returns:
+        The chi-square quantile at the confidence level
+    """
+    return float(_stats().chi2.ppf(confidence, degrees_of_freedom))
 
 
 class StatisticalAnalyzer:
     """
     Provides statistical analysis for game session data.
+    
+    History is converted once into columnar NumPy arrays, so every
+    analysis is a handful of vectorized reductions and scales to long
+    histories such as exported sessions or simulated game logs.
     """
     
+    # Column name -> (dtype, default when a round omits it)
+    COLUMNS = {
+        'round': (None, None),
+        'bet_face': (np.int64, 1),
+        'bet_amount': (None, 0),
+        'result': (np.int64, 0),
+        'won': (bool, False),
+        'balance': (None, 0)
+    }
+    
     def __init__(self, history: List[Dict]):
         """
         Initialize analyzer with game history.
@@ -20,6 +61,44 @@ class StatisticalAnalyzer:
             history: List of game round dictionaries
         """
         self.history = history
+        self.columns = {
+            name: self._column(
+                [entry.get(name, i + 1 if name == 'round' else default) for i, entry in enumerate(history)],
+                dtype
+            )
+            for name, (dtype, default) in self.COLUMNS.items()
+        }
+    
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Sequence]) -> 'StatisticalAnalyzer':
+        """
+        Create an analyzer directly from columnar history.
+        
+        Args:
+            columns: Equal-length sequences keyed by 'round', 'bet_face',
+                'bet_amount', 'result', 'won' and 'balance'; 'result' is required
+                
+        Returns:
+            StatisticalAnalyzer instance
+        """
+        n = len(columns['result'])
+        analyzer = cls.__new__(cls)
+        analyzer.columns = {}
+        for name, (dtype, default) in cls.COLUMNS.items():
+            if name in columns:
+                analyzer.columns[name] = cls._column(columns[name], dtype)
+            elif name == 'round':
+                analyzer.columns[name] = np.arange(1, n + 1)
+            else:
+                analyzer.columns[name] = np.full(n, default, dtype=dtype)
+        analyzer.history = analyzer.columns['result']
+        return analyzer
+    
+    @staticmethod
+    def _column(values: Sequence, dtype) -> np.ndarray:
+        """Convert one column, inferring int or float for money columns."""
+        column = np.asarray(values, dtype=dtype)
+        return column if column.ndim == 1 else column.reshape(-1)
     
     def face_distribution(self) -> Dict:
         """
@@ -28,20 +107,19 @@ class StatisticalAnalyzer:
         Returns:
             Dictionary with face counts and percentages
         """
-        if not self.history:
+        if not len(self.history):
             return {
                 'counts': {i: 0 for i in range(1, 7)},
                 'percentages': {i: 0 for i in range(1, 7)},
                 'expected_percentage': 16.67
             }
         
-        counts = {i: 0 for i in range(1, 7)}
-        for entry in self.history:
-            result = entry.get('result', 0)
-            if result in counts:
-                counts[result] += 1
+        results = self.columns['result']
+        valid = results[(results >= 1) & (results <= 6)]
+        tally = np.bincount(valid, minlength=7)
+        counts = {i: int(tally[i]) for i in range(1, 7)}
         
-        total = sum(counts.values())
+        total = int(tally.sum())
         percentages = {
             face: round((count / total) * 100, 2) if total > 0 else 0
             for face, count in counts.items()
@@ -61,21 +139,21 @@ class StatisticalAnalyzer:
         Returns:
             Dictionary with rounds and cumulative profit
         """
-        if not self.history:
+        if not len(self.history):
             return {'rounds': [], 'profits': [], 'balances': []}
         
-        rounds = []
-        balances = []
-        
-        for entry in self.history:
-            rounds.append(entry.get('round', len(rounds) + 1))
-            balances.append(entry.get('balance', 0))
-        
         return {
-            'rounds': rounds,
-            'balances': balances
+            'rounds': self.columns['round'].tolist(),
+            'balances': self.columns['balance'].tolist()
         }
     
+    def _runs(self) -> np.ndarray:
+        """Signed run lengths of the win/loss sequence (wins > 0, losses < 0)."""
+        won = self.columns['won']
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(won)) + 1))
+        lengths = np.diff(np.append(starts, len(won)))
+        return np.where(won[starts], lengths, -lengths)
+    
     def streak_analysis(self) -> Dict:
         """
         Analyze win/loss streaks in history.
@@ -83,7 +161,7 @@ class StatisticalAnalyzer:
         Returns:
             Dictionary with streak statistics
         """
-        if not self.history:
+        if not len(self.history):
             return {
                 'current_streak': 0,
                 'max_win_streak': 0,
@@ -91,39 +169,13 @@ class StatisticalAnalyzer:
                 'streaks': []
             }
         
-        streaks = []
-        current_streak = 0
-        max_win = 0
-        max_lose = 0
-        
-        for entry in self.history:
-            won = entry.get('won', False)
-            
-            if won:
-                if current_streak > 0:
-                    current_streak += 1
-                else:
-                    if current_streak != 0:
-                        streaks.append(current_streak)
-                    current_streak = 1
-                max_win = max(max_win, current_streak)
-            else:
-                if current_streak < 0:
-                    current_streak -= 1
-                else:
-                    if current_streak != 0:
-                        streaks.append(current_streak)
-                    current_streak = -1
-                max_lose = max(max_lose, abs(current_streak))
-        
-        if current_streak != 0:
-            streaks.append(current_streak)
+        streaks = self._runs()
         
         return {
-            'current_streak': current_streak,
-            'max_win_streak': max_win,
-            'max_lose_streak': max_lose,
-            'streak_history': streaks[-20:]  # Last 20 streaks
+            'current_streak': int(streaks[-1]),
+            'max_win_streak': int(max(streaks.max(), 0)),
+            'max_lose_streak': int(max(-streaks.min(), 0)),
+            'streak_history': streaks[-20:].tolist()  # Last 20 streaks
         }
     
     def bet_analysis(self) -> Dict:
@@ -133,7 +185,7 @@ class StatisticalAnalyzer:
         Returns:
             Dictionary with bet statistics
         """
-        if not self.history:
+        if not len(self.history):
             return {
                 'total_wagered': 0,
                 'total_won': 0,
@@ -142,39 +194,34 @@ class StatisticalAnalyzer:
                 'bet_face_performance': {}
             }
         
-        total_wagered = 0
-        total_won = 0
-        face_bets = {i: {'count': 0, 'wins': 0} for i in range(1, 7)}
+        bet_amount = self.columns['bet_amount']
+        bet_face = self.columns['bet_face']
+        won = self.columns['won']
         
-        for entry in self.history:
-            bet_amount = entry.get('bet_amount', 0)
-            bet_face = entry.get('bet_face', 1)
-            won = entry.get('won', False)
-            
-            total_wagered += bet_amount
-            if won:
-                total_won += bet_amount * 6  # Payout
-            
-            if bet_face in face_bets:
-                face_bets[bet_face]['count'] += 1
-                if won:
-                    face_bets[bet_face]['wins'] += 1
+        total_wagered = bet_amount.sum().item()
+        total_won = (bet_amount[won] * 6).sum().item()  # Payout
+        
+        # Bets and wins grouped by face
+        valid = (bet_face >= 1) & (bet_face <= 6)
+        times_bet = np.bincount(bet_face[valid], minlength=7)
+        wins = np.bincount(bet_face[valid & won], minlength=7)
         
         # Calculate win rate per face bet
         face_performance = {}
-        for face, data in face_bets.items():
-            if data['count'] > 0:
+        for face in range(1, 7):
+            bets, face_wins = int(times_bet[face]), int(wins[face])
+            if bets > 0:
                 face_performance[face] = {
-                    'times_bet': data['count'],
-                    'wins': data['wins'],
-                    'win_rate': round((data['wins'] / data['count']) * 100, 2)
+                    'times_bet': bets,
+                    'wins': face_wins,
+                    'win_rate': round((face_wins / bets) * 100, 2)
                 }
         
         return {
             'total_wagered': total_wagered,
             'total_won': total_won,
             'total_lost': total_wagered - total_won,
-            'avg_bet': round(total_wagered / len(self.history), 2) if self.history else 0,
+            'avg_bet': round(total_wagered / len(bet_amount), 2),
             'bet_face_performance': face_performance
         }
     
@@ -209,13 +256,13 @@ class StatisticalAnalyzer:
             expected = [total * p for p in expected_probs]
         
         # Perform chi-square test
-        chi2, p_value = stats.chisquare(observed, expected)
+        chi2, p_value = _stats().chisquare(observed, expected)
         
         # Degrees of freedom = 6 - 1 = 5
-        critical_value = stats.chi2.ppf(0.95, 5)
+        critical_value = chi2_critical_value(0.95, 5)
         
         # Interpretation
-        is_fair = p_value > 0.05
+        is_fair = bool(p_value > 0.05)
         
         return {
             'chi_square_statistic': round(float(chi2), 4),
@@ -263,13 +310,13 @@ class StatisticalAnalyzer:
         z = (observed_prob - expected_prob) / se if se > 0 else 0
         
         # Two-tailed p-value
-        p_value = 2 * (1 - stats.norm.cdf(abs(z)))
+        p_value = 2 * (1 - _stats().norm.cdf(abs(z)))
         
         # 95% confidence interval for observed proportion
         ci_low = max(0, observed_prob - 1.96 * np.sqrt(observed_prob * (1 - observed_prob) / total_trials))
         ci_high = min(1, observed_prob + 1.96 * np.sqrt(observed_prob * (1 - observed_prob) / total_trials))
         
-        is_significant = p_value < 0.05
+        is_significant = bool(p_value < 0.05)
         
         return {
             'observed_wins': observed_wins,
@@ -0,0 +1,572 @@
+"""
+Betting strategies for the Monte Carlo engine
+"""
+
+import numpy as np
+from typing import Dict, Optional, Sequence
+
+
+# Strategy name -> class, filled in by @register
+STRATEGIES = {}
+
+# House limits: stakes are clipped at _STAKE_LIMIT and a simulation stops once
+# its balance reaches _BALANCE_LIMIT, so neither progressions nor favourable
+# runs can overflow an int64 balance (or lose whole units in a float64 one)
+_STAKE_LIMIT = 2 ** 52
+_BALANCE_LIMIT = 2 ** 62
+
+# Fibonacci numbers 1, 1, 2, 3, 5, ... far enough that a stake is always capped first
+_FIBONACCI = np.ones(80)
+for _i in range(2, len(_FIBONACCI)):
+    _FIBONACCI[_i] = _FIBONACCI[_i - 1] + _FIBONACCI[_i - 2]
+
+
+def register(name: str):
+    """Class decorator adding a strategy to STRATEGIES under name."""
+    def decorator(cls):
+        cls.name = name
+        STRATEGIES[name] = cls
+        return cls
+    return decorator
+
+
+def create_strategy(
+    name: str,
+    base_bet: float,
+    payout: float,
+    win_probability: float,
+    starting_balance: float,
+    stop_loss: Optional[float] = None,
+    take_profit: Optional[float] = None,
+    **options
+) -> 'BettingStrategy':
+    """
+    Build a registered strategy, optionally wrapped in stop-loss/take-profit limits.
+    
+    Args:
+        name: Registered strategy name
+        base_bet: Base bet amount
+        payout: Payout multiplier of a winning bet
+        win_probability: Probability that a bet wins
+        starting_balance: Balance the limits are measured from
+        stop_loss: Stop once this much has been lost (None = no limit)
+        take_profit: Stop once this much has been won (None = no limit)
+        **options: Strategy-specific options (e.g. fraction, step, line)
+        
+    Returns:
+        BettingStrategy instance
+    """
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown betting strategy '{name}'; choose one of: {', '.join(STRATEGIES)}")
+    try:
+        strategy = STRATEGIES[name](base_bet, payout, win_probability, **options)
+    except TypeError:
+        raise ValueError(f"Invalid options for the {name} strategy: {', '.join(options) or 'none'}")
+    
+    if stop_loss is not None or take_profit is not None:
+        strategy = StopLossTakeProfit(strategy, starting_balance, stop_loss, take_profit)
+    return strategy
+
+
+def _positive(value, what: str):
+    """Return value if it is a positive number, or raise ValueError."""
+    if not isinstance(value, (int, float)) or isinstance(value, bool) or not value > 0:
+        raise ValueError(f'{what} must be a positive number')
+    return value
+
+
+def _is_integral(value) -> bool:
+    """Whether a stake parameter keeps integer balances integral."""
+    return isinstance(value, (int, np.integer)) and not isinstance(value, bool)
+
+
+def _floored_walk(start: int, increments: np.ndarray) -> np.ndarray:
+    """
+    Levels of a walk floored at zero: level[t] = max(level[t - 1] + increments[t], 0).
+    
+    Args:
+        start: Level before the first increment
+        increments: Change of each step
+        
+    Returns:
+        Level after each step
+    """
+    totals = np.cumsum(increments)
+    return totals + np.maximum(start, -np.minimum.accumulate(totals))
+
+
+class BettingStrategy:
+    """
+    A betting strategy evaluated on arrays of simulations at once.
+    
+    Each simulation's state is a row of the arrays described by STATE
+    (field -> (dtype, initial value); a dtype of None means the balance
+    dtype), so the engine can play any number of simulations in lockstep
+    and drop finished ones by indexing every field. Every round the engine
+    asks bet() for each simulation's stake, resolves the outcomes and hands
+    them to update() with the new balances. A stake of zero stops the
+    simulation.
+    
+    A single simulation is played faster when the strategy can resolve a
+    whole block of rounds in one vectorized pass (see path()).
+    """
+    
+    name = None
+    
+    # Field -> (dtype, initial value) of the per-simulation state
+    STATE = {}
+    
+    def __init__(self, base_bet: float, payout: float, win_probability: float):
+        """
+        Initialize the strategy.
+        
+        Args:
+            base_bet: Base bet amount
+            payout: Payout multiplier of a winning bet
+            win_probability: Probability that a bet wins
+        """
+        self.base_bet = base_bet
+        self.payout = payout
+        self.win_probability = win_probability
+        # Whether stakes stay whole for a whole base bet and balance
+        self.integral = True
+    
+    def initial_state(self, n: int, dtype) -> Dict[str, np.ndarray]:
+        """
+        State arrays of n fresh simulations.
+        
+        Args:
+            n: Number of simulations
+            dtype: Balance dtype
+            
+        Returns:
+            Dictionary of arrays whose first axis is the simulation
+        """
+        return {
+            field: np.full(n, value, dtype=dtype if field_dtype is None else field_dtype)
+            for field, (field_dtype, value) in self.STATE.items()
+        }
+    
+    def bet(self, state: Dict[str, np.ndarray], balance: np.ndarray) -> np.ndarray:
+        """
+        Stake of the next round of every simulation, capped at its balance.
+        
+        Args:
+            state: State arrays
+            balance: Current balance of each simulation
+            
+        Returns:
+            Array of stakes in the balance dtype
+        """
+        raise NotImplementedError
+    
+    def update(self, state: Dict[str, np.ndarray], won: np.ndarray, balance: np.ndarray):
+        """
+        Advance the state in place after a round.
+        
+        Args:
+            state: State arrays
+            won: Whether each simulation's bet won
+            balance: Balance of each simulation after the round
+        """
+    
+    def active(self, balance: np.ndarray) -> np.ndarray:
+        """Whether a simulation at this balance keeps betting (before its stake is known)."""
+        return (balance > 0) & (balance < _BALANCE_LIMIT)
+    
+    def stakes(self, state: Dict[str, np.ndarray], won: np.ndarray) -> Optional[tuple]:
+        """
+        Uncapped stakes of one simulation over a block of rounds, if they
+        follow from the state and the outcomes alone.
+        
+        Args:
+            state: State arrays of one simulation
+            won: Whether each round of the block wins
+            
+        Returns:
+            Tuple of (float64 stake of each round, state arrays after each
+            round), or None when the stakes depend on the balance
+        """
+        return None
+    
+    def path(self, state: Dict[str, np.ndarray], won: np.ndarray, balance: np.ndarray) -> Optional[tuple]:
+        """
+        Play one simulation over a block of rounds in a single vectorized pass.
+        
+        With stakes() the balance path is a cumulative sum, exact up to the
+        first round whose stake the balance cannot cover (or at which the
+        simulation stops); the engine plays that round through bet() and
+        update() and asks again.
+        
+        Args:
+            state: State arrays of one simulation
+            won: Whether each round of the block wins
+            balance: Balance before the block, as a length-1 array
+            
+        Returns:
+            Tuple of (balances after each round played, state), or None
+            when the strategy has no vectorized form
+        """
+        sequence = self.stakes(state, won)
+        if sequence is None:
+            return None
+        stakes, states = sequence
+        
+        stakes = np.minimum(stakes, _STAKE_LIMIT).astype(balance.dtype)
+        steps = np.where(won, stakes * (self.payout - 1), -stakes)
+        # Prepend the balance so the float cumsum matches sequential addition
+        balances = np.cumsum(np.concatenate((balance, steps)))
+        before = balances[:-1]
+        playable = (before >= stakes) & (stakes > 0) & self.active(before)
+        played = len(won) if playable.all() else int(playable.argmin())
+        
+        if played:
+            state = {
+                field: np.asarray(values[played - 1:played], dtype=state[field].dtype)
+                for field, values in states.items()
+            }
+        return balances[1:played + 1], state
+    
+    def _cap(self, stakes: np.ndarray, balance: np.ndarray) -> np.ndarray:
+        """Cap stakes at the balance and the house limits, in the balance dtype."""
+        stakes = np.minimum(np.minimum(stakes, _STAKE_LIMIT), balance)
+        return np.where(balance < _BALANCE_LIMIT, stakes, 0).astype(balance.dtype, copy=False)
+
+
+@register('fixed')
+class FixedBet(BettingStrategy):
+    """Bet the base amount every round."""
+    
+    def bet(self, state, balance):
+        return self._cap(np.full(len(balance), self.base_bet), balance)
+    
+    def stakes(self, state, won):
+        return np.full(len(won), float(self.base_bet)), {}
+
+
+@register('martingale')
+class Martingale(BettingStrategy):
+    """Double the stake after a loss and return to the base bet after a win."""
+    
+    # Previous stake, and whether the next stake goes back to the base bet
+    STATE = {'stake': (None, 0), 'reset': (bool, True)}
+    
+    # Outcome that sends the progression back to the base bet
+    RESET_ON_WIN = True
+    
+    def bet(self, state, balance):
+        stake = self._cap(np.where(state['reset'], self.base_bet, state['stake'] * 2), balance)
+        state['stake'] = stake
+        return stake
+    
+    def update(self, state, won, balance):
+        state['reset'] = won if self.RESET_ON_WIN else ~won
+    
+    def stakes(self, state, won):
+        resets = won if self.RESET_ON_WIN else ~won
+        first = self.base_bet if state['reset'][0] else state['stake'][0] * 2
+        
+        # Rounds since the last reset (since the block start if none)
+        index = np.arange(len(won))
+        last_reset = np.maximum.accumulate(np.where(resets, index, -1))
+        previous = np.concatenate(([-1], last_reset[:-1]))
+        doublings = np.minimum(index - previous - 1, 64)
+        
+        stakes = np.ldexp(np.where(previous >= 0, self.base_bet, first).astype(np.float64), doublings)
+        # Clipped here too, so the stake carried in the state fits the balance dtype
+        stakes = np.minimum(stakes, _STAKE_LIMIT)
+        return stakes, {'stake': stakes, 'reset': resets}
+
+
+@register('anti_martingale')
+class AntiMartingale(Martingale):
+    """Double the stake after a win and return to the base bet after a loss."""
+    
+    RESET_ON_WIN = False
+
+
+@register('kelly')
+class Kelly(BettingStrategy):
+    """
+    Bet the Kelly fraction of the balance: f = (bp - q) / b.
+    
+    b = payout - 1, p = win probability of the bet, q = 1 - p
+    """
+    
+    def __init__(self, base_bet, payout, win_probability, fraction: float = 1):
+        """
+        Initialize the strategy.
+        
+        Args:
+            base_bet: Base bet amount (unused)
+            payout: Payout multiplier of a winning bet
+            win_probability: Probability that a bet wins
+            fraction: Multiple of the full Kelly fraction to bet
+        """
+        super().__init__(base_bet, payout, win_probability)
+        b = payout - 1
+        p = win_probability
+        self.fraction = min(max(0, (b * p - (1 - p)) / b) * _positive(fraction, 'Kelly fraction'), 1)
+        self.integral = False
+    
+    def bet(self, state, balance):
+        return self._cap(balance * self.fraction, balance)
+    
+    def path(self, state, won, balance):
+        # Every round scales the balance, so the path is a cumulative product, or a
+        # cumulative sum while the stake is clipped at the stake limit
+        if self.fraction >= 1:
+            return None
+        if not (self.fraction > 0 and self.active(balance)[0]):
+            return balance[:0], state
+        
+        # Prepend the balance so the path rounds the same however the rounds are split;
+        # past the balance limit it may overflow, but those rounds are never played
+        clipped = balance[0] * self.fraction > _STAKE_LIMIT
+        with np.errstate(over='ignore'):
+            if clipped:
+                steps = np.where(won, _STAKE_LIMIT * (self.payout - 1), -_STAKE_LIMIT)
+                balances = np.cumsum(np.concatenate((balance, steps)))
+            else:
+                factors = np.where(won, 1 + self.fraction * (self.payout - 1), 1 - self.fraction)
+                balances = np.cumprod(np.concatenate((balance, factors)))
+        before = balances[:-1]
+        playable = ((before * self.fraction > _STAKE_LIMIT) == clipped) & self.active(before)
+        played = len(won) if playable.all() else int(playable.argmin())
+        return balances[1:played + 1], state
+
+
+@register('fractional_kelly')
+class FractionalKelly(Kelly):
+    """Bet a fraction (half by default) of the Kelly stake, trading growth for lower variance."""
+    
+    def __init__(self, base_bet, payout, win_probability, fraction: float = 0.5):
+        super().__init__(base_bet, payout, win_probability, fraction)
+
+
+@register('dalembert')
+class DAlembert(BettingStrategy):
+    """Raise the stake by one step after a loss and lower it by one after a win, never below the base bet."""
+    
+    # Steps above the base bet
+    STATE = {'level': (np.int64, 0)}
+    
+    def __init__(self, base_bet, payout, win_probability, step: Optional[float] = None):
+        """
+        Initialize the strategy.
+        
+        Args:
+            base_bet: Base bet amount
+            payout: Payout multiplier of a winning bet
+            win_probability: Probability that a bet wins
+            step: Stake change per round (None = the base bet)
+        """
+        super().__init__(base_bet, payout, win_probability)
+        self.step = base_bet if step is None else _positive(step, "D'Alembert step")
+        self.integral = _is_integral(self.step)
+    
+    def bet(self, state, balance):
+        return self._cap(self.base_bet + self.step * state['level'], balance)
+    
+    def update(self, state, won, balance):
+        state['level'] = np.maximum(state['level'] + np.where(won, -1, 1), 0)
+    
+    def stakes(self, state, won):
+        start = state['level'][0]
+        levels = _floored_walk(start, np.where(won, -1, 1))
+        before = np.concatenate(([start], levels[:-1]))
+        return self.base_bet + self.step * before.astype(np.float64), {'level': levels}
+
+
+@register('fibonacci')
+class Fibonacci(BettingStrategy):
+    """Step one Fibonacci number up after a loss and two down after a win."""
+    
+    # Position in the Fibonacci sequence 1, 1, 2, 3, 5, ...
+    STATE = {'index': (np.int64, 0)}
+    
+    def _stake(self, index: np.ndarray) -> np.ndarray:
+        return self.base_bet * _FIBONACCI[np.minimum(index, len(_FIBONACCI) - 1)]
+    
+    def bet(self, state, balance):
+        return self._cap(self._stake(state['index']), balance)
+    
+    def update(self, state, won, balance):
+        state['index'] = np.maximum(state['index'] + np.where(won, -2, 1), 0)
+    
+    def stakes(self, state, won):
+        start = state['index'][0]
+        indices = _floored_walk(start, np.where(won, -2, 1))
+        return self._stake(np.concatenate(([start], indices[:-1]))), {'index': indices}
+
+
+@register('labouchere')
+class Labouchere(BettingStrategy):
+    """
+    Cancellation system: bet the sum of the first and last numbers of a line.
+    
+    A win crosses both numbers off, a loss appends the amount lost; once the
+    line is empty the player has won the line's total and starts it afresh.
+    Numbers are in units of the base bet.
+    """
+    
+    def __init__(self, base_bet, payout, win_probability, line: Sequence[float] = (1, 2, 3, 4)):
+        """
+        Initialize the strategy.
+        
+        Args:
+            base_bet: Base bet amount (one unit)
+            payout: Payout multiplier of a winning bet
+            win_probability: Probability that a bet wins
+            line: Starting line in units
+        """
+        super().__init__(base_bet, payout, win_probability)
+        if not isinstance(line, (list, tuple)) or not line:
+            raise ValueError('Labouchère line must be a non-empty list of positive numbers')
+        self.line = [_positive(units, 'Labouchère line numbers') for units in line]
+        self.integral = all(_is_integral(units) for units in self.line)
+        # Largest bet in units; losses append at most this, so the line stays bounded
+        self.max_units = _STAKE_LIMIT // base_bet
+    
+    def initial_state(self, n, dtype):
+        # Each row holds the line in columns [head, tail); widened as losses append to it
+        line = np.zeros((n, 2 * len(self.line)))
+        line[:, :len(self.line)] = self.line
+        return {
+            'line': line,
+            'head': np.zeros(n, dtype=np.int64),
+            'tail': np.full(n, len(self.line), dtype=np.int64),
+            'units': np.zeros(n)
+        }
+    
+    def bet(self, state, balance):
+        rows = np.arange(len(balance))
+        head, tail = state['head'], state['tail']
+        first = state['line'][rows, head]
+        units = np.where(tail - head > 1, first + state['line'][rows, tail - 1], first)
+        units = np.minimum(units, self.max_units)
+        state['units'] = units
+        return self._cap(units * self.base_bet, balance)
+    
+    def update(self, state, won, balance):
+        head, tail = state['head'], state['tail']
+        # A win crosses off the first number and the last, if there is another
+        several = tail - head > 1
+        head += won
+        tail -= won & several
+        
+        lost = np.flatnonzero(~won)
+        if len(lost):
+            if (tail[lost] >= state['line'].shape[1]).any():
+                self._widen(state)
+                head, tail = state['head'], state['tail']
+            state['line'][lost, tail[lost]] = state['units'][lost]
+            tail[lost] += 1
+        
+        done = np.flatnonzero(head >= tail)
+        if len(done):
+            state['line'][done, :len(self.line)] = self.line
+            head[done] = 0
+            tail[done] = len(self.line)
+    
+    @staticmethod
+    def _widen(state: Dict[str, np.ndarray]):
+        """Shift every line to column 0 and double the capacity."""
+        line, head = state['line'], state['head']
+        rows, capacity = line.shape
+        columns = np.minimum(head[:, None] + np.arange(capacity), capacity - 1)
+        widened = np.zeros((rows, 2 * capacity))
+        widened[:, :capacity] = np.take_along_axis(line, columns, axis=1)
+        state['line'] = widened
+        state['tail'] = state['tail'] - head
+        state['head'] = np.zeros_like(head)
+    
+    def path(self, state, won, balance):
+        # The line has no closed form, so a single simulation is played in plain Python
+        line = state['line'][0, state['head'][0]:state['tail'][0]].tolist()
+        if self.integral:
+            line = [int(units) for units in line]
+        start = 0
+        value = balance[0].item()
+        units = state['units'][0].item()
+        balances = []
+        
+        for round_won in won.tolist():
+            if not 0 < value < _BALANCE_LIMIT:
+                break
+            units = min(line[start] + line[-1] if len(line) - start > 1 else line[start], self.max_units)
+            stake = min(units * self.base_bet, value)
+            if round_won:
+                value += stake * (self.payout - 1)
+                if len(line) - start > 1:
+                    line.pop()
+                start += 1
+                if start == len(line):
+                    line, start = list(self.line), 0
+            else:
+                value -= stake
+                line.append(units)
+            balances.append(value)
+        
+        line = line[start:]
+        new_state = self.initial_state(1, balance.dtype)
+        if len(line) > new_state['line'].shape[1]:
+            new_state['line'] = np.zeros((1, 2 * len(line)))
+        new_state['line'][0, :len(line)] = line
+        new_state['tail'][0] = len(line)
+        new_state['units'][0] = units
+        return np.array(balances, dtype=balance.dtype), new_state
+
+
+class StopLossTakeProfit(BettingStrategy):
+    """Stop a strategy once the balance has fallen or risen by a set amount."""
+    
+    def __init__(
+        self,
+        strategy: BettingStrategy,
+        starting_balance: float,
+        stop_loss: Optional[float] = None,
+        take_profit: Optional[float] = None
+    ):
+        """
+        Wrap a strategy.
+        
+        Args:
+            strategy: Strategy whose stakes are used inside the limits
+            starting_balance: Balance the limits are measured from
+            stop_loss: Stop at or below starting_balance - stop_loss (None = no limit)
+            take_profit: Stop at or above starting_balance + take_profit (None = no limit)
+        """
+        super().__init__(strategy.base_bet, strategy.payout, strategy.win_probability)
+        self.strategy = strategy
+        self.name = strategy.name
+        self.integral = strategy.integral
+        self.floor = -np.inf if stop_loss is None else starting_balance - _positive(stop_loss, 'Stop loss')
+        self.ceiling = np.inf if take_profit is None else starting_balance + _positive(take_profit, 'Take profit')
+    
+    def initial_state(self, n, dtype):
+        return self.strategy.initial_state(n, dtype)
+    
+    def bet(self, state, balance):
+        stake = self.strategy.bet(state, balance)
+        return np.where(self.active(balance), stake, 0).astype(balance.dtype, copy=False)
+    
+    def update(self, state, won, balance):
+        self.strategy.update(state, won, balance)
+    
+    def active(self, balance):
+        return self.strategy.active(balance) & (balance > self.floor) & (balance < self.ceiling)
+    
+    def path(self, state, won, balance):
+        if not self.active(balance)[0]:
+            return balance[:0], state
+        played = self.strategy.path(state, won, balance)
+        if played is None:
+            return None
+        
+        balances, new_state = played
+        outside = ~self.active(balances)
+        if outside.any():
+            # Replay up to the round that crossed a limit for the state at that point
+            balances, new_state = self.strategy.path(state, won[:int(outside.argmax()) + 1], balance)
+        return balances, new_state
@@ -0,0 +1,52 @@
+"""
+Start-up warm-up of shared, read-only state
+"""
+
+import time
+from typing import Dict
+from app.config import Config
+
+
+def warm_up(app, shared_tables: bool = True) -> Dict[str, float]:
+    """
+    Build shared state once, before the application serves requests.
+    
+    Under ``gunicorn --preload`` (see gunicorn.conf.py) the application is
+    created in the master process, so everything built here is inherited
+    copy-on-write by every worker instead of being rebuilt in each worker
+    on its first request. Per-process state (connections, job threads and
+    entropy-seeded dice streams) is reset in each child after the fork.
+    
+    Args:
+        app: Flask application
+        shared_tables: Also build the dice samplers and load scipy with its
+                       critical values (the presets are always warmed)
+                       
+    Returns:
+        Seconds spent per step
+    """
+    timings = {}
+    
+    if shared_tables:
+        # Alias tables and moments of the fair dice and every preset's dice
+        start = time.perf_counter()
+        from app.models.dice import get_dice
+        get_dice()
+        for _, data in Config.RESULT_CACHE_PRESETS:
+            if data.get('probabilities') is not None:
+                get_dice(data['probabilities'])
+        timings['dice'] = time.perf_counter() - start
+        
+        # scipy is otherwise imported by the first hypothesis test
+        start = time.perf_counter()
+        from app.services.statistics import chi2_critical_value
+        chi2_critical_value(0.95, 5)
+        timings['scipy'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    from app.routes.simulation import warm_result_cache
+    with app.app_context():
+        warm_result_cache()
+    timings['presets'] = time.perf_counter() - start
+    
+    return timings
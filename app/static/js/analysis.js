@@ -257,10 +257,11 @@ async function runChiSquareTest() {
     }
 }
 
-// Run comparison simulation
+// Run paired comparison simulation
 async function runComparison() {
     const resultsDiv = document.getElementById('comparisonResults');
     const trials = parseInt(document.getElementById('comparisonTrials').value);
+    const replications = parseInt(document.getElementById('comparisonReplications').value);
     
     resultsDiv.innerHTML = `
         <div class="text-center py-4">
@@ -270,39 +271,28 @@ async function runComparison() {
     `;
     
     try {
-        // Run fair simulation
-        const fairResponse = await fetch('/simulation/run', {
+        // Both modes are simulated server-side from common random numbers
+        const response = await fetch('/simulation/compare', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({
                 num_trials: trials,
+                replications: replications,
                 starting_balance: 1000,
                 bet_amount: 10,
                 bet_strategy: 'fixed',
-                game_mode: 'fair',
-                target_face: 1
-            })
-        });
-        const fairData = await fairResponse.json();
-        
-        // Run tweaked simulation (biased against player)
-        const tweakedResponse = await fetch('/simulation/run', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                num_trials: trials,
-                starting_balance: 1000,
-                bet_amount: 10,
-                bet_strategy: 'fixed',
-                game_mode: 'tweaked',
                 probabilities: [0.10, 0.18, 0.18, 0.18, 0.18, 0.18], // Face 1 has 10% (player bets on 1)
                 target_face: 1
             })
         });
-        const tweakedData = await tweakedResponse.json();
+        const data = await response.json();
         
-        // Display comparison
-        displayComparison(fairData, tweakedData);
+        if (!response.ok) {
+            resultsDiv.innerHTML = `<p class="text-danger">${data.error || 'Error running comparison'}</p>`;
+            return;
+        }
+        
+        displayComparison(data);
         
     } catch (error) {
         console.error('Comparison error:', error);
@@ -310,19 +300,14 @@ async function runComparison() {
     }
 }
 
-function displayComparison(fairData, tweakedData) {
-    const fair = fairData.summary;
-    const tweaked = tweakedData.summary;
+function displayComparison(data) {
+    const formatInterval = (ci, prefix, suffix) => 
+        `${prefix}${ci[0].toFixed(2)}${suffix} to ${prefix}${ci[1].toFixed(2)}${suffix}`;
     
-    const metrics = [
-        { label: 'Win Rate', fair: fair.win_rate + '%', tweaked: tweaked.win_rate + '%', 
-          diff: (fair.win_rate - tweaked.win_rate).toFixed(2) + '%' },
-        { label: 'Final Profit', fair: '$' + fair.profit.toFixed(2), tweaked: '$' + tweaked.profit.toFixed(2),
-          diff: '$' + (fair.profit - tweaked.profit).toFixed(2) },
-        { label: 'Final Balance', fair: '$' + fair.final_balance.toFixed(2), tweaked: '$' + tweaked.final_balance.toFixed(2),
-          diff: '$' + (fair.final_balance - tweaked.final_balance).toFixed(2) },
-        { label: 'Bankrupt', fair: fair.went_bankrupt ? 'Yes' : 'No', tweaked: tweaked.went_bankrupt ? 'Yes' : 'No',
-          diff: '-' }
+    const rows = [
+        { label: 'Mean Profit', key: 'profit', prefix: '$', suffix: '' },
+        { label: 'Win Rate', key: 'win_rate', prefix: '', suffix: '%' },
+        { label: 'Ruin Probability', key: 'ruin_probability', prefix: '', suffix: '%' }
     ];
     
     let html = `
@@ -332,27 +317,37 @@ function displayComparison(fairData, tweakedData) {
                     <th>Metric</th>
                     <th class="text-center">Fair</th>
                     <th class="text-center">Tweaked</th>
-                    <th class="text-center">Δ Difference</th>
+                    <th class="text-center">Δ Difference (95% CI)</th>
                 </tr>
             </thead>
             <tbody>
     `;
     
-    metrics.forEach(m => {
+    rows.forEach(row => {
+        const m = data.metrics[row.key];
+        const diffClass = m.significant ? 'text-teal' : 'text-muted';
         html += `
             <tr>
-                <td>${m.label}</td>
-                <td class="text-center">${m.fair}</td>
-                <td class="text-center">${m.tweaked}</td>
-                <td class="text-center text-teal">${m.diff}</td>
+                <td>${row.label}</td>
+                <td class="text-center">${row.prefix}${m.baseline.mean.toFixed(2)}${row.suffix}</td>
+                <td class="text-center">${row.prefix}${m.variant.mean.toFixed(2)}${row.suffix}</td>
+                <td class="text-center ${diffClass}">
+                    ${row.prefix}${m.mean_difference.toFixed(2)}${row.suffix}
+                    <div class="small">${formatInterval(m.confidence_interval, row.prefix, row.suffix)}</div>
+                </td>
             </tr>
         `;
     });
     
+    const reduction = data.metrics.win_rate.variance_reduction;
     html += `
             </tbody>
         </table>
         <p class="small text-muted mt-3 mb-0">
+            ${data.conclusion}
+            ${reduction ? `Pairing made the win-rate difference ${reduction}× less variable than two independent runs.` : ''}
+        </p>
+        <p class="small text-muted mt-2 mb-0">
             <strong>Note:</strong> Tweaked game has Face 1 at 10% probability (vs 16.67% fair),
             demonstrating how a slight bias significantly impacts player outcomes.
         </p>
@@ -5,13 +5,19 @@
 let simState = {
     probabilities: [16.67, 16.67, 16.67, 16.67, 16.67, 16.67],
     gameMode: 'fair',
-    isRunning: false
+    isRunning: false,
+    controller: null
 };
 
 document.addEventListener('DOMContentLoaded', function() {
     initializeSimulation();
 });
 
+// Leaving the page cancels any simulation still streaming
+window.addEventListener('pagehide', function() {
+    if (simState.controller) simState.controller.abort();
+});
+
 function initializeSimulation() {
     document.querySelectorAll('input[name="simGameMode"]').forEach(radio => {
         radio.addEventListener('change', handleSimModeChange);
@@ -83,7 +89,11 @@ function updateStrategyDescription() {
         'fixed': 'Bet the same amount every round.',
         'martingale': 'Double your bet after each loss, reset after win. High risk!',
         'anti_martingale': 'Double your bet after each win, reset after loss.',
-        'kelly': 'Bet a fraction of bankroll based on edge. Mathematically optimal.'
+        'kelly': 'Bet a fraction of bankroll based on edge. Mathematically optimal.',
+        'fractional_kelly': 'Bet half the Kelly fraction. Slower growth, much smaller swings.',
+        'dalembert': 'Raise your bet by one unit after a loss, lower it by one after a win.',
+        'fibonacci': 'Move one step up the Fibonacci sequence after a loss, two steps down after a win.',
+        'labouchere': 'Bet the sum of the ends of the line 1-2-3-4; wins cross them off, losses add to it.'
     };
     document.getElementById('strategyDescription').textContent = descriptions[strategy];
 }
@@ -112,6 +122,62 @@ function updateTheoreticalValues() {
     document.getElementById('theoreticalHouseEdge').textContent = houseEdge.toFixed(2) + '%';
 }
 
+async function streamSimulation(url, params, onProgress) {
+    // POST the request and read server-sent events until the final result.
+    // Aborting simState.controller closes the stream and cancels the work server-side.
+    simState.controller = new AbortController();
+    const response = await fetch(url, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(params),
+        signal: simState.controller.signal
+    });
+    
+    if (!response.ok) {
+        const data = await response.json();
+        throw new Error(data.error || 'Simulation failed');
+    }
+    
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const block = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            
+            let event = 'message';
+            let data = '';
+            block.split('\n').forEach(line => {
+                if (line.startsWith('event: ')) event = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            });
+            
+            const payload = JSON.parse(data);
+            if (event === 'progress') {
+                onProgress(payload);
+            } else if (event === 'error') {
+                throw new Error(payload.error);
+            } else if (event === 'result') {
+                return payload;
+            }
+        }
+    }
+    throw new Error('Simulation stream ended early');
+}
+
+function showProgress(percent, text) {
+    document.getElementById('simProgress').style.display = 'flex';
+    document.getElementById('simProgressBar').style.width = percent + '%';
+    document.getElementById('simProgressText').textContent = text;
+}
+
 async function runSimulation() {
     if (simState.isRunning) return;
     
@@ -119,24 +185,21 @@ async function runSimulation() {
     showLoading(true);
     
     const params = getSimulationParams();
+    params.trajectory = 'envelope';
     
     try {
-        const response = await fetch('/simulation/run', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify(params)
+        const data = await streamSimulation('/simulation/run/stream', params, progress => {
+            const summary = progress.summary;
+            showProgress(progress.progress,
+                `Round ${progress.rounds_played.toLocaleString()} of ${params.num_trials.toLocaleString()}` +
+                ` · Balance $${summary.balance.toFixed(2)} · Win rate ${summary.win_rate}%`);
         });
-        
-        const data = await response.json();
-        
-        if (response.ok) {
-            displaySingleSimResults(data);
-        } else {
-            showError(data.error || 'Simulation failed');
-        }
+        displaySingleSimResults(data);
     } catch (error) {
-        console.error('Simulation error:', error);
-        showError('Failed to run simulation');
+        if (error.name !== 'AbortError') {
+            console.error('Simulation error:', error);
+            showError(error.message || 'Failed to run simulation');
+        }
     }
     
     simState.isRunning = false;
@@ -154,22 +217,19 @@ async function runBatchSimulation() {
     params.trials_per_sim = Math.min(params.num_trials, 1000);
     
     try {
-        const response = await fetch('/simulation/batch', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify(params)
+        const data = await streamSimulation('/simulation/batch/stream', params, progress => {
+            const stats = progress.statistics;
+            const ci = stats.ruin_confidence_interval;
+            showProgress(progress.progress,
+                `${progress.completed} of ${params.num_simulations} simulations` +
+                ` · Ruin ${stats.ruin_probability}% (95% CI ${ci[0]}–${ci[1]}%)`);
         });
-        
-        const data = await response.json();
-        
-        if (response.ok) {
-            displayBatchResults(data);
-        } else {
-            showError(data.error || 'Batch simulation failed');
-        }
+        displayBatchResults(data);
     } catch (error) {
-        console.error('Batch simulation error:', error);
-        showError('Failed to run batch simulation');
+        if (error.name !== 'AbortError') {
+            console.error('Batch simulation error:', error);
+            showError(error.message || 'Failed to run batch simulation');
+        }
     }
     
     simState.isRunning = false;
@@ -187,7 +247,8 @@ async function runConvergenceAnalysis() {
         max_trials: parseInt(document.getElementById('numTrials').value),
         game_mode: simState.gameMode,
         probabilities: simState.gameMode === 'tweaked' ? simState.probabilities.map(p => p / 100) : null,
-        target_face: parseInt(targetFace)
+        target_face: parseInt(targetFace),
+        seed: getSimulationSeed()
     };
     
     try {
@@ -219,16 +280,27 @@ function getSimulationParams() {
         starting_balance: parseFloat(document.getElementById('startingBalance').value),
         bet_amount: parseFloat(document.getElementById('simBetAmount').value),
         bet_strategy: document.getElementById('betStrategy').value,
+        stop_loss: parseFloat(document.getElementById('simStopLoss').value) || null,
+        take_profit: parseFloat(document.getElementById('simTakeProfit').value) || null,
         game_mode: simState.gameMode,
         probabilities: simState.gameMode === 'tweaked' ? simState.probabilities.map(p => p / 100) : null,
-        target_face: document.getElementById('targetFace').value ? parseInt(document.getElementById('targetFace').value) : null
+        target_face: document.getElementById('targetFace').value ? parseInt(document.getElementById('targetFace').value) : null,
+        seed: getSimulationSeed()
     };
 }
 
+// Seed from the form, or null for fresh randomness (only seeded results are cached)
+function getSimulationSeed() {
+    const seed = parseInt(document.getElementById('simSeed').value);
+    return Number.isInteger(seed) && seed >= 0 ? seed : null;
+}
+
 function showLoading(show) {
     document.getElementById('simLoading').style.display = show ? 'block' : 'none';
     if (show) {
         document.getElementById('simResults').innerHTML = '';
+        document.getElementById('simProgress').style.display = 'none';
+        document.getElementById('simProgressText').textContent = 'Running simulation...';
     }
 }
 
@@ -309,13 +381,42 @@ function displaySingleSimResults(data) {
     
     document.getElementById('simResults').innerHTML = html;
     
-    Plotly.newPlot('balanceChart', [{
+    // An envelope run carries the min/max band of every bucket of rounds
+    const envelope = data.balance_envelope;
+    const rounds = envelope
+        ? envelope.last.map((_, i) => envelope.start + i * envelope.step)
+        : data.balance_trajectory.map((_, i) => i);
+    const balanceTraces = [{
+        x: rounds,
         y: data.balance_trajectory,
         type: 'scatter',
         mode: 'lines',
         name: 'Balance',
         line: { color: '#4fc3c3', width: 2 }
-    }], {
+    }];
+    if (envelope) {
+        balanceTraces.unshift({
+            x: rounds,
+            y: envelope.min,
+            type: 'scatter',
+            mode: 'lines',
+            name: 'Low',
+            line: { width: 0 },
+            showlegend: false
+        }, {
+            x: rounds,
+            y: envelope.max,
+            type: 'scatter',
+            mode: 'lines',
+            name: 'Range',
+            fill: 'tonexty',
+            fillcolor: 'rgba(79, 195, 195, 0.2)',
+            line: { width: 0 },
+            showlegend: false
+        });
+    }
+    
+    Plotly.newPlot('balanceChart', balanceTraces, {
         paper_bgcolor: 'rgba(0,0,0,0)',
         plot_bgcolor: 'rgba(0,0,0,0)',
         font: { color: '#fff' },
@@ -324,7 +425,7 @@ function displaySingleSimResults(data) {
         yaxis: { title: 'Balance ($)', gridcolor: 'rgba(255,255,255,0.1)' },
         shapes: [{
             type: 'line',
-            x0: 0, x1: data.balance_trajectory.length,
+            x0: 0, x1: rounds[rounds.length - 1],
             y0: data.parameters.starting_balance, y1: data.parameters.starting_balance,
             line: { color: 'rgba(255,255,255,0.3)', dash: 'dash', width: 1 }
         }]
@@ -0,0 +1,5 @@
+"""
+Performance benchmarks for RollQuest's simulation and analysis hot paths
+
+Run with ``python -m benchmarks``; see ``python -m benchmarks --help``.
+"""
@@ -0,0 +1,131 @@
+"""
+Command-line runner for the benchmark suite
+
+Examples:
+    python -m benchmarks --quick --output bench.json
+    python -m benchmarks --baseline benchmarks/baseline.json --tolerance 0.25
+    python -m benchmarks --filter monte_carlo --save-baseline benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+
+def isolate_stores():
+    """Point every SQLite store at a throwaway directory and disable result caching."""
+    directory = tempfile.mkdtemp(prefix='rollquest-bench-')
+    for name, filename in (
+        ('SESSION_STORE_PATH', 'sessions.sqlite3'),
+        ('RESULT_CACHE_PATH', 'results.sqlite3'),
+        ('JOB_STORE_PATH', 'jobs.sqlite3'),
+        ('METRICS_STORE_PATH', 'metrics.sqlite3')
+    ):
+        os.environ.setdefault(name, os.path.join(directory, filename))
+    os.environ.setdefault('RESULT_CACHE_ENABLED', '0')
+    os.environ.setdefault('RESULT_CACHE_WARM', '0')
+
+
+def environment() -> Dict:
+    """Versions and host details recorded next to the results."""
+    import numpy
+    import scipy
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'numpy': numpy.__version__,
+        'scipy': scipy.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[Dict]:
+    """
+    Compare median latencies against a baseline run.
+    
+    Args:
+        results: Current results keyed by benchmark name
+        baseline: Baseline results keyed by benchmark name
+        tolerance: Allowed relative slowdown (0.25 = 25% slower)
+        
+    Returns:
+        One comparison row per benchmark present in both runs
+    """
+    rows = []
+    for name, current in results.items():
+        if name not in baseline:
+            continue
+        ratio = current['median_s'] / baseline[name]['median_s']
+        rows.append({
+            'name': name,
+            'baseline_s': baseline[name]['median_s'],
+            'current_s': current['median_s'],
+            'ratio': ratio,
+            'regressed': ratio > 1 + tolerance
+        })
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__.split('\n')[1])
+    parser.add_argument('--filter', help='only run benchmarks whose name contains this text')
+    parser.add_argument('--quick', action='store_true', help='skip the largest sizes')
+    parser.add_argument('--repeat', type=int, default=5, help='minimum timed calls per benchmark')
+    parser.add_argument('--min-time', type=float, default=0.2, help='minimum timed seconds per benchmark')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--baseline', help='compare against results previously written with --output')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed relative slowdown of a median before it counts as a regression')
+    parser.add_argument('--save-baseline', help='also write the results to this baseline file')
+    parser.add_argument('--list', action='store_true', help='list the selected benchmarks and exit')
+    args = parser.parse_args(argv)
+    
+    isolate_stores()
+    from benchmarks.suite import select
+    
+    cases = select(args.filter, args.quick)
+    if args.list:
+        for case in cases:
+            print(case.name)
+        return 0
+    
+    results = {}
+    for case in cases:
+        result = case.measure(args.repeat, args.min_time)
+        results[case.name] = result
+        print(f"{case.name:<52} {result['median_s'] * 1000:>10.3f} ms  "
+              f"{result['throughput']:>14,.0f} units/s", flush=True)
+    
+    report = {'environment': environment(), 'results': results}
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+    
+    if not args.baseline:
+        return 0
+    
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    rows = compare(results, baseline, args.tolerance)
+    print(f"\nAgainst {args.baseline} (tolerance {args.tolerance:.0%}):")
+    for row in rows:
+        flag = 'REGRESSED' if row['regressed'] else 'ok'
+        print(f"{row['name']:<52} {row['baseline_s'] * 1000:>10.3f} -> {row['current_s'] * 1000:>10.3f} ms  "
+              f"x{row['ratio']:.2f}  {flag}")
+    
+    regressions = [row['name'] for row in rows if row['regressed']]
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,331 @@
+"""
+Benchmark cases and the timing harness
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+import numpy as np
+from typing import Callable, Dict, List, Optional
+
+
+# Registered cases, in run order
+BENCHMARKS = []
+
+
+class Benchmark:
+    """
+    A named hot-path measurement.
+    
+    The setup function runs untimed and returns the callable to time, so
+    fixtures (dice, histories, a test client) are built outside the loop.
+    Throughput is reported in units per second, where units are what the
+    case processes per call (rolls, trials, cells, rounds or requests).
+    """
+    
+    def __init__(self, name: str, setup: Callable[[], Callable[[], object]], units: int, quick: bool = True):
+        """
+        Initialize a benchmark case.
+        
+        Args:
+            name: Unique dotted name, also the key in results and baselines
+            setup: Function returning the zero-argument callable to time
+            units: Work units processed per call
+            quick: Whether the case is part of the --quick subset
+        """
+        self.name = name
+        self.setup = setup
+        self.units = units
+        self.quick = quick
+    
+    def measure(self, repeat: int, min_time: float) -> Dict:
+        """
+        Time the case and summarize its latency.
+        
+        Args:
+            repeat: Minimum number of timed calls
+            min_time: Keep calling until this many seconds have been timed
+            
+        Returns:
+            Dictionary with latency percentiles (seconds) and throughput
+        """
+        func = self.setup()
+        func()  # Warm-up: caches, lazy imports, first-touch allocations
+        
+        timings = []
+        while len(timings) < repeat or sum(timings) < min_time:
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        
+        timings.sort()
+        median = statistics.median(timings)
+        return {
+            'units': self.units,
+            'calls': len(timings),
+            'min_s': timings[0],
+            'median_s': median,
+            'mean_s': statistics.fmean(timings),
+            'p95_s': timings[min(len(timings) - 1, int(0.95 * len(timings)))],
+            'throughput': self.units / median if median > 0 else float('inf')
+        }
+
+
+def benchmark(name: str, units: int, quick: bool = True):
+    """
+    Register a setup function as a benchmark case.
+    
+    Args:
+        name: Unique dotted name
+        units: Work units processed per call
+        quick: Whether the case is part of the --quick subset
+    """
+    def register(setup):
+        BENCHMARKS.append(Benchmark(name, setup, units, quick))
+        return setup
+    return register
+
+
+def select(pattern: Optional[str] = None, quick: bool = False) -> List[Benchmark]:
+    """
+    Pick the cases to run.
+    
+    Args:
+        pattern: Substring a case name must contain (None = all)
+        quick: Only the quick subset
+        
+    Returns:
+        List of Benchmark cases
+    """
+    return [
+        case for case in BENCHMARKS
+        if (pattern is None or pattern in case.name) and (case.quick or not quick)
+    ]
+
+
+# --- Dice -------------------------------------------------------------------
+
+ROLL_CALLS = 10000
+
+
+@benchmark('dice.roll', units=ROLL_CALLS)
+def bench_dice_roll():
+    from app.models.dice import get_dice
+    dice = get_dice()
+    
+    def run():
+        for _ in range(ROLL_CALLS):
+            dice.roll()
+    return run
+
+
+for _size in (1000, 100000, 1000000):
+    @benchmark(f'dice.roll_multiple[{_size}]', units=_size, quick=_size <= 100000)
+    def bench_roll_multiple(size=_size):
+        from app.models.dice import get_dice
+        dice = get_dice([0.1, 0.1, 0.1, 0.1, 0.1, 0.5])
+        return lambda: dice.roll_multiple(size, as_array=True)
+
+
+# --- Monte Carlo ------------------------------------------------------------
+
+def _simulation(num_trials: int, strategy: str = 'fixed', **kwargs):
+    """Seeded simulation that does not go bankrupt early."""
+    from app.services.monte_carlo import MonteCarloSimulation
+    return MonteCarloSimulation(
+        num_trials=num_trials,
+        starting_balance=kwargs.pop('starting_balance', 1000000),
+        bet_amount=kwargs.pop('bet_amount', 10),
+        bet_strategy=strategy,
+        seed=0,
+        **kwargs
+    )
+
+
+# Dice and bet face per strategy chosen so every round is played: the
+# progressions need a favourable face to survive, kelly an edge to bet at all
+FAVOURABLE = {'probabilities': [0.1, 0.1, 0.1, 0.1, 0.1, 0.5], 'target_face': 6}
+EDGE = {'probabilities': [0.18, 0.18, 0.18, 0.18, 0.18, 0.1], 'target_face': 1}
+RUN_SETUPS = {
+    'fixed': {},
+    'martingale': FAVOURABLE,
+    'anti_martingale': {},
+    'kelly': EDGE,
+    'fractional_kelly': EDGE,
+    'dalembert': FAVOURABLE,
+    'fibonacci': FAVOURABLE,
+    'labouchere': FAVOURABLE
+}
+
+for _strategy in RUN_SETUPS:
+    for _trials in (10000, 1000000):
+        @benchmark(f'monte_carlo.run[{_strategy},{_trials}]', units=_trials, quick=_trials <= 10000)
+        def bench_run(strategy=_strategy, trials=_trials):
+            return _simulation(trials, strategy, **RUN_SETUPS[strategy]).run
+
+
+@benchmark('monte_carlo.run_envelope[fixed,1000000]', units=1000000, quick=False)
+def bench_run_envelope():
+    return _simulation(1000000).run_envelope
+
+
+for _trials in (100000, 10000000):
+    @benchmark(f'monte_carlo.convergence_analysis[{_trials}]', units=_trials, quick=_trials <= 100000)
+    def bench_convergence(trials=_trials):
+        mc = _simulation(trials, target_face=1)
+        return lambda: mc.convergence_analysis(checkpoints=50)
+
+
+for _sims, _trials in ((100, 1000), (1000, 1000), (10000, 1000)):
+    @benchmark(f'monte_carlo.batch_simulation[{_sims}x{_trials}]', units=_sims * _trials, quick=_sims <= 1000)
+    def bench_batch(sims=_sims, trials=_trials):
+        mc = _simulation(trials, starting_balance=1000)
+        return lambda: mc.batch_simulation(sims, workers=1)
+
+
+for _strategy in ('martingale', 'labouchere'):
+    @benchmark(f'monte_carlo.batch_simulation[{_strategy},1000x1000]', units=1000 * 1000)
+    def bench_batch_lockstep(strategy=_strategy):
+        mc = _simulation(1000, strategy, starting_balance=1000, **RUN_SETUPS[strategy])
+        return lambda: mc.batch_simulation(1000, workers=1)
+
+
+@benchmark('monte_carlo.iter_batch_summary[100000x100]', units=100000 * 100, quick=False)
+def bench_batch_summary():
+    mc = _simulation(100, starting_balance=1000)
+    
+    def run():
+        for _ in mc.iter_batch_summary(100000, workers=1):
+            pass
+    return run
+
+
+# --- Statistics -------------------------------------------------------------
+
+def _history_columns(size: int) -> Dict[str, np.ndarray]:
+    """Synthetic columnar game history of the given length."""
+    rng = np.random.default_rng(0)
+    bet_face = rng.integers(1, 7, size)
+    result = rng.integers(1, 7, size)
+    bet_amount = rng.integers(1, 100, size)
+    won = bet_face == result
+    return {
+        'round': np.arange(1, size + 1),
+        'bet_face': bet_face,
+        'bet_amount': bet_amount,
+        'result': result,
+        'won': won,
+        'balance': 1000 + np.cumsum(np.where(won, bet_amount * 5, -bet_amount))
+    }
+
+
+ANALYZER_METHODS = ('face_distribution', 'profit_over_time', 'streak_analysis', 'bet_analysis')
+
+for _size in (1000, 100000, 1000000):
+    for _method in ANALYZER_METHODS:
+        @benchmark(f'statistics.{_method}[{_size}]', units=_size, quick=_size <= 100000)
+        def bench_analyzer(size=_size, method=_method):
+            from app.services.statistics import StatisticalAnalyzer
+            analyzer = StatisticalAnalyzer.from_columns(_history_columns(size))
+            return getattr(analyzer, method)
+
+
+for _size in (100, 10000):
+    @benchmark(f'statistics.from_history[{_size}]', units=_size)
+    def bench_analyzer_history(size=_size):
+        from app.services.statistics import StatisticalAnalyzer
+        columns = _history_columns(size)
+        history = [
+            {name: values[i].item() for name, values in columns.items()}
+            for i in range(size)
+        ]
+        return lambda: StatisticalAnalyzer(history)
+
+
+# --- Endpoints --------------------------------------------------------------
+
+_client = None
+
+
+def _test_client():
+    """Flask test client shared by the endpoint cases (created on first use)."""
+    global _client
+    if _client is None:
+        from app import create_app
+        app = create_app()
+        app.config['TESTING'] = True
+        _client = app.test_client()
+    return _client
+
+
+def _endpoint(name: str, method: str, path: str, json: Optional[Dict] = None,
+              units: int = 1, quick: bool = True, prepare: Optional[Callable] = None):
+    """Register a case that sends one request through the test client."""
+    @benchmark(f'endpoint.{name}', units=units, quick=quick)
+    def bench_endpoint():
+        client = _test_client()
+        if prepare is not None:
+            prepare(client)
+        
+        def run():
+            response = client.open(path, method=method, json=json)
+            if response.status_code >= 400:
+                raise RuntimeError(f'{method} {path} returned {response.status_code}')
+        return run
+
+
+def _fund_session(client):
+    """Give the benchmark session enough balance for every roll case."""
+    client.post('/game/reset')
+    client.post('/game/add-funds', json={'amount': 100000})
+
+
+_endpoint('game.roll', 'POST', '/game/roll', {'bet_face': 3, 'bet_amount': 1}, prepare=_fund_session)
+_endpoint('game.autoplay[100]', 'POST', '/game/autoplay',
+          {'bet_face': 3, 'bet_amount': 1, 'rounds': 100}, units=100, prepare=_fund_session)
+_endpoint('game.stats', 'GET', '/game/stats')
+_endpoint('analysis.session_stats', 'GET', '/analysis/session-stats')
+_endpoint('simulation.run[10000]', 'POST', '/simulation/run',
+          {'num_trials': 10000, 'starting_balance': 100000}, units=10000)
+_endpoint('simulation.run_envelope[100000]', 'POST', '/simulation/run',
+          {'num_trials': 100000, 'starting_balance': 100000, 'trajectory': 'envelope'}, units=100000, quick=False)
+_endpoint('simulation.convergence[100000]', 'POST', '/simulation/convergence',
+          {'max_trials': 100000}, units=100000)
+_endpoint('simulation.batch[100x1000]', 'POST', '/simulation/batch',
+          {'num_simulations': 100, 'trials_per_sim': 1000}, units=100000)
+_endpoint('simulation.compare[500x1000]', 'POST', '/simulation/compare',
+          {'replications': 500, 'num_trials': 1000, 'probabilities': [0.1, 0.18, 0.18, 0.18, 0.18, 0.18]},
+          units=2 * 500 * 1000)
+_endpoint('simulation.batch_summary[10000x1000]', 'POST', '/simulation/batch',
+          {'num_simulations': 10000, 'trials_per_sim': 1000, 'distribution': 'summary'},
+          units=10000000, quick=False)
+
+
+# --- Start-up ---------------------------------------------------------------
+
+def _fresh_interpreter(script: str, **env):
+    """Run a script in a new interpreter, as a freshly started worker would."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    environ = dict(os.environ, **env)
+    return lambda: subprocess.run(
+        [sys.executable, '-c', script], cwd=root, env=environ, check=True, capture_output=True
+    )
+
+
+_CREATE_APP = 'from app import create_app; client = create_app().test_client()'
+_FIRST_CHI_SQUARE = "client.post('/analysis/chi-square', json={'observed': [10, 12, 9, 11, 8, 10]})"
+
+STARTUP_SCRIPTS = {
+    'create_app': (_CREATE_APP, {}, True),
+    'first_request': (f"{_CREATE_APP}; client.get('/game/stats')", {}, True),
+    'first_chi_square': (f'{_CREATE_APP}; {_FIRST_CHI_SQUARE}', {}, False),
+    'create_app[prefork]': (_CREATE_APP, {'PREFORK_WARM': '1'}, False),
+    'first_chi_square[prefork]': (f'{_CREATE_APP}; {_FIRST_CHI_SQUARE}', {'PREFORK_WARM': '1'}, False)
+}
+
+for _name, (_script, _env, _quick) in STARTUP_SCRIPTS.items():
+    @benchmark(f'startup.{_name}', units=1, quick=_quick)
+    def bench_startup(script=_script, env=_env):
+        return _fresh_interpreter(script, **env)
@@ -0,0 +1,18 @@
+"""
+Gunicorn settings for RollQuest (read automatically from the working directory)
+
+With PREFORK_WARM=1 the application is created and warmed up once in the
+master process and workers are forked from it, sharing the warmed state
+copy-on-write. Otherwise every worker creates the application itself.
+"""
+
+import os
+
+preload_app = os.environ.get('PREFORK_WARM', '0') == '1'
+
+
+def post_fork(server, worker):
+    """Resume background jobs in each worker forked from a preloaded master."""
+    if preload_app:
+        from app.services.job_queue import job_queue
+        job_queue.recover()
@@ -0,0 +1,41 @@
+"""
+Shared fixtures for the RollQuest test suite.
+
+Config reads its store paths from the environment at import time, so they
+are pointed at a throwaway directory before the app package is imported.
+"""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+STORE_DIR = tempfile.mkdtemp(prefix='rollquest-tests-')
+for variable, filename in (
+    ('SESSION_STORE_PATH', 'sessions.sqlite3'),
+    ('RESULT_CACHE_PATH', 'results.sqlite3'),
+    ('JOB_STORE_PATH', 'jobs.sqlite3'),
+    ('METRICS_STORE_PATH', 'metrics.sqlite3')
+):
+    os.environ[variable] = os.path.join(STORE_DIR, filename)
+
+# Route tests compare freshly computed responses, not cached copies
+os.environ['RESULT_CACHE_ENABLED'] = '0'
+
+from app import create_app  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def app():
+    """Application bound to the throwaway stores."""
+    app = create_app()
+    app.config['TESTING'] = True
+    yield app
+    shutil.rmtree(STORE_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def client(app):
+    """Test client with its own cookie jar (and so its own game session)."""
+    return app.test_client()
@@ -0,0 +1,30 @@
+"""
+Game routes: auto-play stop conditions
+"""
+
+import pytest
+
+# Face 3 never comes up, so every bet on it loses
+NEVER_THREE = [0.2, 0.2, 0.0, 0.2, 0.2, 0.2]
+
+
+def autoplay(client, **body):
+    body = {'bet_face': 3, 'bet_amount': 10, 'probabilities': NEVER_THREE, **body}
+    return client.post('/game/autoplay', json=body).get_json()
+
+
+@pytest.mark.parametrize('stop_loss, rounds_played, stop_reason', [
+    (None, 100, 'bankrupt'),
+    (500, 50, 'stop_loss'),
+    # The loss limit and bankruptcy trip in the same round: the first listed wins
+    (1000, 100, 'bankrupt')
+])
+def test_autoplay_stops_at_the_first_condition(client, stop_loss, rounds_played, stop_reason):
+    played = autoplay(client, rounds=200, stop_loss=stop_loss, take_profit=100)
+    assert (played['rounds_played'], played['stop_reason']) == (rounds_played, stop_reason)
+    assert played['balance'] == 1000 - 10 * rounds_played
+
+
+def test_autoplay_without_a_stop_plays_every_round(client):
+    played = autoplay(client, rounds=30)
+    assert (played['rounds_played'], played['stop_reason']) == (30, None)
@@ -0,0 +1,91 @@
+"""
+Background jobs: heartbeats, stale-job recovery and duplicate runs
+"""
+
+import json
+import sqlite3
+import time
+
+import pytest
+from flask import Flask
+
+from app.config import Config
+from app.services.job_queue import JobQueue
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """A job store of its own with a short staleness window."""
+    monkeypatch.setattr(Config, 'JOB_STORE_PATH', str(tmp_path / 'jobs.sqlite3'))
+    monkeypatch.setattr(Config, 'JOB_STALE_SECONDS', 0.6)
+    return Config.JOB_STORE_PATH
+
+
+def make_queue(runs):
+    """Queue whose 'slow' jobs sleep through one long chunk without progress events."""
+    def slow(params):
+        runs.append(params)
+        time.sleep(params['seconds'])
+        yield 'result', json.dumps({'runs': len(runs)}).encode()
+    
+    queue = JobQueue()
+    queue.init_app(Flask(__name__), {'slow': slow})
+    return queue
+
+
+def wait_for(queue, job_id, status='completed', timeout=10):
+    """Poll a job's status (which also triggers recovery) until it reaches status."""
+    deadline = time.time() + timeout
+    while queue.status(job_id)['status'] != status:
+        assert time.time() < deadline
+        time.sleep(0.05)
+
+
+def test_long_chunk_keeps_its_heartbeat_and_runs_once(store):
+    runs = []
+    queue = make_queue(runs)
+    # A second process polling the same store only sees the heartbeat
+    other = make_queue(runs)
+    
+    job_id = queue.submit('slow', {'seconds': 2})
+    deadline = time.time() + 1.8
+    while time.time() < deadline:
+        assert other.status(job_id)['status'] in ('queued', 'running')
+        assert queue.status(job_id)['status'] in ('queued', 'running')
+        time.sleep(0.05)
+    
+    wait_for(queue, job_id)
+    assert len(runs) == 1
+    assert json.loads(queue.result(job_id)) == {'runs': 1}
+
+
+def test_job_of_a_dead_worker_is_resumed(store):
+    runs = []
+    queue = make_queue(runs)
+    conn = sqlite3.connect(store, isolation_level=None)
+    conn.execute(
+        "INSERT INTO jobs (id, type, params, status, progress, created, started, heartbeat, worker) "
+        "VALUES ('orphan', 'slow', ?, 'running', 40, ?, ?, ?, 'dead')",
+        (json.dumps({'seconds': 0}), time.time() - 60, time.time() - 60, time.time() - 60)
+    )
+    
+    wait_for(queue, 'orphan')
+    assert len(runs) == 1
+
+
+def test_run_that_lost_its_claim_stops(store):
+    runs = []
+    queue = make_queue(runs)
+    job_id = queue.submit('slow', {'seconds': 0.5})
+    wait_for(queue, job_id, 'running')
+    
+    # Another worker re-queued and claimed the job meanwhile
+    conn = sqlite3.connect(store, isolation_level=None)
+    conn.execute("UPDATE jobs SET worker = 'other' WHERE id = ?", (job_id,))
+    time.sleep(1)
+    
+    # The first run finished its chunk but left the job to its new owner
+    assert len(runs) == 1
+    assert conn.execute(
+        'SELECT status, worker, result, finished FROM jobs WHERE id = ?', (job_id,)
+    ).fetchone() == ('running', 'other', None, None)
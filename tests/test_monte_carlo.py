@@ -0,0 +1,126 @@
+"""
+MonteCarloSimulation: chunked, summary, precision-targeted and parallel
+variants against the plain entry points, and sampling against the exact solver
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from app.config import Config
+from app.services.exact_solver import ExactRuinSolver
+from app.services.monte_carlo import MonteCarloSimulation, shutdown_executor
+
+TWEAKED = [0.16, 0.16, 0.16, 0.16, 0.16, 0.2]
+
+
+def same(a, b):
+    """Whether two JSON-serializable results are identical."""
+    return json.dumps(a, sort_keys=True) == json.dumps(b, sort_keys=True)
+
+
+@pytest.mark.parametrize('name', ['fixed', 'martingale', 'kelly', 'labouchere'])
+def test_chunked_run_matches_run(name):
+    mc = MonteCarloSimulation(
+        num_trials=20000, bet_strategy=name, probabilities=TWEAKED, target_face=6, seed=11
+    )
+    events = list(mc.iter_run(chunk_size=777))
+    assert all(event == 'progress' for event, _ in events[:-1])
+    assert same(events[-1][1], mc.run())
+
+
+def test_chunked_envelope_matches_envelope():
+    mc = MonteCarloSimulation(num_trials=50000, bet_strategy='dalembert', seed=5)
+    events = list(mc.iter_run_envelope(chunk_size=3000))
+    assert same(events[-1][1], mc.run_envelope())
+
+
+@pytest.mark.parametrize('name', ['fixed', 'fibonacci'])
+def test_chunked_batch_matches_batch(name):
+    mc = MonteCarloSimulation(num_trials=500, bet_strategy=name, seed=2)
+    events = list(mc.iter_batch(300, chunk_size=70))
+    assert len(events) > 2
+    assert same(events[-1][1], mc.batch_simulation(300))
+
+
+def test_summary_batch_matches_full_batch(monkeypatch):
+    monkeypatch.setattr(Config, 'SUMMARY_CHUNK_SIMULATIONS', 64)
+    mc = MonteCarloSimulation(num_trials=400, probabilities=TWEAKED, target_face=6, seed=8)
+    full = mc.batch_simulation(500)['statistics']
+    events = list(mc.iter_batch_summary(500, chunk_size=100))
+    summary = events[-1][1]['statistics']
+
+    assert len(events) > 2
+    for key in ('mean_profit', 'std_profit', 'mean_win_rate', 'ruin_probability'):
+        assert summary[key] == pytest.approx(full[key], abs=0.011)
+
+
+def test_precision_batch_matches_batch_of_same_size():
+    mc = MonteCarloSimulation(num_trials=300, bet_strategy='martingale', seed=4)
+    result = mc.until_precision('mean_profit', half_width=20, max_simulations=5000)
+    full = mc.batch_simulation(result['num_simulations'])['statistics']
+
+    assert result['precision']['converged']
+    assert result['precision']['achieved_half_width'] <= 20
+    assert result['statistics']['mean_profit'] == pytest.approx(full['mean_profit'], abs=0.011)
+    assert result['statistics']['ruin_probability'] == pytest.approx(full['ruin_probability'], abs=0.011)
+
+
+def test_precision_batch_plays_bounded_blocks(monkeypatch):
+    from app.services import monte_carlo
+    mc = MonteCarloSimulation(num_trials=200, seed=3)
+    whole = mc.until_precision('mean_profit', half_width=15, max_simulations=3000)
+
+    monkeypatch.setattr(Config, 'SUMMARY_CHUNK_SIMULATIONS', 128)
+    spawned = []
+    spawn_streams = monte_carlo.spawn_streams
+    monkeypatch.setattr(monte_carlo, 'spawn_streams', lambda source, n: spawned.append(n) or spawn_streams(source, n))
+    events = list(mc.iter_until_precision('mean_profit', half_width=15, max_simulations=3000))
+    blocked = events[-1][1]
+
+    assert max(spawned) <= 128 and sum(spawned) == whole['num_simulations']
+    assert len(events) - 1 > len(whole['precision']['history'])
+    assert [h['simulations'] for h in blocked['precision']['history']] == \
+        [h['simulations'] for h in whole['precision']['history']]
+    assert blocked['statistics']['mean_profit'] == pytest.approx(whole['statistics']['mean_profit'], abs=0.011)
+
+
+def test_parallel_batch_matches_serial(monkeypatch):
+    monkeypatch.setattr(Config, 'PARALLEL_BATCH_MIN_CELLS', 1)
+    try:
+        for name, options in (('fixed', {}), ('labouchere', {'line': [2, 3]}), ('kelly', {'fraction': 0.5})):
+            mc = MonteCarloSimulation(
+                num_trials=500, bet_strategy=name, strategy_options=options,
+                stop_loss=400, take_profit=600 if name != 'fixed' else None,
+                probabilities=TWEAKED, target_face=6, seed=9
+            )
+            assert same(mc.batch_simulation(400, workers=1), mc.batch_simulation(400, workers=3))
+    finally:
+        shutdown_executor()
+
+
+@pytest.mark.parametrize('starting_balance, bet_amount, probabilities', [
+    (100, 10, None),
+    (200, 25, TWEAKED)
+])
+def test_exact_solver_agrees_with_sampling(starting_balance, bet_amount, probabilities):
+    mc = MonteCarloSimulation(
+        num_trials=200, starting_balance=starting_balance, bet_amount=bet_amount,
+        probabilities=probabilities, target_face=6 if probabilities else None, seed=21
+    )
+    n = 4000
+    sampled = mc.batch_simulation(n)['statistics']
+    exact = ExactRuinSolver.from_simulation(mc).solve()['statistics']
+
+    ruin = exact['ruin_probability'] / 100
+    assert sampled['ruin_probability'] / 100 == pytest.approx(ruin, abs=4 * np.sqrt(ruin * (1 - ruin) / n) + 1e-9)
+    assert sampled['mean_profit'] == pytest.approx(exact['mean_profit'], abs=4 * exact['std_profit'] / np.sqrt(n))
+    assert sampled['mean_win_rate'] == pytest.approx(exact['mean_win_rate'], abs=1)
+
+
+def test_exact_solver_rejects_other_strategies():
+    with pytest.raises(ValueError):
+        ExactRuinSolver.from_simulation(MonteCarloSimulation(bet_strategy='martingale'))
+    with pytest.raises(ValueError):
+        ExactRuinSolver.from_simulation(MonteCarloSimulation(stop_loss=100))
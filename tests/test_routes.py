@@ -0,0 +1,75 @@
+"""
+Simulation routes: streamed and background-job results against the plain endpoints
+"""
+
+import json
+import time
+
+import pytest
+
+RUN = {'num_trials': 30000, 'starting_balance': 100000, 'bet_strategy': 'anti_martingale', 'seed': 4}
+BATCH = {'num_simulations': 300, 'trials_per_sim': 2000, 'bet_strategy': 'dalembert', 'seed': 6}
+COMPARE = {
+    'replications': 200, 'num_trials': 300, 'bet_strategy': 'martingale',
+    'probabilities': [0.15, 0.15, 0.15, 0.15, 0.15, 0.25], 'target_face': 6, 'seed': 2
+}
+
+
+def read_events(response):
+    """Parse a text/event-stream body into (event, data) pairs."""
+    events = []
+    for block in response.get_data(as_text=True).strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.split('\n'))
+        events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+
+@pytest.mark.parametrize('endpoint, body', [('run', RUN), ('batch', BATCH), ('compare', COMPARE)])
+def test_stream_result_matches_plain_endpoint(client, monkeypatch, endpoint, body):
+    from app.config import Config
+    # Small chunks so the stream reports progress before its result
+    monkeypatch.setattr(Config, 'STREAM_CHUNK_TRIALS', 5000)
+    monkeypatch.setattr(Config, 'STREAM_CHUNK_CELLS', 100000)
+
+    plain = client.post(f'/simulation/{endpoint}', json=body)
+    streamed = client.post(f'/simulation/{endpoint}/stream', json=body)
+    assert plain.status_code == streamed.status_code == 200
+
+    events = read_events(streamed)
+    assert events[-1] == ('result', plain.get_json())
+    assert len(events) > 1 and all(event == 'progress' for event, _ in events[:-1])
+
+
+def test_stream_rejects_invalid_parameters(client):
+    response = client.post('/simulation/batch/stream', json={'bet_strategy': 'bogus'})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('job_type, body', [('run', RUN), ('batch', BATCH)])
+def test_job_result_matches_plain_endpoint(client, job_type, body):
+    job_id = client.post('/simulation/jobs', json={'type': job_type, 'params': body}).get_json()['job_id']
+    deadline = time.time() + 30
+    while client.get(f'/simulation/jobs/{job_id}').get_json()['status'] != 'completed':
+        assert time.time() < deadline
+        time.sleep(0.05)
+
+    result = client.get(f'/simulation/jobs/{job_id}/result').get_json()
+    assert result == client.post(f'/simulation/{job_type}', json=body).get_json()
+
+
+def test_only_long_running_batches_get_the_summary_cap(client, monkeypatch):
+    from app.config import Config
+    monkeypatch.setattr(Config, 'MAX_BATCH_SIMULATIONS', 50)
+    monkeypatch.setattr(Config, 'MAX_SUMMARY_BATCH_SIMULATIONS', 500)
+    body = {'num_simulations': 10 ** 7, 'trials_per_sim': 10, 'distribution': 'summary', 'seed': 1}
+
+    assert client.post('/simulation/batch', json=body).get_json()['num_simulations'] == 50
+    streamed = read_events(client.post('/simulation/batch/stream', json=body))
+    assert streamed[-1][1]['num_simulations'] == 500
+
+    job = client.post('/simulation/jobs', json={'type': 'batch', 'params': body}).get_json()['job_id']
+    deadline = time.time() + 30
+    while client.get(f'/simulation/jobs/{job}').get_json()['status'] != 'completed':
+        assert time.time() < deadline
+        time.sleep(0.05)
+    assert client.get(f'/simulation/jobs/{job}/result').get_json()['num_simulations'] == 500
@@ -0,0 +1,73 @@
+"""
+Event-sourced game sessions: replayed logs against the live session state
+"""
+
+import random
+
+from app.config import Config
+from app.models.game_session import GameSession
+from app.services.session_store import session_store
+
+
+def play(game_session, rng, rounds):
+    """Apply a random mix of events to a session, returning them as logged."""
+    events = []
+    for _ in range(rounds):
+        choice = rng.random()
+        if choice < 0.6:
+            event = ('roll', [rng.randint(1, 6), rng.choice([1, 5, 10]), rng.randint(1, 6)])
+        elif choice < 0.9:
+            event = ('rolls', [rng.randint(1, 6), 2, [rng.randint(1, 6) for _ in range(rng.randint(1, 30))]])
+        elif choice < 0.97:
+            event = ('funds', rng.choice([50, 250.5]))
+        else:
+            event = ('player', f'Player {rng.randint(1, 99)}')
+        game_session.apply_event(*event)
+        events.append(event)
+    return events
+
+
+def test_replay_matches_live_session(app):
+    rng = random.Random(3)
+    live = GameSession()
+    session_id = session_store.create(GameSession())
+
+    # Enough events to cross several compactions and leave a partial log
+    for kind, data in play(live, rng, 3 * Config.SESSION_COMPACT_EVERY + 7):
+        session_store.append(session_id, kind, data)
+
+    assert session_store.load(session_id).to_dict() == live.to_dict()
+
+
+def test_snapshot_round_trip_matches_session():
+    rng = random.Random(5)
+    live = GameSession('Ann', 500)
+    play(live, rng, 400)
+
+    restored = GameSession.from_bytes(live.to_bytes())
+    assert restored.to_dict() == live.to_dict()
+    assert restored.get_statistics() == live.get_statistics()
+
+
+def test_replace_drops_the_log(app):
+    rng = random.Random(8)
+    session_id = session_store.create(GameSession())
+    scratch = GameSession()
+    for kind, data in play(scratch, rng, 20):
+        session_store.append(session_id, kind, data)
+
+    session_store.replace(session_id, GameSession('Reset'))
+    assert session_store.load(session_id).to_dict() == GameSession('Reset').to_dict()
+
+
+def test_game_routes_persist_through_the_log(client):
+    client.post('/game/set-player', json={'name': 'Ann'})
+    client.post('/game/add-funds', json={'amount': 500})
+    last = None
+    for i in range(2 * Config.SESSION_COMPACT_EVERY):
+        last = client.post('/game/roll', json={'bet_face': i % 6 + 1, 'bet_amount': 5}).get_json()
+    played = client.post('/game/autoplay', json={'bet_face': 3, 'bet_amount': 1, 'rounds': 40}).get_json()
+
+    stats = client.get('/game/stats').get_json()
+    assert stats['balance'] == played['balance']
+    assert stats['total_rounds'] == last['total_rounds'] + played['rounds_played']
@@ -0,0 +1,177 @@
+"""
+Betting strategies: vectorized paths and the lockstep batch engine against a
+plain round-by-round reference
+"""
+
+import copy
+
+import numpy as np
+import pytest
+
+from app.services.monte_carlo import MonteCarloSimulation, spawn_streams
+from app.services.strategies import STRATEGIES, _BALANCE_LIMIT, _STAKE_LIMIT
+
+FIBONACCI = [1, 1]
+while len(FIBONACCI) < 100:
+    FIBONACCI.append(FIBONACCI[-1] + FIBONACCI[-2])
+
+
+def reference_path(name, won, starting_balance, base_bet, win_probability,
+                   options=None, stop_loss=None, take_profit=None, payout=6):
+    """Balances after each round, one round at a time as the strategies describe it."""
+    options = options or {}
+    initial_line = list(options.get('line', [1, 2, 3, 4]))
+    step = options.get('step', base_bet)
+    fraction = options.get('fraction', 0.5 if name == 'fractional_kelly' else 1)
+    odds = payout - 1
+    kelly = min(max(0, (odds * win_probability - (1 - win_probability)) / odds) * fraction, 1)
+
+    balance, balances = starting_balance, []
+    stake, reset, level, index, line = 0, True, 0, 0, list(initial_line)
+    for w in won:
+        if not 0 < balance < _BALANCE_LIMIT:
+            break
+        if stop_loss is not None and balance <= starting_balance - stop_loss:
+            break
+        if take_profit is not None and balance >= starting_balance + take_profit:
+            break
+
+        if name == 'fixed':
+            stake = base_bet
+        elif name in ('martingale', 'anti_martingale'):
+            stake = base_bet if reset else stake * 2
+        elif name in ('kelly', 'fractional_kelly'):
+            stake = balance * kelly
+        elif name == 'dalembert':
+            stake = base_bet + step * level
+        elif name == 'fibonacci':
+            stake = base_bet * FIBONACCI[index]
+        elif name == 'labouchere':
+            units = min(line[0] + line[-1] if len(line) > 1 else line[0], _STAKE_LIMIT // base_bet)
+            stake = units * base_bet
+        stake = min(stake, _STAKE_LIMIT, balance)
+        if stake <= 0:
+            break
+
+        balance = balance + stake * odds if w else balance - stake
+        reset = w if name == 'martingale' else not w
+        level = max(level + (-1 if w else 1), 0)
+        index = max(index + (-2 if w else 1), 0)
+        if name == 'labouchere':
+            if not w:
+                line.append(units)
+            else:
+                line = line[1:-1] or list(initial_line)
+        balances.append(balance)
+    return balances
+
+
+def make_simulation(name, num_trials, win_probability=0.2, **kwargs):
+    """Simulation betting on face 6 of a dice that shows it with win_probability."""
+    probabilities = [(1 - win_probability) / 5] * 5 + [win_probability]
+    return MonteCarloSimulation(
+        num_trials=num_trials, bet_strategy=name, probabilities=probabilities, target_face=6, **kwargs
+    )
+
+
+CASES = [
+    ({}, None, None),
+    ({}, 300, 500),
+    ({'labouchere': {'line': [1, 1, 1]}, 'dalembert': {'step': 3}, 'kelly': {'fraction': 0.3}}, None, 400)
+]
+
+
+@pytest.mark.parametrize('name', sorted(STRATEGIES))
+@pytest.mark.parametrize('options, stop_loss, take_profit', CASES)
+def test_path_matches_reference(name, options, stop_loss, take_profit):
+    """Vectorized, round-by-round and resumed paths all replay the reference."""
+    rng = np.random.default_rng(7)
+    options = options.get(name, {})
+    for win_probability, num_trials in ((1 / 6, 3000), (0.3, 1500)):
+        mc = make_simulation(
+            name, num_trials, win_probability, starting_balance=1000, bet_amount=10,
+            strategy_options=options, stop_loss=stop_loss, take_profit=take_profit
+        )
+        won = rng.random(num_trials) < mc._win_probability()
+        expected = reference_path(
+            name, won.tolist(), 1000, 10, mc._win_probability(), options, stop_loss, take_profit
+        )
+        dtype = mc._batch_dtype()
+        strategy = mc.strategy
+
+        fast, _ = mc._play_path(won, 1000, strategy.initial_state(1, dtype))
+        np.testing.assert_allclose(fast, expected, rtol=1e-9)
+
+        # Resuming from the returned state is the same as one uninterrupted path
+        split = len(expected) // 3
+        head, state = mc._play_path(won[:split], 1000, strategy.initial_state(1, dtype))
+        tail, _ = mc._play_path(won[split:], head[-1].item() if split else 1000, state)
+        np.testing.assert_allclose(np.concatenate([head, tail]), expected, rtol=1e-9)
+
+        # Without the vectorized form, every round goes through bet() and update()
+        stepped = make_simulation(
+            name, num_trials, win_probability, starting_balance=1000, bet_amount=10,
+            strategy_options=options, stop_loss=stop_loss, take_profit=take_profit
+        )
+        for inner in (stepped.strategy, getattr(stepped.strategy, 'strategy', None)):
+            if inner is not None:
+                inner.path = lambda *args: None
+        slow, _ = stepped._play_path(won, 1000, stepped.strategy.initial_state(1, dtype))
+        np.testing.assert_allclose(slow, expected, rtol=1e-9)
+
+
+@pytest.mark.parametrize('name', sorted(STRATEGIES))
+@pytest.mark.parametrize('stop_loss, take_profit', [(None, None), (300, 500)])
+def test_batch_matches_reference(name, stop_loss, take_profit):
+    """Every simulation of a batch ends where its own reference path does."""
+    options = {'line': [1, 1]} if name == 'labouchere' else {}
+    mc = make_simulation(
+        name, 1000, starting_balance=1000, bet_amount=10,
+        strategy_options=options, stop_loss=stop_loss, take_profit=take_profit
+    )
+    streams = spawn_streams(np.random.SeedSequence(3), 200)
+    replay = copy.deepcopy(streams)
+    final_balances, win_rates = mc._batch_engine(streams)
+
+    for i, rng in enumerate(replay):
+        won = rng.random(1000) < mc._win_probability()
+        expected = reference_path(
+            name, won.tolist(), 1000, 10, mc._win_probability(), options, stop_loss, take_profit
+        )
+        played = len(expected)
+        assert final_balances[i] == pytest.approx(expected[-1] if played else 1000, rel=1e-9)
+        assert win_rates[i] == pytest.approx(np.count_nonzero(won[:played]) / played * 100 if played else 0)
+
+
+@pytest.mark.parametrize('name', sorted(STRATEGIES))
+def test_long_favourable_runs_stay_within_house_limits(name):
+    """Stakes and balances stop at the house limits instead of overflowing."""
+    mc = MonteCarloSimulation(
+        num_trials=3000, bet_strategy=name, probabilities=[0.3, 0.14, 0.14, 0.14, 0.14, 0.14],
+        target_face=1, seed=0
+    )
+    for seed in (1, 8, 16):
+        balances = np.asarray(mc.run(seed=seed)['balance_trajectory'], dtype=np.float64)
+        assert balances.min() >= 0
+        assert balances.max() < _BALANCE_LIMIT + _STAKE_LIMIT * mc.payout
+
+    streams = spawn_streams(np.random.SeedSequence(0), 200)
+    replay = copy.deepcopy(streams)
+    final_balances, _ = mc._batch_engine(streams)
+    assert final_balances.min() >= 0
+
+    # Simulations wrapping around int64 used to be counted as ruined
+    dtype = mc._batch_dtype()
+    for i, rng in enumerate(replay):
+        won = rng.random(3000) < mc._win_probability()
+        balances, _ = mc._play_path(won, 1000, mc.strategy.initial_state(1, dtype))
+        assert final_balances[i] == pytest.approx(balances[-1] if len(balances) else 1000, rel=1e-9)
+
+
+def test_labouchere_run_route_survives_a_long_favourable_run(client):
+    response = client.post('/simulation/run', json={
+        'bet_strategy': 'labouchere', 'game_mode': 'tweaked',
+        'probabilities': [0.3, 0.14, 0.14, 0.14, 0.14, 0.14], 'target_face': 1, 'num_trials': 3000, 'seed': 1
+    })
+    assert response.status_code == 200
+    assert 0 < response.get_json()['summary']['final_balance'] < _BALANCE_LIMIT + _STAKE_LIMIT * 6